@@ -0,0 +1 @@
+# Micro-benchmarks de NightMod (voir benchmarks/README.md)
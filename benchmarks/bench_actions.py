@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks des actions système (SystemActions.perform_action)
+
+Les commandes système sont remplacées par des exécutables factices placés dans
+un répertoire temporaire, et PATH est restreint à ce seul répertoire : aucune
+véritable commande d'extinction, de mise en veille ou de verrouillage ne peut
+être atteinte. On mesure ainsi le coût de lancement des processus et de la
+chaîne de méthodes de repli (seuil de régression large : le lancement d'un
+processus varie beaucoup d'une exécution à l'autre).
+"""
+
+import os
+import shutil
+import tempfile
+import platform
+import contextlib
+
+from benchmarks.harness import benchmark, SkipBenchmark
+
+# Commandes appelées par SystemActions sous Linux
+SYSTEM_COMMANDS = (
+    "shutdown", "systemctl", "pm-suspend", "loginctl", "gnome-screensaver-command",
+    "xdg-screensaver", "dm-tool", "qdbus", "xset",
+)
+
+
+@contextlib.contextmanager
+def fake_binaries(failing=()):
+    """Installe des commandes factices et restreint PATH à leur répertoire
+
+    Args:
+        failing: Commandes qui échouent (code de retour 1), les autres réussissent
+    """
+    if platform.system() != "Linux":
+        # Sous Windows et macOS, SystemActions appelle des chemins absolus ou
+        # des commandes introuvables dans PATH : rien ne garantit l'isolation
+        raise SkipBenchmark("exécutables factices pris en charge uniquement sous Linux")
+
+    previous = os.environ.get("PATH")
+    with tempfile.TemporaryDirectory(prefix="nightmod-bench-bin-") as bin_dir:
+        for command in SYSTEM_COMMANDS:
+            path = os.path.join(bin_dir, command)
+            with open(path, 'w') as f:
+                f.write(f"#!/bin/sh\nexit {1 if command in failing else 0}\n")
+            os.chmod(path, 0o755)
+
+        os.environ["PATH"] = bin_dir
+        try:
+            # Toutes les commandes doivent être résolues dans le répertoire factice
+            for command in SYSTEM_COMMANDS:
+                resolved = shutil.which(command)
+                if not resolved or os.path.dirname(resolved) != bin_dir:
+                    raise SkipBenchmark(f"commande {command} non isolée")
+            yield bin_dir
+        finally:
+            if previous is None:
+                os.environ.pop("PATH", None)
+            else:
+                os.environ["PATH"] = previous
+
+
+def perform(action):
+    from src.system_actions import SystemActions
+
+    def run():
+        if not SystemActions.perform_action(action):
+            raise RuntimeError(f"L'action {action} a échoué")
+    return run
+
+
+@benchmark("system_actions.shutdown", threshold=1.0)
+def shutdown():
+    with fake_binaries():
+        yield perform("shutdown")
+
+
+@benchmark("system_actions.sleep", threshold=1.0)
+def sleep():
+    with fake_binaries():
+        yield perform("sleep")
+
+
+@benchmark("system_actions.sleep_fallback", threshold=1.0)
+def sleep_fallback():
+    # systemctl échoue : repli sur pm-suspend
+    with fake_binaries(failing=("systemctl",)):
+        yield perform("sleep")
+
+
+@benchmark("system_actions.lock", threshold=1.0)
+def lock():
+    with fake_binaries():
+        yield perform("lock")
+
+
+@benchmark("system_actions.lock_fallback", threshold=1.0)
+def lock_fallback():
+    # Seule la dernière méthode de verrouillage réussit
+    with fake_binaries(failing=("loginctl", "gnome-screensaver-command", "xdg-screensaver", "dm-tool")):
+        yield perform("lock")
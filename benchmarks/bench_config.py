@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks de la configuration (ConfigManager)
+
+Les écritures dépendent du système de fichiers : leur seuil de régression est
+plus large que celui des benchmarks purement en mémoire.
+"""
+
+from benchmarks.harness import benchmark, temporary_config_dir
+
+
+@benchmark("config.load_config")
+def load_config():
+    from src.config import ConfigManager
+
+    with temporary_config_dir():
+        manager = ConfigManager()
+        manager.save_config()
+        yield manager.load_config
+
+
+@benchmark("config.save_config", threshold=1.0)
+def save_config():
+    from src.config import ConfigManager
+
+    with temporary_config_dir():
+        manager = ConfigManager()
+        yield manager.save_config
+
+
+@benchmark("config.update", threshold=1.0)
+def update():
+    from src.config import ConfigManager
+
+    with temporary_config_dir():
+        manager = ConfigManager()
+        changes = {"check_interval_minutes": 25, "response_time_seconds": 45, "system_action": "lock"}
+        yield lambda: manager.update(changes)
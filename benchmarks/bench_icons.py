@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks des icônes : icône de la barre des tâches et génération des PNG
+"""
+
+import io
+import shutil
+import tempfile
+import importlib.util
+import warnings
+import contextlib
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.harness import benchmark, SkipBenchmark
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def create_tray_icon():
+    """Crée un TrayIcon sans pystray ni fenêtre (application factice)"""
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        raise SkipBenchmark("Pillow non installé")
+
+    from src.tray import TrayIcon
+
+    app = SimpleNamespace(config={}, is_monitoring=False)
+    return TrayIcon(app, None, None, None)
+
+
+@benchmark("tray.create_default_icon")
+def create_default_icon():
+    tray = create_tray_icon()
+    yield lambda: tray.create_default_icon(is_active=True)
+
+
+@benchmark("tray.create_grayscale_version")
+def create_grayscale_version():
+    tray = create_tray_icon()
+    icon = tray.create_default_icon(is_active=True)
+    yield lambda: tray.create_grayscale_version(icon)
+
+
+@benchmark("tray.find_icon_file")
+def find_icon_file():
+    tray = create_tray_icon()
+    yield tray.find_icon_file
+
+
+@benchmark("tools.generate_png_icons")
+def generate_png_icons():
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        raise SkipBenchmark("Pillow non installé")
+
+    # tools/ n'est pas un paquet : chargement direct du script
+    spec = importlib.util.spec_from_file_location("generate_icons", ROOT_DIR / "tools" / "generate_icons.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    with tempfile.TemporaryDirectory(prefix="nightmod-bench-") as path:
+        # Les icônes sont écrites dans un répertoire temporaire, jamais dans assets/
+        assets_dir = Path(path)
+        shutil.copy(module.ICO_PATH, assets_dir / "icon.ico")
+        module.ICO_PATH = assets_dir / "icon.ico"
+        module.IMG_DIR = assets_dir / "img"
+
+        def generate():
+            # L'icône ICO contient des images de tailles inattendues : avertissement de Pillow sans intérêt ici
+            with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message="Image was not the expected size")
+                if not module.generate_png_icons():
+                    raise RuntimeError("La génération des icônes a échoué")
+
+        yield generate
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks du coût des rappels de la surveillance
+
+Le temps est virtuel (VirtualClock) : on mesure uniquement le travail fait à
+chaque rappel (planification, compte à rebours, animation de l'icône), sans
+attente réelle. TkClock est mesuré avec un remplaçant de widget Tk.
+"""
+
+from benchmarks.harness import benchmark, TkStandIn
+
+
+@benchmark("monitoring.check_cycle")
+def check_cycle():
+    """Un cycle complet : programmation, échéance, réponse et programmation suivante"""
+    from src.clock import VirtualClock
+    from src.monitoring import MonitoringManager
+    from src.scheduling import AdaptiveIntervalPolicy
+
+    clock = VirtualClock()
+    policy = AdaptiveIntervalPolicy(20 * 60, 5 * 60, 45 * 60)
+    manager = MonitoringManager(clock, policy, lambda: None, lambda interval, deadline: None)
+    manager.start()
+
+    def cycle():
+        clock.run(manager.deadline)
+        manager.record_response(4.0, 30)
+
+    yield cycle
+    manager.stop()
+
+
+@benchmark("clock.countdown_30s")
+def countdown_30s():
+    """Compte à rebours complet du popup (30 rappels)"""
+    from src.clock import VirtualClock, Countdown
+
+    clock = VirtualClock()
+
+    def countdown():
+        Countdown(clock, 30, lambda remaining: None, lambda: None).start()
+        clock.run()
+
+    yield countdown
+
+
+@benchmark("sprites.countdown_animator")
+def countdown_animator():
+    """Animation de l'icône de progression sur un intervalle de 20 minutes (24 images)"""
+    from src.clock import VirtualClock
+    from src.sprites import CountdownAnimator
+
+    clock = VirtualClock()
+    animator = CountdownAnimator(24, lambda frame: None, clock)
+
+    def animate():
+        start = clock.now()
+        animator.start(start, start + 20 * 60)
+        clock.run()
+
+    yield animate
+
+
+@benchmark("clock.tk_call_later")
+def tk_call_later():
+    """Programmation puis annulation d'un rappel par TkClock"""
+    from src.clock import TkClock
+
+    clock = TkClock(TkStandIn())
+
+    def call_later():
+        clock.cancel(clock.call_later(1.5, print))
+
+    yield call_later
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Outillage des micro-benchmarks de NightMod
+
+Un benchmark est un générateur enregistré avec le décorateur `benchmark` : il
+prépare son environnement, produit la fonction à mesurer puis nettoie après
+le `yield` (comme une fixture pytest). Chaque fonction est calibrée pour
+qu'une série dure au moins `MIN_SERIES_TIME`, puis mesurée sur plusieurs
+séries ; le meilleur temps par appel sert de référence car il est le moins
+sensible à la charge de la machine.
+
+Les résultats sont comparés à une référence JSON : un benchmark dont le temps
+dépasse la référence de plus du seuil est signalé comme une régression.
+"""
+
+import os
+import json
+import time
+import platform
+import tempfile
+import contextlib
+import statistics
+
+# Version du format du fichier de référence
+BASELINE_VERSION = 1
+
+# Seuil de régression par défaut (+30 % par rapport à la référence)
+DEFAULT_THRESHOLD = 0.30
+
+# Durée minimale d'une série de mesures (secondes)
+MIN_SERIES_TIME = 0.05
+
+# Nombre de séries mesurées par benchmark
+REPEAT = 5
+
+# Benchmarks enregistrés : nom -> générateur
+REGISTRY = {}
+
+
+class SkipBenchmark(Exception):
+    """Levée par un benchmark qui ne peut pas s'exécuter sur cette machine"""
+
+
+class TkStandIn:
+    """Remplace un widget Tk pour les minuteries : `after` enregistre sans jamais exécuter"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.counter = 0
+
+    def after(self, ms, callback=None, *args):
+        self.counter += 1
+        job = f"after#{self.counter}"
+        self.jobs[job] = (ms, callback, args)
+        return job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+
+@contextlib.contextmanager
+def temporary_config_dir():
+    """Redirige le répertoire de configuration (NIGHTMOD_CONFIG_DIR) vers un répertoire temporaire"""
+    previous = os.environ.get("NIGHTMOD_CONFIG_DIR")
+    with tempfile.TemporaryDirectory(prefix="nightmod-bench-") as path:
+        os.environ["NIGHTMOD_CONFIG_DIR"] = path
+        try:
+            yield path
+        finally:
+            if previous is None:
+                os.environ.pop("NIGHTMOD_CONFIG_DIR", None)
+            else:
+                os.environ["NIGHTMOD_CONFIG_DIR"] = previous
+
+
+def benchmark(name, threshold=None):
+    """Enregistre un benchmark
+
+    Args:
+        name: Nom du benchmark (`module.fonction`)
+        threshold: Seuil de régression propre à ce benchmark (défaut: seuil global)
+    """
+    def register(factory):
+        factory.threshold = threshold
+        REGISTRY[name] = factory
+        return factory
+    return register
+
+
+def calibrate(func, min_time=MIN_SERIES_TIME):
+    """Retourne le nombre d'appels nécessaires pour qu'une série dure au moins min_time"""
+    number = 1
+    while True:
+        elapsed = time_series(func, number)
+        if elapsed >= min_time or number >= 1_000_000:
+            return number
+        # Extrapolation avec une marge, sans multiplier par plus de 10 à chaque essai
+        ratio = min_time / elapsed if elapsed > 0 else 10
+        number = max(number + 1, int(number * min(10, ratio * 1.2)))
+
+
+def time_series(func, number):
+    """Mesure la durée de `number` appels consécutifs"""
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def measure(func, repeat=REPEAT, min_time=MIN_SERIES_TIME):
+    """Mesure une fonction et retourne le meilleur et le médian temps par appel (secondes)"""
+    func()  # Échauffement (imports, caches)
+    number = calibrate(func, min_time)
+    per_call = [time_series(func, number) / number for _ in range(repeat)]
+    return {"best": min(per_call), "median": statistics.median(per_call), "loops": number}
+
+
+def run_benchmark(name, repeat=REPEAT, min_time=MIN_SERIES_TIME):
+    """Prépare, mesure et nettoie un benchmark enregistré"""
+    factory = REGISTRY[name]
+    fixture = factory()
+    func = next(fixture)
+    try:
+        result = measure(func, repeat, min_time)
+    except BaseException:
+        fixture.close()
+        raise
+    # Reprendre le générateur exécute le nettoyage placé après le yield
+    next(fixture, None)
+    return result
+
+
+def run_all(names=None, repeat=REPEAT, min_time=MIN_SERIES_TIME, progress=None):
+    """Exécute les benchmarks demandés (tous par défaut)
+
+    Returns:
+        Un dictionnaire nom -> résultat ; les benchmarks impossibles sur cette
+        machine (SkipBenchmark) sont absents
+    """
+    results = {}
+    for name in sorted(names or REGISTRY):
+        try:
+            results[name] = run_benchmark(name, repeat, min_time)
+        except SkipBenchmark as e:
+            if progress:
+                progress(f"{name}: ignoré ({e})")
+            continue
+        if progress:
+            progress(f"{name}: {format_duration(results[name]['best'])}")
+    return results
+
+
+def load_baseline(path):
+    """Charge un fichier de référence (None s'il est absent)"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Version de référence non prise en charge: {data.get('version')}")
+    return data
+
+
+def machine_info():
+    """Décrit la machine de mesure (les références ne sont comparables que sur la même)"""
+    return {
+        "python": platform.python_version(),
+        "system": platform.system(),
+        "processor": platform.machine(),
+    }
+
+
+def save_baseline(path, results):
+    """Écrit les résultats comme nouvelle référence"""
+    data = {
+        "version": BASELINE_VERSION,
+        "machine": machine_info(),
+        "benchmarks": {
+            name: {"best": round(result["best"], 9), "median": round(result["median"], 9)}
+            for name, result in sorted(results.items())
+        },
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare les résultats à la référence
+
+    Returns:
+        Une liste de (nom, référence, actuel, rapport, statut) avec le statut
+        "ok", "régression", "amélioration" ou "nouveau"
+    """
+    reference = (baseline or {}).get("benchmarks", {})
+    rows = []
+    for name, result in sorted(results.items()):
+        current = result["best"]
+        if name not in reference:
+            rows.append((name, None, current, None, "nouveau"))
+            continue
+
+        limit = REGISTRY[name].threshold if name in REGISTRY and REGISTRY[name].threshold else threshold
+        previous = reference[name]["best"]
+        ratio = current / previous if previous > 0 else float("inf")
+        if ratio > 1 + limit:
+            status = "régression"
+        elif ratio < 1 / (1 + limit):
+            status = "amélioration"
+        else:
+            status = "ok"
+        rows.append((name, previous, current, ratio, status))
+    return rows
+
+
+def format_duration(seconds):
+    """Formate une durée avec l'unité adaptée"""
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def format_report(rows):
+    """Formate la comparaison en tableau"""
+    width = max([len("Benchmark")] + [len(row[0]) for row in rows])
+    lines = [f"{'Benchmark':<{width}}  {'Référence':>11}  {'Actuel':>11}  {'Rapport':>7}  Statut"]
+    for name, previous, current, ratio, status in rows:
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else "-"
+        lines.append(
+            f"{name:<{width}}  {format_duration(previous):>11}  {format_duration(current):>11}  "
+            f"{ratio_text:>7}  {status}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Exécute les micro-benchmarks de NightMod et les compare à la référence
+
+Utilisation:
+    python benchmarks/run.py
+    python benchmarks/run.py --filter config --threshold 0.5
+    python benchmarks/run.py --update-baseline
+"""
+
+import os
+import sys
+import logging
+import argparse
+
+# Ajouter le répertoire parent au chemin pour importer src et benchmarks
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks import harness
+from benchmarks import bench_actions, bench_config, bench_icons, bench_scheduler  # noqa: F401
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main(argv=None):
+    """Point d'entrée des benchmarks"""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de NightMod")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Fichier de référence JSON")
+    parser.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD,
+                        help="Régression tolérée, en fraction de la référence (défaut: 0.30)")
+    parser.add_argument("--filter", default=None, help="N'exécuter que les benchmarks contenant ce texte")
+    parser.add_argument("--repeat", type=int, default=harness.REPEAT, help="Nombre de séries par benchmark")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Enregistrer les résultats comme nouvelle référence")
+    parser.add_argument("--list", action="store_true", help="Lister les benchmarks disponibles")
+    args = parser.parse_args(argv)
+
+    names = sorted(name for name in harness.REGISTRY if not args.filter or args.filter in name)
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        parser.error(f"aucun benchmark ne correspond à {args.filter!r}")
+
+    # Les modules mesurés journalisent leurs actions : seuls les problèmes sont affichés
+    logging.basicConfig(level=logging.WARNING)
+
+    results = harness.run_all(names, repeat=args.repeat,
+                              progress=lambda line: print(line, file=sys.stderr))
+
+    if args.update_baseline:
+        baseline = harness.load_baseline(args.baseline) or {"benchmarks": {}}
+        # Une exécution filtrée ne remplace que les benchmarks mesurés
+        merged = {name: value for name, value in baseline["benchmarks"].items() if name not in results}
+        merged.update(results)
+        harness.save_baseline(args.baseline, merged)
+        print(f"Référence mise à jour: {args.baseline}")
+        return 0
+
+    baseline = harness.load_baseline(args.baseline)
+    if baseline is None:
+        print(f"Aucune référence ({args.baseline}) : utilisez --update-baseline", file=sys.stderr)
+    elif baseline.get("machine") != harness.machine_info():
+        print("Attention : la référence a été mesurée sur une autre machine ou une autre version de Python",
+              file=sys.stderr)
+
+    rows = harness.compare(results, baseline, args.threshold)
+    print(harness.format_report(rows))
+
+    regressions = [row[0] for row in rows if row[4] == "régression"]
+    if regressions:
+        print(f"\n{len(regressions)} régression(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
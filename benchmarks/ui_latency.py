@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de bout en bout de l'interface de NightMod sous un serveur X virtuel
+
+Mesure avec un véritable Tk, sur plusieurs exécutions :
+- le démarrage à froid, du lancement du processus au premier affichage
+  (Expose) de la fenêtre principale ;
+- le délai entre l'échéance de la vérification et l'affichage (Map, puis
+  Visibility) de PopupChecker, avec et sans son ;
+- le délai entre le clic sur « Je suis éveillé » et la destruction du popup.
+
+Chaque mesure s'exécute dans un processus enfant avec un répertoire de
+configuration temporaire. Le serveur Xvfb est démarré automatiquement, sauf
+si un affichage est donné avec --display. pystray est écarté lorsqu'aucun
+hôte de zone de notification n'est présent sur l'affichage.
+
+Utilisation:
+    python benchmarks/ui_latency.py
+    python benchmarks/ui_latency.py --runs 50 --json
+    python benchmarks/ui_latency.py --display :1
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+# Ajouter le répertoire parent au chemin pour importer src
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from src.simulator import quantile
+
+# Délai laissé au popup avant le clic (fin du fondu et du premier rendu)
+CLICK_DELAY_MS = 400
+
+# Intervalle entre deux vérifications dans le processus de mesure du popup
+CHECK_INTERVAL_SECONDS = 0.2
+
+# Limite de durée d'un processus de mesure
+CHILD_TIMEOUT = 120
+
+# Libellés des mesures dans le rapport
+METRICS = (
+    ("cold_start", "Démarrage à froid → fenêtre affichée"),
+    ("popup_mapped", "Échéance → popup mappé (sans son)"),
+    ("popup_visible", "Échéance → popup visible (sans son)"),
+    ("popup_mapped_sound", "Échéance → popup mappé (avec son)"),
+    ("popup_visible_sound", "Échéance → popup visible (avec son)"),
+    ("response", "Clic → popup détruit"),
+)
+
+
+def start_xvfb():
+    """Démarre Xvfb sur un numéro d'affichage libre
+
+    Returns:
+        (processus, affichage) ou None si Xvfb n'est pas installé
+    """
+    if not shutil.which("Xvfb"):
+        return None
+
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        ["Xvfb", "-displayfd", str(write_fd), "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+        pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.close(write_fd)
+
+    # Xvfb écrit le numéro d'affichage choisi lorsqu'il est prêt
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    if not number:
+        process.terminate()
+        raise RuntimeError("Xvfb n'a pas démarré")
+    return process, f":{number}"
+
+
+def tray_host_present():
+    """Indique si un hôte de zone de notification (_NET_SYSTEM_TRAY_S0) existe sur l'affichage"""
+    import ctypes
+    import ctypes.util
+
+    library = ctypes.util.find_library("X11")
+    if not library:
+        return False
+    xlib = ctypes.CDLL(library)
+    xlib.XOpenDisplay.restype = ctypes.c_void_p
+    xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    xlib.XInternAtom.restype = ctypes.c_ulong
+    xlib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+    xlib.XGetSelectionOwner.restype = ctypes.c_ulong
+    xlib.XGetSelectionOwner.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+    xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+
+    display = xlib.XOpenDisplay(None)
+    if not display:
+        return False
+    try:
+        atom = xlib.XInternAtom(display, b"_NET_SYSTEM_TRAY_S0", True)
+        return bool(atom) and xlib.XGetSelectionOwner(display, atom) != 0
+    finally:
+        xlib.XCloseDisplay(display)
+
+
+def create_app():
+    """Crée NightModApp dans le processus de mesure (sans pystray s'il n'y a pas d'hôte)"""
+    if not tray_host_present():
+        # Un module à None fait échouer l'import : TrayIcon désactive l'icône
+        sys.modules["pystray"] = None
+
+    from src.app import NightModApp
+    return NightModApp()
+
+
+def emit(metric, seconds):
+    """Transmet une mesure au processus parent"""
+    print(json.dumps({"metric": metric, "value": seconds}), flush=True)
+
+
+def close_app(app):
+    """Ferme l'application sans confirmation"""
+    if app.is_monitoring:
+        app.stop_monitoring()
+    app.on_close()
+
+
+def child_cold_start():
+    """Processus enfant : démarrage jusqu'au premier affichage de la fenêtre principale"""
+    launched_at = float(os.environ["NIGHTMOD_BENCH_T0"])
+    app = create_app()
+
+    def on_expose(event):
+        if event.widget is app:
+            emit("cold_start", time.monotonic() - launched_at)
+            app.unbind("<Expose>")
+            app.after_idle(close_app, app)
+
+    app.bind("<Expose>", on_expose)
+    app.mainloop()
+
+
+def find_response_button(popup):
+    """Retourne le bouton de réponse du popup"""
+    pending = [popup]
+    while pending:
+        widget = pending.pop()
+        if widget.winfo_class() == "TButton":
+            return widget
+        pending.extend(widget.winfo_children())
+    raise RuntimeError("Bouton de réponse introuvable")
+
+
+def child_popup(runs, sound):
+    """Processus enfant : cycles échéance → popup → clic, avec la surveillance réelle"""
+    from src.scheduling import FixedIntervalPolicy
+
+    app = create_app()
+    app.config["sound_enabled"] = sound
+    app.monitor.policy = FixedIntervalPolicy(CHECK_INTERVAL_SECONDS)
+    suffix = "_sound" if sound else ""
+    state = {"done": 0}
+
+    def on_check():
+        fired_at = time.monotonic()
+        app.show_check_popup()
+        popup = app.popup
+        marks = set()
+
+        def on_map(event):
+            if event.widget is popup and "map" not in marks:
+                marks.add("map")
+                emit("popup_mapped" + suffix, time.monotonic() - fired_at)
+
+        def on_visibility(event):
+            if event.widget is popup and "visible" not in marks:
+                marks.add("visible")
+                emit("popup_visible" + suffix, time.monotonic() - fired_at)
+                popup.after(CLICK_DELAY_MS, click, popup)
+
+        popup.bind("<Map>", on_map, add="+")
+        popup.bind("<Visibility>", on_visibility, add="+")
+
+    def click(popup):
+        button = find_response_button(popup)
+        clicked_at = time.monotonic()
+
+        def on_destroy(event):
+            if event.widget is popup:
+                emit("response", time.monotonic() - clicked_at)
+                state["done"] += 1
+                if state["done"] >= runs:
+                    app.after_idle(close_app, app)
+
+        popup.bind("<Destroy>", on_destroy, add="+")
+        button.event_generate("<ButtonPress-1>", x=5, y=5)
+        button.event_generate("<ButtonRelease-1>", x=5, y=5)
+
+    app.monitor.on_check = on_check
+    app.start_monitoring()
+    app.mainloop()
+
+
+def run_child(args, display, config):
+    """Lance un processus de mesure et retourne ses mesures"""
+    with tempfile.TemporaryDirectory(prefix="nightmod-ui-bench-") as config_dir:
+        with open(os.path.join(config_dir, "config.json"), 'w') as f:
+            json.dump(config, f)
+
+        env = dict(os.environ, DISPLAY=display, NIGHTMOD_CONFIG_DIR=config_dir)
+        env["NIGHTMOD_BENCH_T0"] = repr(time.monotonic())
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"] + args,
+            env=env, cwd=ROOT_DIR, capture_output=True, text=True, timeout=CHILD_TIMEOUT
+        )
+
+    if completed.returncode != 0:
+        raise RuntimeError(f"Processus de mesure en échec ({' '.join(args)}):\n{completed.stderr}")
+    return [json.loads(line) for line in completed.stdout.splitlines() if line.startswith("{")]
+
+
+def collect(runs, display):
+    """Exécute toutes les mesures et regroupe les valeurs par métrique"""
+    # Détections d'inactivité et de lecture coupées : les vérifications du banc
+    # d'essai ne doivent pas être reportées par l'activité de la machine hôte
+    config = {"start_with_system": False, "history_enabled": True, "response_time_seconds": 30,
+              "idle_detection_enabled": False, "playback_detection_enabled": False}
+    samples = {}
+
+    def add(measures):
+        for measure in measures:
+            samples.setdefault(measure["metric"], []).append(measure["value"])
+
+    for _ in range(runs):
+        add(run_child(["cold-start"], display, config))
+    for sound in (False, True):
+        add(run_child(["popup", str(runs), "1" if sound else "0"], display, dict(config, sound_enabled=sound)))
+    return samples
+
+
+def summarize(samples):
+    """Calcule les percentiles (secondes) de chaque métrique"""
+    summary = {}
+    for metric, values in samples.items():
+        values = sorted(values)
+        summary[metric] = {
+            "runs": len(values),
+            "p50": quantile(values, 0.5),
+            "p90": quantile(values, 0.9),
+            "p99": quantile(values, 0.99),
+            "max": values[-1],
+        }
+
+    # Surcoût du son : différence des médianes avec et sans son
+    if "popup_visible" in summary and "popup_visible_sound" in summary:
+        summary["sound_overhead"] = {
+            "p50": summary["popup_visible_sound"]["p50"] - summary["popup_visible"]["p50"]
+        }
+    return summary
+
+
+def format_report(summary):
+    """Formate les percentiles en millisecondes"""
+    lines = [f"{'Mesure':<40} {'N':>4} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+    for metric, label in METRICS:
+        if metric not in summary:
+            continue
+        values = summary[metric]
+        lines.append(
+            f"{label:<40} {values['runs']:>4} " +
+            " ".join(f"{values[key] * 1000:>6.1f} ms" for key in ("p50", "p90", "p99", "max"))
+        )
+    if "sound_overhead" in summary:
+        lines.append(f"\nSurcoût du son (médiane): {summary['sound_overhead']['p50'] * 1000:.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Point d'entrée du benchmark de bout en bout"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--child"]:
+        mode = argv[1]
+        if mode == "cold-start":
+            child_cold_start()
+        else:
+            child_popup(int(argv[2]), argv[3] == "1")
+        return 0
+
+    parser = argparse.ArgumentParser(description="Latences de l'interface de NightMod sous un serveur X virtuel")
+    parser.add_argument("--runs", type=int, default=20, help="Nombre d'exécutions par mesure (défaut: 20)")
+    parser.add_argument("--display", default=None, help="Affichage existant à utiliser au lieu de démarrer Xvfb")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON")
+    args = parser.parse_args(argv)
+
+    server = None
+    display = args.display
+    if display is None:
+        started = start_xvfb()
+        if started is None:
+            parser.error("Xvfb introuvable : installez-le ou indiquez un affichage avec --display")
+        server, display = started
+
+    try:
+        summary = summarize(collect(args.runs, display))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_report(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
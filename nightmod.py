@@ -16,28 +16,23 @@ import os
 import logging
 from pathlib import Path
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("nightmod.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger("NightMod")
 
 def main():
     """Point d'entrée principal de l'application"""
     try:
-        # S'assurer que le répertoire de configuration existe
-        config_dir = os.path.join(os.path.expanduser("~"), ".nightmod")
-        os.makedirs(config_dir, exist_ok=True)
-        
         # Ajouter le répertoire courant au chemin de recherche des modules
         current_dir = Path(__file__).parent.absolute()
         sys.path.insert(0, str(current_dir))
         
+        # S'assurer que le répertoire de configuration existe
+        from src.utils import get_config_dir
+        os.makedirs(get_config_dir(), exist_ok=True)
+        
+        # Journalisation asynchrone (~/.nightmod/logs/nightmod.log)
+        from src.logs import setup_logging
+        setup_logging()
+        
         # Lancer l'application en utilisant le module de la classe principale
         from src.app import NightModApp
         app = NightModApp()
@@ -4,28 +4,94 @@
 """
 Script de lancement pour NightMod
 Ce script vérifie l'environnement et lance l'application
+
+La vérification des dépendances n'est faite qu'une seule fois par environnement :
+son résultat est mémorisé dans un fichier témoin (interpréteur, version de Python
+et empreinte de requirements.txt). Tant que ce témoin est valide, le lancement
+est direct. Le script ne lit jamais l'entrée standard, sauf avec --interactive.
+
+Utilisation:
+    python run.py                  # Lancement rapide (compatible démarrage automatique)
+    python run.py --interactive    # Propose l'installation des dépendances manquantes
+    python run.py --check          # Force une nouvelle vérification de l'environnement
 """
 
 import sys
 import os
-import platform
-import subprocess
-import importlib.util
+import json
+import hashlib
 import logging
 import traceback
 from pathlib import Path
 
-# Configuration basique du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("nightmod.log"),
-        logging.StreamHandler()
-    ]
-)
+# Ajouter le répertoire du script au chemin de recherche des modules
+SCRIPT_DIR = Path(__file__).parent.absolute()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from src.utils import get_config_dir
+from src.logs import setup_logging
+
 logger = logging.getLogger("NightMod.Launcher")
 
+# Fichier témoin de la dernière vérification réussie de l'environnement
+STAMP_FILENAME = "launcher.stamp"
+REQUIREMENTS_FILE = SCRIPT_DIR / "requirements.txt"
+
+def parse_args(argv):
+    """Analyse les arguments de la ligne de commande"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Lanceur de NightMod")
+    parser.add_argument("--interactive", action="store_true",
+                        help="Autorise les questions (installation des dépendances manquantes)")
+    parser.add_argument("--check", action="store_true",
+                        help="Ignore le fichier témoin et vérifie à nouveau l'environnement")
+    return parser.parse_args(argv)
+
+def get_stamp_path():
+    """Retourne le chemin du fichier témoin de vérification"""
+    return Path(get_config_dir()) / STAMP_FILENAME
+
+def compute_stamp_key(requirements_file=REQUIREMENTS_FILE):
+    """Calcule la clé identifiant l'environnement courant"""
+    try:
+        requirements_hash = hashlib.sha256(Path(requirements_file).read_bytes()).hexdigest()
+    except OSError:
+        requirements_hash = None
+
+    return {
+        "python": sys.executable,
+        "version": ".".join(str(part) for part in sys.version_info[:3]),
+        "requirements": requirements_hash
+    }
+
+def stamp_is_valid(key, stamp_path=None):
+    """Vérifie si le fichier témoin correspond à l'environnement courant"""
+    stamp_path = stamp_path or get_stamp_path()
+    try:
+        with open(stamp_path, 'r') as f:
+            return json.load(f) == key
+    except (OSError, ValueError):
+        return False
+
+def write_stamp(key, stamp_path=None):
+    """Enregistre le fichier témoin après une vérification réussie"""
+    stamp_path = stamp_path or get_stamp_path()
+    try:
+        os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+        tmp_path = f"{stamp_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(key, f)
+        os.replace(tmp_path, stamp_path)
+    except OSError as e:
+        logger.warning(f"Impossible d'écrire le fichier témoin: {e}")
+
+def invalidate_stamp(stamp_path=None):
+    """Supprime le fichier témoin pour forcer une vérification au prochain lancement"""
+    try:
+        os.remove(stamp_path or get_stamp_path())
+    except OSError:
+        pass
+
 def check_python_version():
     """Vérifie si la version de Python est compatible"""
     required_version = (3, 6)
@@ -40,8 +106,11 @@ def check_python_version():
     
     return True
 
-def check_dependencies():
+def check_dependencies(interactive=False):
     """Vérifie si les dépendances requises sont installées"""
+    import importlib.util
+    import platform
+
     required_modules = ["tkinter"]
     optional_modules = ["pystray", "PIL", "psutil"]
     
@@ -81,11 +150,16 @@ def check_dependencies():
         print(f"Avertissement: Certains modules optionnels ne sont pas installés: {', '.join(missing_optional)}")
         print("Certaines fonctionnalités peuvent être limitées.")
         
+        if not interactive:
+            print("Relancez avec --interactive pour les installer.")
+            return True
+
         # Proposer d'installer les dépendances optionnelles
         print("\nVoulez-vous installer les modules optionnels? (o/n)")
         choice = input("> ").lower()
         
         if choice == 'o':
+            import subprocess
             try:
                 for module in missing_optional:
                     if module == "PIL":  # PIL est en réalité installé via pillow
@@ -100,12 +174,12 @@ def check_dependencies():
 
 def install_requirements():
     """Installe les dépendances depuis requirements.txt si nécessaire"""
-    requirements_file = Path("requirements.txt")
+    import subprocess
     
-    if requirements_file.exists():
+    if REQUIREMENTS_FILE.exists():
         try:
             print("Installation des dépendances depuis requirements.txt...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", str(requirements_file)])
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", str(REQUIREMENTS_FILE)])
             print("✓ Dépendances installées avec succès")
             return True
         except subprocess.CalledProcessError as e:
@@ -115,40 +189,54 @@ def install_requirements():
     
     return True
 
-def main():
-    """Fonction principale"""
-    print("Initialisation de NightMod...")
-    
-    # Vérifier la version de Python
+def check_environment(interactive=False):
+    """Vérifie l'environnement complet (version de Python et dépendances)"""
     if not check_python_version():
+        return False
+
+    if not check_dependencies(interactive):
+        return False
+
+    # L'installation depuis requirements.txt n'est proposée qu'en mode interactif
+    if interactive:
+        print("Voulez-vous vérifier et installer les dépendances maintenant? (o/n)")
+        choice = input("> ").lower()
+
+        if choice == 'o':
+            if not install_requirements():
+                return False
+
+    return True
+
+def wait_before_exit(interactive):
+    """Laisse le temps de lire les messages d'erreur en mode interactif"""
+    if interactive:
         input("Appuyez sur Entrée pour quitter...")
-        return 1
-    
-    # Vérifier les dépendances
-    if not check_dependencies():
-        input("Appuyez sur Entrée pour quitter...")
-        return 1
-    
-    # Installer les dépendances si nécessaire et demandé par l'utilisateur
-    print("Voulez-vous vérifier et installer les dépendances maintenant? (o/n)")
-    choice = input("> ").lower()
-    
-    if choice == 'o':
-        if not install_requirements():
-            input("Appuyez sur Entrée pour quitter...")
+
+def main(argv=None):
+    """Fonction principale"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    setup_logging()
+    
+    # Ne vérifier l'environnement que si le fichier témoin est absent ou périmé
+    stamp_key = compute_stamp_key()
+    if args.check or args.interactive or not stamp_is_valid(stamp_key):
+        print("Vérification de l'environnement de NightMod...")
+        if not check_environment(args.interactive):
+            wait_before_exit(args.interactive)
             return 1
     
-    # Ajouter le répertoire courant au chemin de recherche des modules
-    script_dir = Path(__file__).parent.absolute()
-    sys.path.insert(0, str(script_dir))
+        # L'environnement a pu changer (installation), recalculer la clé
+        write_stamp(compute_stamp_key())
     
     try:
         # Importer et lancer l'application principale
-        print("Lancement de NightMod...")
         from nightmod import main as nightmod_main
         nightmod_main()
         return 0
     except ImportError as e:
+        # Une dépendance a pu disparaître depuis la dernière vérification
+        invalidate_stamp()
         logger.error(f"Erreur lors de l'importation de l'application principale: {e}")
         print("Erreur: Impossible de trouver ou d'importer l'application principale.")
         print(f"Détails: {e}")
@@ -158,8 +246,8 @@ def main():
         print(f"Erreur: {e}")
         print("Consultez les logs pour plus de détails.")
     
-    input("Appuyez sur Entrée pour quitter...")
+    wait_before_exit(args.interactive)
     return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
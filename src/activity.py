@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Activité de la machine pendant une vérification
+
+Éteindre la machine en pleine nuit interrompt aussi un téléchargement, une
+compilation ou un rendu. Pendant qu'une vérification est en attente, un
+échantillonneur relève les compteurs cumulés du processeur, des disques et du
+réseau (/proc/stat, /proc/diskstats, /proc/net/dev, ou psutil hors Linux) et
+en déduit des débits par différence entre deux relevés : seul le relevé
+précédent est conservé.
+
+Le rythme est adaptatif : rapproché au début de la vérification et lorsque
+l'état « occupé » change, il double ensuite jusqu'à un plafond. Au-dessus des
+seuils configurés, l'action est reportée (puis retentée) ou remplacée par un
+verrouillage de la session, qui laisse le travail en cours se terminer.
+"""
+
+import os
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger("NightMod.Activity")
+
+# Intervalles de l'échantillonnage adaptatif (secondes)
+MIN_INTERVAL = 5.0
+MAX_INTERVAL = 60.0
+
+# Durée minimale entre deux relevés pour calculer un débit (secondes)
+MIN_WINDOW = 1.0
+
+# Seuils par défaut : processeur (%), disques et réseau (octets/s)
+CPU_THRESHOLD = 50.0
+DISK_THRESHOLD = 5 * 1024 * 1024
+NET_THRESHOLD = 512 * 1024
+
+# Report d'une action : délai entre deux tentatives et report cumulé maximal (secondes)
+DEFER_INTERVAL = 5 * 60.0
+MAX_DEFER = 2 * 3600.0
+
+# Périphériques blocs ignorés (virtuels ou comptés deux fois)
+IGNORED_DISK_PREFIXES = ("loop", "ram", "zram", "dm-", "md", "sr", "fd")
+
+Counters = namedtuple("Counters", "cpu_busy cpu_total disk_bytes net_bytes")
+Rates = namedtuple("Rates", "cpu_percent disk_bps net_bps")
+Thresholds = namedtuple("Thresholds", "cpu_percent disk_bps net_bps")
+
+
+def read_proc_counters(proc="/proc", sys_block="/sys/block"):
+    """Relève les compteurs cumulés depuis /proc (Linux)"""
+    with open(os.path.join(proc, "stat")) as f:
+        fields = f.readline().split()
+    # user nice system idle iowait irq softirq steal
+    values = [int(value) for value in fields[1:9]]
+    cpu_total = sum(values)
+    cpu_busy = cpu_total - values[3] - values[4]
+
+    try:
+        whole_disks = set(os.listdir(sys_block))
+    except OSError:
+        whole_disks = None
+    disk_sectors = 0
+    with open(os.path.join(proc, "diskstats")) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            name = fields[2]
+            if name.startswith(IGNORED_DISK_PREFIXES):
+                continue
+            # Les partitions sont déjà comptées dans leur disque
+            if whole_disks is not None and name not in whole_disks:
+                continue
+            disk_sectors += int(fields[5]) + int(fields[9])
+
+    net_bytes = 0
+    with open(os.path.join(proc, "net", "dev")) as f:
+        for line in f.readlines()[2:]:
+            interface, _, data = line.partition(":")
+            if interface.strip() == "lo":
+                continue
+            fields = data.split()
+            net_bytes += int(fields[0]) + int(fields[8])
+
+    # Les secteurs de /proc/diskstats font toujours 512 octets
+    return Counters(cpu_busy, cpu_total, disk_sectors * 512, net_bytes)
+
+
+def read_psutil_counters():
+    """Relève les compteurs cumulés avec psutil (hors Linux)"""
+    import psutil
+
+    times = psutil.cpu_times()
+    cpu_total = sum(times)
+    cpu_idle = times.idle + getattr(times, "iowait", 0.0)
+
+    disks = psutil.disk_io_counters()
+    disk_bytes = disks.read_bytes + disks.write_bytes if disks else 0
+
+    net_bytes = 0
+    for interface, counters in psutil.net_io_counters(pernic=True).items():
+        if interface == "lo" or interface.lower().startswith("loopback"):
+            continue
+        net_bytes += counters.bytes_sent + counters.bytes_recv
+
+    return Counters(cpu_total - cpu_idle, cpu_total, disk_bytes, net_bytes)
+
+
+def select_reader():
+    """Choisit la source des compteurs (None si aucune n'est disponible)"""
+    if os.path.exists("/proc/stat") and os.path.exists("/proc/diskstats"):
+        return read_proc_counters
+    try:
+        import psutil  # noqa: F401 (dépendance optionnelle)
+    except ImportError:
+        logger.info("Compteurs d'activité indisponibles (ni /proc ni psutil)")
+        return None
+    return read_psutil_counters
+
+
+def format_rate(value):
+    """Débit lisible (octets/s)"""
+    for unit in ("o/s", "Ko/s", "Mo/s"):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} Go/s"
+
+
+class ActivitySampler:
+    """Débits d'activité calculés par différence entre deux relevés, à rythme adaptatif"""
+
+    def __init__(self, clock, reader, thresholds=None, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL):
+        """
+        Args:
+            clock: Horloge de l'application (les relevés sont programmés sur le thread Tk)
+            reader: Fonction retournant les compteurs cumulés (Counters)
+            thresholds: Seuils au-delà desquels la machine est considérée occupée
+            min_interval: Intervalle initial entre deux relevés (secondes)
+            max_interval: Intervalle maximal entre deux relevés (secondes)
+        """
+        self.clock = clock
+        self.reader = reader
+        self.thresholds = thresholds or Thresholds(CPU_THRESHOLD, DISK_THRESHOLD, NET_THRESHOLD)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.previous = None
+        self.previous_at = None
+        self.rates = None
+        self.job = None
+        self.running = False
+
+    def start(self):
+        """Démarre l'échantillonnage (relevé de référence immédiat)"""
+        if self.running:
+            return
+        self.running = True
+        self.rates = None
+        self.previous = None
+        self.interval = self.min_interval
+        self.sample()
+        self.job = self.clock.call_later(self.interval, self._tick)
+
+    def stop(self):
+        """Arrête l'échantillonnage et oublie les relevés"""
+        self.running = False
+        if self.job is not None:
+            self.clock.cancel(self.job)
+            self.job = None
+        self.previous = None
+        self.rates = None
+
+    def sample(self):
+        """Relève les compteurs et met à jour les débits si la fenêtre est suffisante"""
+        try:
+            counters = self.reader()
+        except (OSError, ValueError, IndexError) as e:
+            logger.error(f"Erreur lors du relevé de l'activité: {e}")
+            return self.rates
+        now = self.clock.now()
+
+        if self.previous is not None:
+            elapsed = now - self.previous_at
+            if elapsed < MIN_WINDOW:
+                return self.rates
+            cpu_total = counters.cpu_total - self.previous.cpu_total
+            cpu_busy = counters.cpu_busy - self.previous.cpu_busy
+            self.rates = Rates(
+                100.0 * cpu_busy / cpu_total if cpu_total > 0 else 0.0,
+                max(0, counters.disk_bytes - self.previous.disk_bytes) / elapsed,
+                max(0, counters.net_bytes - self.previous.net_bytes) / elapsed,
+            )
+        self.previous = counters
+        self.previous_at = now
+        return self.rates
+
+    def current_rates(self):
+        """Débits sur la fenêtre la plus récente (relevé immédiat si possible)"""
+        if self.running:
+            self.sample()
+        return self.rates
+
+    def busy_reasons(self, rates=None):
+        """Liste des ressources au-dessus des seuils (vide si la machine est au repos)"""
+        rates = rates or self.rates
+        if rates is None:
+            return []
+        reasons = []
+        if rates.cpu_percent >= self.thresholds.cpu_percent:
+            reasons.append(f"processeur {rates.cpu_percent:.0f} %")
+        if rates.disk_bps >= self.thresholds.disk_bps:
+            reasons.append(f"disques {format_rate(rates.disk_bps)}")
+        if rates.net_bps >= self.thresholds.net_bps:
+            reasons.append(f"réseau {format_rate(rates.net_bps)}")
+        return reasons
+
+    def _tick(self):
+        self.job = None
+        if not self.running:
+            return
+        was_busy = bool(self.busy_reasons())
+        self.sample()
+        if bool(self.busy_reasons()) != was_busy:
+            # Changement d'état : revenir au rythme rapproché
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        self.job = self.clock.call_later(self.interval, self._tick)
+
+
+class ActionGuard:
+    """Reporte l'action ou la remplace par un verrouillage lorsque la machine travaille"""
+
+    def __init__(self, sampler, busy_action="defer", defer_interval=DEFER_INTERVAL, max_defer=MAX_DEFER):
+        """
+        Args:
+            sampler: Échantillonneur d'activité (démarré avec la vérification)
+            busy_action: "defer" (reporter l'action) ou "lock" (verrouiller à la place)
+            defer_interval: Délai avant une nouvelle tentative (secondes)
+            max_defer: Report cumulé au-delà duquel l'action est exécutée (secondes)
+        """
+        self.sampler = sampler
+        self.busy_action = busy_action
+        self.defer_interval = defer_interval
+        self.max_defer = max_defer
+        self.deferred_since = None
+
+    def reset(self):
+        self.deferred_since = None
+
+    def decide(self, action, allow_defer=True, fresh=True):
+        """Décide du sort de l'action
+
+        Args:
+            action: Action configurée
+            allow_defer: False hors du thread Tk (chien de garde) : un report y
+                devient un verrouillage
+            fresh: Relever les compteurs avant de décider (thread Tk uniquement)
+
+        Returns:
+            (action à exécuter, report en secondes) ; un report non nul signifie
+            qu'aucune action ne doit être exécutée maintenant
+        """
+        rates = self.sampler.current_rates() if fresh else self.sampler.rates
+        reasons = self.sampler.busy_reasons(rates)
+        if not reasons or action == "lock":
+            return action, 0
+        description = ", ".join(reasons)
+
+        if self.busy_action == "lock" or not allow_defer:
+            logger.info(f"Machine occupée ({description}) : verrouillage au lieu de « {action} »")
+            return "lock", 0
+
+        now = self.sampler.clock.now()
+        if self.deferred_since is None:
+            self.deferred_since = now
+        if now - self.deferred_since >= self.max_defer:
+            logger.info(f"Machine toujours occupée ({description}), report maximal atteint : « {action} »")
+            return action, 0
+
+        logger.info(f"Machine occupée ({description}) : « {action} » reporté de {self.defer_interval:.0f} s")
+        return action, self.defer_interval
@@ -1,39 +1,168 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
+import time
 import platform
 import logging
-import threading
-import time
-from datetime import datetime
 
 from src.config import ConfigManager
 from src.popup import PopupChecker
 from src.system_actions import SystemActions
 from src.tray import TrayIcon
-from src.styles import apply_custom_styles
+from src.styles import ThemeEngine, available_themes
+from src.fonts import FontRegistry
+from src import history, tracing
+from src.stats import RunningStats
+from src.scheduling import create_interval_policy
+from src.monitoring import MonitoringManager
+from src.clock import TkClock
+from src.lagmonitor import LagProbe
+from src.diagnostics import DiagnosticsWindow
+from src.watchdog import DeadlineWatchdog, GRACE_PERIOD
+from src.metrics import NightModMetrics, MetricsExporter, EXPORT_INTERVAL, get_metrics_path
+from src.status import StatusFile
+from src.idletime import IdleGate, select_backend, IDLE_THRESHOLD, MAX_POSTPONE
+from src.activity import ActivitySampler, ActionGuard, Thresholds, select_reader
+from src.playback import PlaybackMonitor, PlaybackGate
 
 # Définir le logger
 logger = logging.getLogger("NightMod.App")
 
 class NightModApp(tk.Tk):
-    def __init__(self):
+    # Attributs créés par setup_ui et libérés lorsque l'interface est détruite
+    UI_ATTRIBUTES = (
+        "main_frame", "status_indicator", "status_var", "next_check_var",
+        "monitoring_button", "interval_var", "response_var", "action_var",
+        "sound_var", "autostart_var", "minimize_var", "theme_var", "stats_vars"
+    )
+
+    # Libellés des actions dans le panneau de statistiques
+    ACTION_LABELS = {"shutdown": "extinction", "sleep": "veille", "lock": "verrouillage"}
+
+    def __init__(self, clock=None):
         super().__init__()
         
+        # La fenêtre reste masquée tant que l'interface n'est pas nécessaire
+        self.withdraw()
+        
         self.config_manager = ConfigManager()
         self.config = self.config_manager.get_all()
+        
+        # Traçage du chemin critique (export à la fermeture ou sur SIGUSR1)
+        if self.config.get("tracing_enabled", False):
+            tracing.enable(self.config.get("trace_buffer_size", tracing.TRACE_CAPACITY))
+            tracing.install_dump_signal()
+
+        # Horloge de l'application (injectable pour les tests)
+        self.clock = clock or TkClock(self)
+
+        # Détection de l'inactivité : source choisie une fois au démarrage
+        self.idle_gate = None
+        if self.config.get("idle_detection_enabled", True):
+            backend = select_backend(self.config.get("idle_backend", "auto"))
+            if backend:
+                self.idle_gate = IdleGate(
+                    backend,
+                    self.config.get("idle_threshold_seconds", IDLE_THRESHOLD),
+                    self.config.get("idle_max_postpone_minutes", MAX_POSTPONE / 60) * 60
+                )
+
+        # Lecture multimédia : indicateur tenu à jour par les signaux du bus de session
+        self.playback_monitor = None
+        self.postpone_gates = []
+        if self.config.get("playback_detection_enabled", True):
+            monitor = PlaybackMonitor()
+            if monitor.start():
+                self.playback_monitor = monitor
+                self.postpone_gates.append(PlaybackGate(
+                    monitor,
+                    self.config.get("playback_postpone_minutes", 5) * 60,
+                    self.config.get("playback_max_postpone_minutes", 180) * 60
+                ))
+        if self.idle_gate:
+            self.postpone_gates.append(self.idle_gate)
+
+        # Initialisation du gestionnaire de surveillance
+        self.monitor = MonitoringManager(
+            self.clock,
+            create_interval_policy(self.config),
+            self.show_check_popup,
+            self.on_check_scheduled,
+            self.postpone_check if self.postpone_gates else None,
+            self.on_check_postponed
+        )
+        self.display_job = None
+        self.status_text = "Inactif"
+        self.popup = None
+        
+        # Statistiques cumulées, sauvegardées par le thread d'écriture de l'historique
+        self.stats = RunningStats()
+        
+        # Historique des événements (écriture en arrière-plan)
+        self.history = None
+        if self.config.get("history_enabled", True):
+            self.history = history.EventHistory(on_batch=self.stats.save)
+        
+        # Métriques Prometheus (fichier et, en option, serveur HTTP local)
+        self.metrics = None
+        self.metrics_exporter = None
+        if self.config.get("metrics_enabled", False):
+            self.start_metrics()
+        
+        # Fichier d'état pour les barres d'état (réécrit uniquement lors d'un changement)
+        self.status_file = None
+        if self.config.get("status_file_enabled", True):
+            self.status_file = StatusFile()
+            try:
+                if not self.status_file.open():
+                    self.status_file = None
+            except OSError as e:
+                logger.error(f"Impossible de créer le fichier d'état: {e}")
+                self.status_file = None
+        
+        # Activité de la machine : l'action est reportée ou remplacée par un
+        # verrouillage pendant un téléchargement, une compilation ou un rendu
+        self.action_guard = None
+        self.deferred_action_job = None
+        if self.config.get("activity_guard_enabled", True):
+            reader = select_reader()
+            if reader:
+                thresholds = Thresholds(
+                    self.config.get("activity_cpu_percent", 50),
+                    self.config.get("activity_disk_kbps", 5120) * 1024,
+                    self.config.get("activity_net_kbps", 512) * 1024
+                )
+                self.action_guard = ActionGuard(
+                    ActivitySampler(self.clock, reader, thresholds),
+                    self.config.get("activity_busy_action", "defer"),
+                    self.config.get("activity_defer_minutes", 5) * 60,
+                    self.config.get("activity_max_defer_minutes", 120) * 60
+                )
+        
+        # Sonde de réactivité de la boucle Tk (rapide seulement si une fenêtre est visible)
+        self.lag_probe = None
+        if self.config.get("lag_monitor_enabled", True):
+            self.lag_probe = LagProbe(self.clock, threshold=self.config.get("lag_stall_threshold_ms", 250) / 1000)
+            self.lag_probe.start()
+        self.diagnostics_window = None
+        
+        # Chien de garde de l'échéance des vérifications (indépendant de la boucle Tk)
+        self.watchdog = None
+        if self.config.get("watchdog_enabled", True):
+            self.watchdog = DeadlineWatchdog(
+                self.on_watchdog_expired,
+                self.config.get("watchdog_grace_seconds", GRACE_PERIOD)
+            )
+        
+        # L'interface des paramètres n'est construite qu'à la première ouverture
+        self.ui_built = False
+        self.teardown_job = None
+        for attribute in self.UI_ATTRIBUTES:
+            setattr(self, attribute, None)
 
         # Configuration de la fenêtre principale
         self.setup_main_window()
         
-        # Configuration de l'interface utilisateur
-        self.setup_ui()
-        
-        # Initialisation du gestionnaire de surveillance
-        self.is_monitoring = False
-        self.next_check_time = None
-        self.timer_thread = None
-        
         # Création de l'icône dans la barre des tâches
         self.tray_icon = TrayIcon(
             self,
@@ -46,6 +175,13 @@ class NightModApp(tk.Tk):
         # Démarrage automatique de la surveillance si configuré
         if self.config.get("start_with_system", False):
             self.toggle_monitoring()
+        
+        # Démarrage dans la barre des tâches : la fenêtre n'est construite
+        # qu'à sa première ouverture depuis l'icône
+        if not (self.config.get("start_with_system", False) and self.tray_icon.is_available()):
+            self.show_main_window()
+        else:
+            logger.info("Démarrage dans la barre des tâches, interface non construite")
             
         # Protocole de fermeture de la fenêtre
         self.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -53,8 +189,8 @@ class NightModApp(tk.Tk):
     def setup_main_window(self):
         """Configuration de la fenêtre principale"""
         self.title("NightMod")
-        self.geometry("480x520")
-        self.minsize(480, 520)
+        self.geometry("480x660")
+        self.minsize(480, 660)
 
         # Centre la fenêtre sur l'écran
         screen_width = self.winfo_screenwidth()
@@ -63,10 +199,13 @@ class NightModApp(tk.Tk):
         y = (screen_height - 520) // 2
         self.geometry(f"+{x}+{y}")
 
-        # Configuration du thème et du style
-        self.configure(bg="#1a1a1a")
+        # Polices partagées (résolues une seule fois pour toute l'application)
+        self.fonts = FontRegistry(self)
+        
+        # Configuration du thème et du style (compilé une fois puis mis en cache)
         self.style = ttk.Style(self)
-        apply_custom_styles(self.style)
+        self.theme = ThemeEngine(self)
+        self.theme.apply(self.config)
         
         # Configuration de l'icône de l'application
         self.set_application_icon()
@@ -105,8 +244,8 @@ class NightModApp(tk.Tk):
         self.status_indicator = ttk.Label(
             status_frame,
             text="●",
-            font=("Segoe UI", 14),
-            foreground="#888888"
+            font=self.fonts["status"],
+            foreground=self.theme.palette["inactive"] if self.theme.palette else "#888888"
         )
         self.status_indicator.grid(row=0, column=0, padx=(0, 15))
         
@@ -143,6 +282,33 @@ class NightModApp(tk.Tk):
         )
         self.monitoring_button.pack(pady=5)
         
+        # Accès à la vue de diagnostic (réactivité de la boucle d'événements)
+        if self.lag_probe:
+            ttk.Button(controls_frame, text="Diagnostics", command=self.show_diagnostics).pack(pady=5)
+        
+        # Séparateur
+        ttk.Separator(self.main_frame).pack(fill=tk.X, pady=15)
+        
+        # Frame pour les statistiques
+        stats_frame = ttk.Frame(self.main_frame)
+        stats_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(stats_frame, text="Statistiques", font=self.fonts["heading"]).grid(
+            row=0, column=0, columnspan=2, sticky=tk.W)
+        
+        self.stats_vars = {}
+        stats_rows = [
+            ("answered", "Vérifications répondues:"),
+            ("latency", "Temps de réponse médian:"),
+            ("actions", "Actions exécutées:"),
+            ("sleep_hour", "Endormissement habituel:"),
+        ]
+        for row, (key, label) in enumerate(stats_rows, start=1):
+            ttk.Label(stats_frame, text=label).grid(row=row, column=0, sticky=tk.W)
+            self.stats_vars[key] = tk.StringVar()
+            ttk.Label(stats_frame, textvariable=self.stats_vars[key]).grid(
+                row=row, column=1, sticky=tk.W, padx=10)
+        
         # Séparateur
         ttk.Separator(self.main_frame).pack(fill=tk.X, pady=15)
         
@@ -150,7 +316,7 @@ class NightModApp(tk.Tk):
         settings_frame = ttk.Frame(self.main_frame)
         settings_frame.pack(fill=tk.X, pady=10)
         
-        ttk.Label(settings_frame, text="Paramètres", font=("Segoe UI", 12, "bold")).pack(anchor=tk.W)
+        ttk.Label(settings_frame, text="Paramètres", font=self.fonts["heading"]).pack(anchor=tk.W)
         
         # Frame pour l'intervalle entre les vérifications
         interval_frame = ttk.Frame(settings_frame)
@@ -236,10 +402,81 @@ class NightModApp(tk.Tk):
         )
         minimize_check.pack(anchor=tk.W, pady=2)
         
-        # Appliquer les couleurs à tous les widgets créés
-        if hasattr(apply_custom_styles, 'fix_widget_colors'):
-            for widget in self.winfo_children():
-                apply_custom_styles.fix_widget_colors(widget)
+        # Frame pour le thème de l'interface
+        theme_frame = ttk.Frame(settings_frame)
+        theme_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(theme_frame, text="Thème de l'interface:").grid(row=0, column=0, sticky=tk.W)
+        
+        self.theme_var = tk.StringVar(value=self.config.get("ui_theme", "dark"))
+        theme_menu = tk.OptionMenu(
+            theme_frame,
+            self.theme_var,
+            *available_themes()
+        )
+        theme_menu.config(width=10)
+        theme_menu.grid(row=0, column=1, padx=10)
+        self.theme_var.trace("w", lambda *args: self.save_settings())
+        
+        # Widgets tk recolorés lors d'un changement de thème à chaud
+        self.theme.track(
+            self.monitoring_button, interval_entry, response_entry, action_menu,
+            sound_check, autostart_check, minimize_check, theme_menu
+        )
+
+    def build_ui(self):
+        """Construit l'interface des paramètres si nécessaire et la synchronise avec l'état"""
+        if self.ui_built:
+            return
+        
+        self.setup_ui()
+        self.ui_built = True
+        
+        # Refléter l'état courant dans les widgets fraîchement créés
+        self.update_status(self.status_text, self.is_monitoring)
+        self.monitoring_button.config(
+            text="Arrêter la surveillance" if self.is_monitoring else "Démarrer la surveillance"
+        )
+        self.refresh_state_colors()
+        self.refresh_next_check_display()
+        self.refresh_stats_panel()
+        logger.info("Interface principale construite")
+
+    def teardown_ui(self):
+        """Détruit l'arbre de widgets de la fenêtre masquée pour libérer la mémoire Tk"""
+        self.teardown_job = None
+        if not self.ui_built or self.state() != 'withdrawn':
+            return
+        
+        self.main_frame.destroy()
+        
+        # Libérer les variables Tk (et leurs callbacks de trace)
+        for attribute in self.UI_ATTRIBUTES:
+            setattr(self, attribute, None)
+        
+        self.ui_built = False
+        logger.info("Interface principale détruite après une période masquée")
+
+    def show_main_window(self):
+        """Affiche la fenêtre principale en construisant l'interface si besoin"""
+        if self.teardown_job is not None:
+            self.after_cancel(self.teardown_job)
+            self.teardown_job = None
+        
+        self.build_ui()
+        self.deiconify()
+        self.lift()
+        self.refresh_next_check_display()
+        self.update_probe_rate()
+
+    def hide_main_window(self):
+        """Masque la fenêtre principale et programme la libération de son interface"""
+        self.withdraw()
+        self.update_probe_rate()
+        
+        delay_minutes = self.config.get("ui_teardown_minutes", 10)
+        if delay_minutes and delay_minutes > 0 and self.teardown_job is None:
+            self.teardown_job = self.after(int(delay_minutes * 60 * 1000), self.teardown_ui)
 
     def save_settings(self, event=None):
         """Sauvegarde les paramètres dans le fichier de configuration"""
@@ -251,12 +488,17 @@ class NightModApp(tk.Tk):
                 "shutdown_action": self.action_var.get(),
                 "sound_enabled": self.sound_var.get(),
                 "start_with_system": self.autostart_var.get(),
-                "minimize_to_tray": self.minimize_var.get()
+                "minimize_to_tray": self.minimize_var.get(),
+                "ui_theme": self.theme_var.get()
             }
             
             # Mettre à jour la configuration
             self.config_manager.update(new_config)
             self.config = self.config_manager.get_all()
+            self.monitor.policy = create_interval_policy(self.config, self.monitor.policy)
+            
+            # Changer de thème à chaud (sans reconstruire les widgets)
+            self.apply_theme()
             
             # Mettre à jour l'autostart système si nécessaire
             try:
@@ -269,6 +511,23 @@ class NightModApp(tk.Tk):
             logger.error(f"Erreur lors de la sauvegarde des paramètres: {e}")
             messagebox.showerror("Erreur", f"Impossible de sauvegarder les paramètres: {e}")
 
+    def apply_theme(self):
+        """Applique le thème de la configuration et rafraîchit les couleurs d'état"""
+        current = self.theme.current
+        if self.theme.apply(self.config) is not current:
+            self.refresh_state_colors()
+
+    def refresh_state_colors(self):
+        """Rafraîchit les couleurs qui dépendent de l'état de la surveillance"""
+        palette = self.theme.palette
+        if not palette or not self.ui_built:
+            return
+        self.status_indicator.config(foreground=palette["accent"] if self.is_monitoring else palette["inactive"])
+        self.monitoring_button.config(
+            bg=palette["danger"] if self.is_monitoring else palette["accent"],
+            fg=palette["button_fg"]
+        )
+
     def toggle_monitoring(self):
         """Démarre ou arrête la surveillance"""
         if self.is_monitoring:
@@ -276,18 +535,26 @@ class NightModApp(tk.Tk):
         else:
             self.start_monitoring()
     
+    @property
+    def is_monitoring(self):
+        """Indique si la surveillance est active"""
+        return self.monitor.is_running
+    
     def start_monitoring(self):
         """Démarre la surveillance"""
         if self.is_monitoring:
             return
-            
-        self.is_monitoring = True
-        self.timer_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
-        self.timer_thread.start()
+        
+        # Un utilisateur qui relance la surveillance est éveillé
+        self.cancel_deferred_action()
+        self.monitor.start()
+        self.publish_status(monitoring=True)
         
         # Mettre à jour l'interface
         self.update_status("Actif", True)
-        self.monitoring_button.config(text="Arrêter la surveillance", bg="#F44336", fg="#FFFFFF")
+        if self.ui_built:
+            self.monitoring_button.config(text="Arrêter la surveillance")
+            self.refresh_state_colors()
         
         # Mettre à jour l'icône de la barre des tâches
         if self.tray_icon:
@@ -297,55 +564,76 @@ class NightModApp(tk.Tk):
 
     def stop_monitoring(self):
         """Arrête la surveillance"""
-        self.is_monitoring = False
-        self.next_check_time = None
+        self.monitor.stop()
+        self.cancel_display_refresh()
+        self.publish_status(monitoring=False, next_check_monotonic=None, next_check_wall=None)
         
         # Mettre à jour l'interface
         self.update_status("Inactif", False)
-        self.monitoring_button.config(text="Démarrer la surveillance", bg="#4CAF50", fg="#FFFFFF")
-        self.next_check_var.set("Aucune vérification prévue")
+        if self.ui_built:
+            self.monitoring_button.config(text="Démarrer la surveillance")
+            self.refresh_state_colors()
+            self.next_check_var.set("Aucune vérification prévue")
         
         # Mettre à jour l'icône de la barre des tâches
         if self.tray_icon:
+            self.tray_icon.stop_countdown()
             self.tray_icon.update_icon(False)
             
         logger.info("Surveillance arrêtée")
     
-    def _monitoring_loop(self):
-        """Boucle principale de surveillance - renommée avec underscore pour éviter les conflits"""
-        while self.is_monitoring:
-            # Calculer le temps de la prochaine vérification
-            interval_seconds = self.config.get("check_interval_minutes", 20) * 60
-            self.next_check_time = datetime.now().timestamp() + interval_seconds
-            
-            # Mettre à jour l'affichage
-            self.update_next_check_time()
-            
-            # Attendre jusqu'à la prochaine vérification
-            for _ in range(interval_seconds):
-                if not self.is_monitoring:
-                    break
-                time.sleep(1)
-                
-                # Mettre à jour l'affichage toutes les 30 secondes
-                if _ % 30 == 0:
-                    self.update_next_check_time()
-            
-            # Vérifier si la surveillance est toujours active
-            if not self.is_monitoring:
-                break
-                
-            # Afficher la fenêtre de vérification
-            self.after(0, self.show_check_popup)
+    def on_check_scheduled(self, interval_seconds, deadline):
+        """Appelé par le planificateur à chaque programmation d'une vérification"""
+        due = self.clock.wall_time() + interval_seconds
+        self.record_event(history.CHECK_SCHEDULED, interval=interval_seconds, due=due)
+        self.publish_status(next_check_monotonic=round(deadline, 3), next_check_wall=round(due, 3))
+        
+        # Mettre à jour l'affichage
+        self.refresh_next_check_display()
+        
+        # Animer l'icône de progression jusqu'à l'échéance
+        if self.tray_icon:
+            self.tray_icon.start_countdown(deadline - interval_seconds, deadline)
+    
+    def on_check_postponed(self, delay, deadline):
+        """Appelé par le planificateur lorsqu'une vérification est reportée
+
+        Seule l'échéance affichée change : ni événement CHECK_SCHEDULED, ni
+        nouvelle animation de l'icône.
+        """
+        due = self.clock.wall_time() + delay
+        self.publish_status(next_check_monotonic=round(deadline, 3), next_check_wall=round(due, 3))
+        self.refresh_next_check_display()
+    
+    def refresh_next_check_display(self):
+        """Rafraîchit le temps restant à chaque seconde tant que l'interface est construite"""
+        self.cancel_display_refresh()
+        self.update_next_check_time()
+        
+        remaining = self.monitor.remaining()
+        if self.ui_built and remaining and self.state() != 'withdrawn':
+            # Prochain rafraîchissement au passage de la seconde suivante
+            self.display_job = self.clock.call_later(remaining % 1 or 1, self.refresh_next_check_display)
+    
+    def cancel_display_refresh(self):
+        """Annule le rafraîchissement programmé du temps restant"""
+        if self.display_job is not None:
+            self.clock.cancel(self.display_job)
+            self.display_job = None
     
     def update_next_check_time(self):
         """Met à jour l'affichage du temps avant la prochaine vérification"""
-        if not self.next_check_time:
+        # Rien à afficher tant que l'interface n'est pas construite
+        if not self.ui_built:
+            return
+        
+        remaining = self.monitor.remaining()
+        if remaining is None:
             self.next_check_var.set("Aucune vérification prévue")
             return
             
         # Calculer le temps restant
-        remaining = max(0, int(self.next_check_time - datetime.now().timestamp()))
+        remaining = int(remaining)
         minutes = remaining // 60
         seconds = remaining % 60
         
@@ -355,49 +643,250 @@ class NightModApp(tk.Tk):
         else:
             self.next_check_var.set(f"Dans {seconds} secondes")
     
+    def postpone_check(self, postponed_for):
+        """Report d'une vérification arrivée à échéance (lecture en cours, saisie récente)
+
+        Args:
+            postponed_for: Report déjà accordé à cette vérification (secondes)
+        """
+        for gate in self.postpone_gates:
+            delay = gate(postponed_for)
+            if delay:
+                return delay
+        return 0
+    
     def show_check_popup(self):
         """Affiche la fenêtre de vérification"""
         response_time = self.config.get("response_time_seconds", 30)
-        PopupChecker(
-            self,
-            response_time,
-            self.on_user_response,
-            self.on_no_response,
-            self.config
+        logger.info("Affichage de la fenêtre de vérification")
+        self.record_event(history.POPUP_SHOWN, response_time=response_time)
+        # Armé avant la construction du popup : celle-ci peut bloquer le thread
+        # Tk (son de notification joué par un processus externe)
+        if self.watchdog:
+            self.watchdog.arm(response_time)
+        try:
+            self.popup = PopupChecker(
+                self,
+                response_time,
+                self.on_user_response,
+                self.on_no_response,
+                self.config,
+                self.clock
+            )
+        except Exception:
+            # Pas de popup, pas d'action : le planificateur programme la suivante
+            if self.watchdog:
+                self.watchdog.resolve()
+            raise
+        if self.action_guard:
+            self.action_guard.sampler.start()
+        self.publish_status(
+            popup_open=True,
+            popup_deadline_wall=round(self.clock.wall_time() + response_time, 3),
+            next_check_monotonic=None,
+            next_check_wall=None
         )
+        self.update_probe_rate()
+
+    def refresh_stats_panel(self):
+        """Met à jour le panneau de statistiques à partir des agrégats (coût constant)"""
+        if not self.ui_built:
+            return
+        
+        summary = self.stats.summary()
+        self.stats_vars["answered"].set(f"{summary['answered']} sur {summary['checks']}")
+        
+        latency = summary["median_latency"]
+        self.stats_vars["latency"].set(f"{latency:.1f} s" if latency is not None else "—")
+        
+        actions = ", ".join(
+            f"{self.ACTION_LABELS.get(action, action)} {count}"
+            for action, count in sorted(summary["actions"].items())
+        )
+        self.stats_vars["actions"].set(actions or "aucune")
+        
+        hour = summary["sleep_hour"]
+        self.stats_vars["sleep_hour"].set(f"vers {hour} h" if hour is not None else "—")
 
     def update_status(self, status, active=False):
         """Met à jour l'affichage de l'état"""
+        self.status_text = status
+        if not self.ui_built:
+            return
+        
         self.status_var.set(status)
-        self.status_indicator.config(foreground="#4CAF50" if active else "#888888")
+        palette = self.theme.palette or {"accent": "#4CAF50", "inactive": "#888888"}
+        self.status_indicator.config(foreground=palette["accent"] if active else palette["inactive"])
 
     def toggle_visibility(self):
         """Affiche ou masque la fenêtre principale"""
         if self.state() == 'withdrawn':
-            self.deiconify()
-            self.lift()
+            self.show_main_window()
         else:
-            if self.minimize_var.get() and self.tray_icon and self.tray_icon.is_available():
-                self.withdraw()
+            if self.config.get("minimize_to_tray", True) and self.tray_icon and self.tray_icon.is_available():
+                self.hide_main_window()
     
     def on_user_response(self):
         """Appelé lorsque l'utilisateur répond au popup"""
-        logger.info("L'utilisateur a répondu au popup")
-        # Rien à faire ici, la surveillance continue normalement
+        if self.watchdog and not self.watchdog.resolve():
+            # La boucle Tk était bloquée : le chien de garde a déjà exécuté l'action
+            logger.warning("Réponse reçue après l'exécution de l'action par le chien de garde")
+            self.on_no_response()
+            return
+        
+        latency = self.popup_latency()
+        self.publish_status(popup_open=False, popup_deadline_wall=None)
+        if self.action_guard:
+            self.action_guard.sampler.stop()
+        if latency is not None:
+            logger.info(f"L'utilisateur a répondu au popup en {latency:.1f} s")
+        else:
+            logger.info("L'utilisateur a répondu au popup")
+        self.record_event(history.RESPONSE, duration=latency)
+        
+        # Programmer la vérification suivante (l'intervalle dépend du temps de réponse)
+        self.monitor.record_response(latency, self.config.get("response_time_seconds", 30))
+        self.stats.record_response(latency)
+        self.refresh_stats_panel()
+        self.update_probe_rate()
     
     def on_no_response(self):
         """Appelé lorsque l'utilisateur ne répond pas au popup"""
         logger.info("Aucune réponse de l'utilisateur, exécution de l'action configurée")
+        self.record_event(history.TIMEOUT, duration=self.popup_latency())
+        self.publish_status(popup_open=False, popup_deadline_wall=None)
+        self.monitor.record_timeout()
+        self.stats.record_timeout()
+        self.update_probe_rate()
         
-        # Exécuter l'action configurée
+        # Arrêter la surveillance
+        self.stop_monitoring()
+        
+        # Exécuter l'action configurée, sauf si le chien de garde l'a déjà fait
         action = self.config.get("shutdown_action", "shutdown")
+        if self.watchdog is None or self.watchdog.resolve():
+            if self.action_guard:
+                self.action_guard.reset()
+            self.run_guarded_action(action)
+        else:
+            if self.action_guard:
+                self.action_guard.sampler.stop()
+            self.refresh_stats_panel()
+    
+    def run_guarded_action(self, action):
+        """Exécute l'action, sauf si la machine travaille (report ou verrouillage)"""
+        self.deferred_action_job = None
+        if self.action_guard:
+            action_to_run, delay = self.action_guard.decide(action)
+            if delay:
+                self.deferred_action_job = self.clock.call_later(delay, self.run_guarded_action, action)
+                self.update_status("Action reportée (machine occupée)")
+                return
+            self.action_guard.sampler.stop()
+            action = action_to_run
+        
+        self.execute_action(action)
+        self.refresh_stats_panel()
+    
+    def cancel_deferred_action(self):
+        """Annule une action reportée en attente"""
+        if self.deferred_action_job is not None:
+            self.clock.cancel(self.deferred_action_job)
+            self.deferred_action_job = None
+            logger.info("Action reportée annulée")
+        if self.action_guard:
+            self.action_guard.sampler.stop()
+    
+    def execute_action(self, action):
+        """Exécute l'action configurée et l'enregistre (thread Tk ou chien de garde)"""
+        started = time.monotonic()
         try:
-            SystemActions.perform_action(action)
+            result = "success" if SystemActions.perform_action(action) else "failure"
         except Exception as e:
             logger.error(f"Erreur lors de l'exécution de l'action: {e}")
+            result = f"error: {e}"
+        self.record_event(history.ACTION_EXECUTED, action=action, result=result,
+                          duration=time.monotonic() - started)
+        self.stats.record_action(action)
+        self.publish_status(
+            last_action=action,
+            last_action_result=result if result in ("success", "failure") else "error",
+            last_action_wall=round(time.time(), 3)
+        )
         
-        # Arrêter la surveillance
-        self.stop_monitoring()
+        # Une extinction peut empêcher l'export à la fermeture : exporter dès maintenant
+        tracing.dump_safely()
+    
+    def on_watchdog_expired(self, late):
+        """Appelé dans le thread du chien de garde lorsque le popup n'a pas abouti
+
+        Seuls la configuration, l'historique et le traçage sont utilisés ici : la
+        boucle Tk, bloquée, terminera la vérification lorsqu'elle reprendra.
+        """
+        tracing.instant("watchdog.fired", late=late)
+        action = self.config.get("shutdown_action", "shutdown")
+        if self.action_guard:
+            # Hors du thread Tk : ni report ni nouveau relevé, verrouillage si la machine travaille
+            action, _ = self.action_guard.decide(action, allow_defer=False, fresh=False)
+        self.execute_action(action)
+    
+    def update_probe_rate(self):
+        """Sonde de réactivité rapide tant que la fenêtre principale ou un popup est visible"""
+        if not self.lag_probe:
+            return
+        popup_open = self.popup is not None and self.popup.winfo_exists()
+        self.lag_probe.set_fast(popup_open or self.state() != 'withdrawn')
+    
+    def show_diagnostics(self):
+        """Ouvre la vue de diagnostic (ou la ramène au premier plan)"""
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.lift()
+            return
+        self.diagnostics_window = DiagnosticsWindow(self, self.lag_probe, self.clock)
+        self.theme.track(
+            self.diagnostics_window,
+            self.diagnostics_window.histogram_text,
+            self.diagnostics_window.stack_text
+        )
+    
+    def popup_latency(self):
+        """Retourne le temps de réponse mesuré par le dernier popup (en secondes)"""
+        popup, self.popup = self.popup, None
+        if popup is None or popup.shown_at is None:
+            return None
+        if popup.response_latency is not None:
+            return popup.response_latency
+        return self.clock.now() - popup.shown_at
+    
+    def record_event(self, event, **fields):
+        """Enregistre un événement dans l'historique et les métriques (sans accès disque)"""
+        if self.history:
+            self.history.record(event, **fields)
+        if self.metrics:
+            self.metrics.record(event, **fields)
+    
+    def publish_status(self, **fields):
+        """Met à jour le fichier d'état (thread Tk ou chien de garde)"""
+        if self.status_file:
+            self.status_file.update(**fields)
+    
+    def start_metrics(self):
+        """Crée les métriques et démarre leur export"""
+        self.metrics = NightModMetrics()
+        self.metrics.bind_monitor(self.monitor)
+        self.metrics_exporter = MetricsExporter(
+            self.metrics.registry,
+            self.config.get("metrics_file") or get_metrics_path(),
+            self.config.get("metrics_interval_seconds", EXPORT_INTERVAL),
+            self.config.get("metrics_port", 0) or None
+        )
+        try:
+            self.metrics_exporter.start()
+        except OSError as e:
+            # Port déjà utilisé : conserver l'export par fichier
+            logger.error(f"Impossible de démarrer le serveur de métriques: {e}")
+            self.metrics_exporter.port = None
+            self.metrics_exporter.start()
     
     def confirm_quit(self):
         """Demande confirmation avant de quitter si la surveillance est active"""
@@ -417,9 +906,34 @@ class NightModApp(tk.Tk):
         if self.is_monitoring:
             self.stop_monitoring()
             
+        self.cancel_deferred_action()
+        
         # Arrêter l'icône de la barre des tâches
         if self.tray_icon:
             self.tray_icon.stop()
+        
+        if self.lag_probe:
+            self.lag_probe.stop()
+        
+        if self.watchdog:
+            self.watchdog.stop()
+        
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        
+        if self.status_file:
+            self.status_file.close()
+        
+        if self.idle_gate:
+            self.idle_gate.backend.close()
+        
+        if self.playback_monitor:
+            self.playback_monitor.stop()
+        
+        # Écrire les derniers événements de l'historique et les statistiques
+        if self.history:
+            self.history.close()
+        self.stats.save()
             
         # Fermer l'application
         self.destroy()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Horloges et minuteries de NightMod
+
+La surveillance, le compte à rebours du popup et l'icône de progression ne
+lisent jamais l'heure et ne programment jamais de rappel directement : ils
+passent par une horloge.
+
+- TkClock : temps monotone et rappels programmés par `after` de Tk
+- VirtualClock : temps virtuel avancé explicitement, pour les tests et le
+  simulateur (un cycle de surveillance de 20 minutes s'exécute en quelques
+  millisecondes)
+
+Les deux horloges exposent la même interface : now() (secondes, monotone),
+wall_time() (horodatage Unix correspondant), call_later(délai, rappel) et
+cancel(identifiant).
+"""
+
+import math
+import time
+import heapq
+import itertools
+
+
+class TkClock:
+    """Horloge réelle : time.monotonic et minuteries Tk (à utiliser depuis le thread Tk)"""
+
+    def __init__(self, widget):
+        self.widget = widget
+
+    def now(self):
+        return time.monotonic()
+
+    def wall_time(self):
+        return time.time()
+
+    def call_later(self, delay, callback, *args):
+        """Programme un rappel après un délai en secondes"""
+        return self.widget.after(max(0, int(math.ceil(delay * 1000))), callback, *args)
+
+    def cancel(self, job):
+        self.widget.after_cancel(job)
+
+
+class VirtualClock:
+    """Horloge virtuelle : file de priorité d'événements datés"""
+
+    def __init__(self, start=0.0, wall_offset=0.0):
+        """
+        Args:
+            start: Instant initial (secondes)
+            wall_offset: Horodatage Unix correspondant à l'instant 0
+        """
+        self.current = start
+        self.wall_offset = wall_offset
+        self.queue = []
+        self.counter = itertools.count()
+        self.cancelled = set()
+
+    def now(self):
+        return self.current
+
+    def wall_time(self):
+        return self.wall_offset + self.current
+
+    def call_at(self, when, callback, *args):
+        """Programme un rappel à un instant donné et retourne son identifiant"""
+        job = next(self.counter)
+        heapq.heappush(self.queue, (when, job, callback, args))
+        return job
+
+    def call_later(self, delay, callback, *args):
+        """Programme un rappel après un délai (secondes)"""
+        return self.call_at(self.current + max(0.0, delay), callback, *args)
+
+    def cancel(self, job):
+        """Annule un rappel programmé"""
+        self.cancelled.add(job)
+
+    def pending(self):
+        """Nombre de rappels encore programmés"""
+        return sum(1 for entry in self.queue if entry[1] not in self.cancelled)
+
+    def run(self, until=math.inf):
+        """Exécute les événements dans l'ordre chronologique jusqu'à l'instant donné"""
+        while self.queue and self.queue[0][0] <= until:
+            when, job, callback, args = heapq.heappop(self.queue)
+            if job in self.cancelled:
+                self.cancelled.discard(job)
+                continue
+            self.current = max(self.current, when)
+            callback(*args)
+        if until != math.inf:
+            self.current = max(self.current, until)
+
+    def advance(self, seconds):
+        """Avance le temps en exécutant les rappels échus"""
+        self.run(self.current + seconds)
+
+
+class Countdown:
+    """Compte à rebours basé sur une échéance
+
+    Le temps restant est recalculé à partir de l'échéance à chaque seconde :
+    un rappel en retard (machine chargée) ne décale pas la fin du compte à
+    rebours.
+    """
+
+    def __init__(self, clock, duration, on_tick, on_expire):
+        """
+        Args:
+            clock: Horloge (TkClock ou VirtualClock)
+            duration: Durée en secondes
+            on_tick: Fonction appelée avec le nombre de secondes restantes
+            on_expire: Fonction appelée à l'échéance
+        """
+        self.clock = clock
+        self.duration = duration
+        self.on_tick = on_tick
+        self.on_expire = on_expire
+        self.started_at = None
+        self.deadline = None
+        self.job = None
+
+    def start(self):
+        self.started_at = self.clock.now()
+        self.deadline = self.started_at + self.duration
+        self._tick()
+
+    def remaining(self):
+        """Secondes restantes, arrondies à l'entier supérieur"""
+        if self.deadline is None:
+            return 0
+        return max(0, math.ceil(self.deadline - self.clock.now() - 1e-9))
+
+    def elapsed(self):
+        """Secondes écoulées depuis le début"""
+        if self.started_at is None:
+            return None
+        return self.clock.now() - self.started_at
+
+    def cancel(self):
+        if self.job is not None:
+            self.clock.cancel(self.job)
+            self.job = None
+        self.deadline = None
+
+    def _tick(self):
+        self.job = None
+        if self.deadline is None:
+            return
+
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.deadline = None
+            self.on_expire()
+            return
+
+        self.on_tick(remaining)
+        # Prochain rappel au passage de la seconde suivante
+        delay = self.deadline - self.clock.now() - (remaining - 1)
+        self.job = self.clock.call_later(delay, self._tick)
@@ -9,6 +9,8 @@ import os
 import json
 import logging
 
+from src.utils import get_config_dir
+
 # Obtenir le logger
 logger = logging.getLogger("NightMod.Config")
 
@@ -16,10 +18,43 @@ logger = logging.getLogger("NightMod.Config")
 DEFAULT_CONFIG = {
     "check_interval_minutes": 20,
     "response_time_seconds": 30,
+    "interval_mode": "fixed",    # Options: fixed, adaptive
+    "interval_min_minutes": 5,   # Intervalle minimal en mode adaptatif
+    "interval_max_minutes": 45,  # Intervalle maximal en mode adaptatif
+    "latency_window": 8,         # Nombre de réponses récentes prises en compte
     "shutdown_action": "shutdown",  # Options: shutdown, sleep, lock
     "sound_enabled": True,
     "start_with_system": False,
     "minimize_to_tray": True,
+    "ui_teardown_minutes": 10,   # Destruction de l'interface masquée (0 = jamais)
+    "tray_progress_icon": True,  # Icône de progression vers la prochaine vérification
+    "tray_progress_frames": 24,  # Nombre d'images de l'icône de progression
+    "history_enabled": True,     # Historique des événements (~/.nightmod/history.db)
+    "tracing_enabled": False,    # Traçage du chemin critique (~/.nightmod/traces)
+    "trace_buffer_size": 10000,  # Nombre d'événements de trace conservés
+    "lag_monitor_enabled": True, # Sonde de réactivité de la boucle Tk (vue Diagnostics)
+    "lag_stall_threshold_ms": 250,  # Retard signalé comme un blocage
+    "watchdog_enabled": True,    # Action hors de la boucle Tk si le popup n'aboutit pas
+    "watchdog_grace_seconds": 15,  # Délai accordé au popup après son échéance
+    "metrics_enabled": False,    # Export des métriques au format Prometheus
+    "metrics_file": "",          # Fichier de métriques (vide: ~/.nightmod/metrics.prom)
+    "metrics_interval_seconds": 60,  # Intervalle d'écriture du fichier de métriques
+    "metrics_port": 0,           # Port HTTP sur 127.0.0.1 (0: pas de serveur)
+    "status_file_enabled": True, # État pour les barres d'état ($XDG_RUNTIME_DIR/nightmod)
+    "idle_detection_enabled": True,  # Reporter la vérification si une saisie est récente
+    "idle_backend": "auto",      # Options: auto, xscreensaver, evdev, logind, interrupts
+    "idle_threshold_seconds": 120,  # Saisie considérée comme récente
+    "idle_max_postpone_minutes": 30,  # Report cumulé maximal d'une vérification
+    "activity_guard_enabled": True,  # Ne pas interrompre un téléchargement, une compilation...
+    "activity_busy_action": "defer",  # Options: defer (reporter), lock (verrouiller)
+    "activity_cpu_percent": 50,  # Seuil d'occupation du processeur (%)
+    "activity_disk_kbps": 5120,  # Seuil de débit des disques (Ko/s)
+    "activity_net_kbps": 512,    # Seuil de débit réseau (Ko/s)
+    "activity_defer_minutes": 5,  # Délai avant une nouvelle tentative
+    "activity_max_defer_minutes": 120,  # Report cumulé maximal de l'action
+    "playback_detection_enabled": True,  # Reporter la vérification pendant une lecture multimédia
+    "playback_postpone_minutes": 5,  # Report d'une vérification pendant une lecture
+    "playback_max_postpone_minutes": 180,  # Report cumulé maximal pendant une lecture
     # Nouvelles options pour les couleurs d'interface
     "ui_theme": "dark",          # Options: dark, light
     "button_bg_color": "#333333",  # Couleur de fond des boutons
@@ -33,7 +68,7 @@ class ConfigManager:
     def __init__(self):
         """Initialise le gestionnaire de configuration"""
         # Trouver le répertoire de configuration approprié selon le système
-        self.config_dir = os.path.join(os.path.expanduser("~"), ".nightmod")
+        self.config_dir = get_config_dir()
         self.config_file = os.path.join(self.config_dir, "config.json")
         
         # S'assurer que le répertoire existe
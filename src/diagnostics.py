@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fenêtre de diagnostic de NightMod
+
+Affiche la réactivité de la boucle Tk mesurée par LagProbe : histogramme des
+retards, percentiles, nombre de blocages et dernière pile relevée pendant un
+blocage. La fenêtre se rafraîchit chaque seconde tant qu'elle est ouverte.
+"""
+
+import time
+import tkinter as tk
+from tkinter import ttk
+
+# Largeur maximale des barres de l'histogramme (caractères)
+BAR_WIDTH = 30
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.0f} ms"
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Vue de diagnostic de la boucle d'événements"""
+
+    def __init__(self, parent, probe, clock):
+        super().__init__(parent)
+        self.probe = probe
+        self.clock = clock
+        self.job = None
+
+        self.title("NightMod - Diagnostics")
+        self.geometry("520x520")
+        self.minsize(420, 400)
+
+        self.create_widgets()
+        self.refresh()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+    def create_widgets(self):
+        frame = ttk.Frame(self, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frame, text="Réactivité de la boucle d'événements").pack(anchor=tk.W)
+
+        self.summary_var = tk.StringVar()
+        ttk.Label(frame, textvariable=self.summary_var, justify=tk.LEFT).pack(anchor=tk.W, pady=(5, 10))
+
+        self.histogram_text = tk.Text(frame, height=len(self.probe.histogram.counts), width=60,
+                                      font="TkFixedFont", relief=tk.FLAT)
+        self.histogram_text.pack(fill=tk.X)
+
+        ttk.Label(frame, text="Dernière pile relevée pendant un blocage").pack(anchor=tk.W, pady=(10, 5))
+        self.stack_text = tk.Text(frame, height=10, width=60, font="TkFixedFont", wrap=tk.NONE)
+        self.stack_text.pack(fill=tk.BOTH, expand=True)
+
+    def refresh(self):
+        """Met à jour l'affichage et programme le rafraîchissement suivant"""
+        self.job = None
+        summary = self.probe.summary()
+
+        last_stall = "aucun"
+        if summary["last_stall"]:
+            when, lag = summary["last_stall"]
+            last_stall = f"{time.strftime('%H:%M:%S', time.localtime(when))} ({lag * 1000:.0f} ms)"
+
+        self.summary_var.set(
+            f"Mesures: {summary['samples']} (toutes les {summary['interval']:g} s)\n"
+            f"Retard médian: {format_ms(summary['p50_ms'])}    p99: {format_ms(summary['p99_ms'])}    "
+            f"max: {format_ms(summary['max_ms'] if summary['samples'] else None)}\n"
+            f"Blocages: {summary['stalls']}    dernier: {last_stall}"
+        )
+
+        peak = max(summary["counts"]) or 1
+        lines = [
+            f"{label:>10}  {count:>6}  {'█' * round(BAR_WIDTH * count / peak)}"
+            for label, count in zip(summary["labels"], summary["counts"])
+        ]
+        self.set_text(self.histogram_text, "\n".join(lines))
+        self.set_text(self.stack_text, summary["last_stack"] or "Aucun blocage relevé")
+
+        self.job = self.clock.call_later(1.0, self.refresh)
+
+    @staticmethod
+    def set_text(widget, content):
+        widget.configure(state=tk.NORMAL)
+        widget.delete("1.0", tk.END)
+        widget.insert("1.0", content)
+        widget.configure(state=tk.DISABLED)
+
+    def close(self):
+        if self.job is not None:
+            self.clock.cancel(self.job)
+            self.job = None
+        self.destroy()
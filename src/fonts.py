@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Registre des polices partagées pour NightMod
+
+Les polices sont créées une seule fois sous forme de polices nommées Tk
+(tkinter.font.Font). La meilleure famille disponible sur la plateforme est
+résolue au démarrage, ce qui évite à Tk de refaire la résolution de secours
+à chaque widget. Modifier une police nommée (famille, taille, facteur DPI)
+met à jour tous les widgets qui l'utilisent.
+"""
+
+import platform
+import logging
+import tkinter.font as tkfont
+
+logger = logging.getLogger("NightMod.Fonts")
+
+# Familles préférées par plateforme, par ordre de priorité
+PREFERRED_FAMILIES = {
+    "Windows": ["Segoe UI", "Tahoma", "Arial"],
+    "Darwin": ["SF Pro Text", "Helvetica Neue", "Helvetica"],
+    "Linux": ["Cantarell", "Noto Sans", "Ubuntu", "DejaVu Sans", "Liberation Sans"],
+}
+
+# Rôles des polices : nom Tk, taille (points) et graisse
+FONT_ROLES = {
+    "status": ("NightModStatus", 14, "normal"),
+    "heading": ("NightModHeading", 12, "bold"),
+    "title": ("NightModTitle", 16, "bold"),
+    "countdown": ("NightModCountdown", 32, "bold"),
+    "button": ("NightModButton", 12, "bold"),
+    "unit": ("NightModUnit", 10, "normal"),
+    "info": ("NightModInfo", 9, "normal"),
+}
+
+
+def get_fonts(widget):
+    """Retourne le registre des polices de l'application de ce widget (ou None)"""
+    try:
+        return getattr(widget.nametowidget("."), "fonts", None)
+    except Exception:
+        return None
+
+
+def ensure_fonts(widget):
+    """Retourne le registre des polices de l'application, en le créant si nécessaire"""
+    fonts = get_fonts(widget)
+    if fonts is None:
+        root = widget.nametowidget(".")
+        fonts = root.fonts = FontRegistry(root)
+    return fonts
+
+
+def font_name(role):
+    """Retourne le nom Tk de la police nommée associée à un rôle"""
+    return FONT_ROLES[role][0]
+
+
+class FontRegistry:
+    """Crée et distribue les polices nommées partagées de l'application"""
+
+    def __init__(self, root, family=None):
+        """
+        Initialise le registre des polices
+
+        Args:
+            root: La fenêtre racine Tk
+            family: Famille imposée (sinon résolue selon la plateforme)
+        """
+        self.root = root
+        self.scale = 1.0
+        self.family = family or self.resolve_family()
+        self.fonts = {}
+
+        for role, (name, size, weight) in FONT_ROLES.items():
+            self.fonts[role] = tkfont.Font(
+                root=root,
+                name=name,
+                family=self.family,
+                size=size,
+                weight=weight,
+                exists=False
+            )
+
+        logger.info(f"Polices initialisées avec la famille '{self.family}'")
+
+    def resolve_family(self):
+        """Trouve la meilleure famille de police disponible sur la plateforme"""
+        available = {name.lower(): name for name in tkfont.families(self.root)}
+        candidates = PREFERRED_FAMILIES.get(platform.system(), PREFERRED_FAMILIES["Linux"])
+
+        for candidate in candidates:
+            if candidate.lower() in available:
+                return available[candidate.lower()]
+
+        # Aucune famille préférée : utiliser la police par défaut de Tk
+        return tkfont.nametofont("TkDefaultFont", root=self.root).actual("family")
+
+    def get(self, role):
+        """Retourne la police partagée associée à un rôle"""
+        return self.fonts[role]
+
+    def __getitem__(self, role):
+        return self.fonts[role]
+
+    def set_family(self, family):
+        """Change la famille de toutes les polices (une seule mise à jour par police)"""
+        self.family = family
+        for font in self.fonts.values():
+            font.configure(family=family)
+
+    def rescale(self, factor):
+        """Applique un facteur d'échelle (changement de DPI) à toutes les polices"""
+        self.scale = factor
+        for role, font in self.fonts.items():
+            base_size = FONT_ROLES[role][1]
+            font.configure(size=max(1, round(base_size * factor)))
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Historique des événements de NightMod (SQLite)
+
+Les événements de chaque nuit (vérification programmée, popup affiché, temps
+de réponse, absence de réponse, action exécutée et son résultat) sont
+enregistrés dans ~/.nightmod/history.db en mode WAL. Le thread Tk ne fait
+jamais d'accès disque : il dépose les événements dans une file, et un thread
+d'écriture les insère par lots dans une seule transaction. L'export CSV/JSONL
+parcourt la base par blocs et fonctionne en mémoire constante.
+"""
+
+import os
+import csv
+import json
+import time
+import queue
+import sqlite3
+import logging
+import threading
+
+from src.utils import get_config_dir
+
+logger = logging.getLogger("NightMod.History")
+
+# Types d'événements
+CHECK_SCHEDULED = "check_scheduled"
+POPUP_SHOWN = "popup_shown"
+RESPONSE = "response"
+TIMEOUT = "timeout"
+ACTION_EXECUTED = "action_executed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL,
+    action TEXT,
+    result TEXT,
+    duration REAL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_event_timestamp ON events (event, timestamp);
+"""
+
+EXPORT_COLUMNS = ("id", "timestamp", "event", "action", "result", "duration", "details")
+
+# Écriture par lots : taille maximale et délai d'attente des événements suivants
+BATCH_SIZE = 100
+BATCH_DELAY = 2.0
+
+
+def get_history_path():
+    """Retourne le chemin de la base d'historique"""
+    return os.path.join(get_config_dir(), "history.db")
+
+
+def connect(db_path):
+    """Ouvre la base d'historique (mode WAL) et crée le schéma si nécessaire"""
+    connection = sqlite3.connect(db_path, timeout=10)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class EventHistory:
+    """Enregistre les événements dans la base d'historique depuis un thread d'écriture"""
+
+    def __init__(self, db_path=None, batch_size=BATCH_SIZE, batch_delay=BATCH_DELAY, on_batch=None):
+        """
+        Initialise l'historique et démarre le thread d'écriture
+
+        Args:
+            db_path: Chemin de la base (défaut: ~/.nightmod/history.db)
+            batch_size: Nombre maximal d'événements par transaction
+            batch_delay: Délai (secondes) d'attente des événements suivants d'un lot
+            on_batch: Fonction appelée dans le thread d'écriture après chaque lot
+        """
+        self.db_path = db_path or get_history_path()
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.on_batch = on_batch
+        self.queue = queue.SimpleQueue()
+        self.closed = False
+
+        self.writer = threading.Thread(target=self._writer_loop, name="NightModHistory", daemon=True)
+        self.writer.start()
+
+    def record(self, event, action=None, result=None, duration=None, **details):
+        """Dépose un événement dans la file (aucun accès disque dans le thread appelant)
+
+        Args:
+            event: Type d'événement (CHECK_SCHEDULED, POPUP_SHOWN, ...)
+            action: Action système concernée
+            result: Résultat de l'action
+            duration: Durée associée en secondes (temps de réponse, durée de l'action)
+            **details: Informations supplémentaires enregistrées en JSON
+        """
+        if self.closed:
+            return
+        self.queue.put((
+            time.time(), event, action, result, duration,
+            json.dumps(details, ensure_ascii=False) if details else None
+        ))
+
+    def flush(self, timeout=None):
+        """Attend que les événements déjà déposés soient écrits"""
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Écrit les événements restants et arrête le thread d'écriture"""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.writer.join(timeout)
+
+    def _writer_loop(self):
+        """Boucle du thread d'écriture : regroupe les événements en transactions"""
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            connection = connect(self.db_path)
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Historique indisponible ({self.db_path}): {e}")
+            self.closed = True
+            self._drain_markers()
+            return
+
+        running = True
+        while running:
+            item = self.queue.get()
+            batch = []
+            markers = []
+
+            # Regrouper les événements arrivant dans le délai d'un lot
+            deadline = time.monotonic() + self.batch_delay
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+
+                if not running or markers or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO events (timestamp, event, action, result, duration, details) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            batch
+                        )
+                except sqlite3.Error as e:
+                    logger.error(f"Erreur lors de l'écriture de l'historique: {e}")
+
+                if self.on_batch:
+                    try:
+                        self.on_batch()
+                    except Exception as e:
+                        logger.error(f"Erreur après l'écriture de l'historique: {e}")
+
+            for marker in markers:
+                marker.set()
+
+        connection.close()
+        self._drain_markers()
+
+    def _drain_markers(self):
+        """Libère les appels à flush() en attente après l'arrêt de l'écriture"""
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+
+def iter_events(db_path=None, since=None, until=None, event=None, chunk_size=1000):
+    """Génère les événements de l'historique par blocs (mémoire constante)
+
+    Args:
+        db_path: Chemin de la base (défaut: ~/.nightmod/history.db)
+        since: Horodatage minimal (inclus)
+        until: Horodatage maximal (exclu)
+        event: Type d'événement à filtrer
+        chunk_size: Nombre de lignes lues à chaque fois
+    """
+    conditions = []
+    params = []
+    if since is not None:
+        conditions.append("timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("timestamp < ?")
+        params.append(until)
+    if event is not None:
+        conditions.append("event = ?")
+        params.append(event)
+
+    query = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM events"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY timestamp, id"
+
+    connection = sqlite3.connect(f"file:{db_path or get_history_path()}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        connection.close()
+
+
+def export_events(output, fmt="csv", **filters):
+    """Exporte l'historique en CSV ou JSONL dans un fichier texte ouvert
+
+    Returns:
+        Le nombre d'événements exportés
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(output)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in iter_events(**filters):
+            writer.writerow(row)
+            count += 1
+    elif fmt == "jsonl":
+        for row in iter_events(**filters):
+            record = dict(zip(EXPORT_COLUMNS, row))
+            if record["details"]:
+                record["details"] = json.loads(record["details"])
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Format d'export non reconnu: {fmt}")
+    return count
+
+
+def parse_date(value):
+    """Convertit une date AAAA-MM-JJ (ou un horodatage) en horodatage"""
+    from datetime import datetime
+
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%d").timestamp()
+
+
+def main(argv=None):
+    """Point d'entrée de l'export de l'historique"""
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="nightmod-history",
+        description="Exporte l'historique des événements de NightMod"
+    )
+    parser.add_argument("--db", default=None, help="Base d'historique (défaut: ~/.nightmod/history.db)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="csv", help="Format d'export")
+    parser.add_argument("--output", "-o", default=None, help="Fichier de sortie (défaut: sortie standard)")
+    parser.add_argument("--since", type=parse_date, default=None, help="Date de début (AAAA-MM-JJ)")
+    parser.add_argument("--until", type=parse_date, default=None, help="Date de fin exclue (AAAA-MM-JJ)")
+    parser.add_argument("--event", default=None, help="Type d'événement à exporter")
+    args = parser.parse_args(argv)
+
+    db_path = args.db or get_history_path()
+    if not os.path.exists(db_path):
+        parser.error(f"base d'historique introuvable: {db_path}")
+
+    filters = dict(db_path=db_path, since=args.since, until=args.until, event=args.event)
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            count = export_events(f, args.format, **filters)
+        print(f"{count} événements exportés dans {args.output}", file=sys.stderr)
+    else:
+        export_events(sys.stdout, args.format, **filters)
+    return 0
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Détection de l'inactivité de l'utilisateur
+
+Inutile d'afficher une vérification à quelqu'un qui est en train de taper :
+avant chaque popup, le planificateur demande depuis combien de temps
+l'utilisateur n'a rien saisi, et reporte la vérification si une saisie est
+récente. Plusieurs sources sont possibles, essayées dans cet ordre :
+
+- xscreensaver : extension X11 MIT-SCREEN-SAVER (libXss via ctypes), précise
+  à la milliseconde
+- evdev : lecture directe de /dev/input/event* (src/inputwatch.py), pour les
+  machines sans serveur X ; nécessite le droit de lecture (groupe input)
+- logind : propriétés IdleHint / IdleSinceHintMonotonic de la session,
+  renseignées par l'environnement de bureau
+- interrupts : repli sans dépendance, par différence des compteurs des
+  interruptions clavier/souris/HID de /proc/interrupts entre deux relevés ;
+  les contrôleurs USB sont ignorés (webcam, Bluetooth, disques et cartes
+  réseau USB les font aussi travailler), la source est donc indisponible
+  lorsque seuls eux sont présents
+
+La source est choisie une fois au démarrage et conservée. Un report est
+toujours borné : passé `max_postpone`, la vérification est affichée même si
+la source signale une activité (source trompée par un périphérique bavard,
+par exemple).
+"""
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import shutil
+import logging
+import subprocess
+
+from src.inputwatch import InputWatcher, INPUT_DIR
+
+logger = logging.getLogger("NightMod.IdleTime")
+
+# Saisie considérée comme récente (secondes)
+IDLE_THRESHOLD = 120.0
+
+# Report minimal et report cumulé maximal d'une vérification (secondes)
+MIN_POSTPONE = 30.0
+MAX_POSTPONE = 30 * 60.0
+
+# Interruptions propres aux périphériques de saisie (contrôleur clavier/souris, HID)
+INPUT_IRQ_PATTERNS = ("i8042", "keyboard", "mouse", "touchpad", "hid")
+
+
+class IdleBackend:
+    """Source de la durée d'inactivité"""
+
+    name = None
+
+    def available(self):
+        """Indique si la source fonctionne sur cette machine (appelé une seule fois)"""
+        return False
+
+    def idle_seconds(self):
+        """Secondes écoulées depuis la dernière saisie (None si inconnu)"""
+        return None
+
+    def close(self):
+        pass
+
+
+class XScreenSaverInfo(ctypes.Structure):
+    _fields_ = [
+        ("window", ctypes.c_ulong),
+        ("state", ctypes.c_int),
+        ("kind", ctypes.c_int),
+        ("til_or_since", ctypes.c_ulong),
+        ("idle", ctypes.c_ulong),
+        ("eventMask", ctypes.c_ulong),
+    ]
+
+
+class XScreenSaverBackend(IdleBackend):
+    """Durée d'inactivité donnée par le serveur X (extension MIT-SCREEN-SAVER)"""
+
+    name = "xscreensaver"
+
+    def __init__(self):
+        self.xlib = None
+        self.xss = None
+        self.display = None
+        self.info = None
+
+    def available(self):
+        if not os.environ.get("DISPLAY"):
+            return False
+        x11_path = ctypes.util.find_library("X11")
+        xss_path = ctypes.util.find_library("Xss")
+        if not x11_path or not xss_path:
+            return False
+
+        self.xlib = ctypes.CDLL(x11_path)
+        self.xss = ctypes.CDLL(xss_path)
+        self.xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self.xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self.xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self.xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        self.xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self.xlib.XFree.argtypes = [ctypes.c_void_p]
+        self.xss.XScreenSaverQueryExtension.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)
+        ]
+        self.xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(XScreenSaverInfo)
+        self.xss.XScreenSaverQueryInfo.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XScreenSaverInfo)
+        ]
+
+        # Connexion dédiée, distincte de celle de Tk
+        self.display = self.xlib.XOpenDisplay(None)
+        if not self.display:
+            return False
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        if not self.xss.XScreenSaverQueryExtension(self.display, ctypes.byref(event_base),
+                                                   ctypes.byref(error_base)):
+            self.close()
+            return False
+        self.info = self.xss.XScreenSaverAllocInfo()
+        return bool(self.info)
+
+    def idle_seconds(self):
+        root = self.xlib.XDefaultRootWindow(self.display)
+        if not self.xss.XScreenSaverQueryInfo(self.display, root, self.info):
+            return None
+        return self.info.contents.idle / 1000.0
+
+    def close(self):
+        if self.info:
+            self.xlib.XFree(self.info)
+            self.info = None
+        if self.display:
+            self.xlib.XCloseDisplay(self.display)
+            self.display = None
+
+
+class EvdevBackend(IdleBackend):
+    """Dernière saisie lue sur les périphériques evdev par un thread epoll"""
+
+    name = "evdev"
+
+    def __init__(self, directory=INPUT_DIR):
+        self.watcher = InputWatcher(directory)
+
+    def available(self):
+        return sys.platform.startswith("linux") and self.watcher.start()
+
+    def idle_seconds(self):
+        return self.watcher.idle_seconds()
+
+    def close(self):
+        self.watcher.stop()
+
+
+class LogindBackend(IdleBackend):
+    """Indication d'inactivité de la session logind (loginctl)"""
+
+    name = "logind"
+
+    def __init__(self, session=None):
+        self.session = session or os.environ.get("XDG_SESSION_ID")
+        self.loginctl = shutil.which("loginctl")
+
+    @staticmethod
+    def parse_properties(output):
+        """Analyse la sortie `clé=valeur` de loginctl show-session"""
+        properties = {}
+        for line in output.splitlines():
+            key, sep, value = line.partition("=")
+            if sep:
+                properties[key.strip()] = value.strip()
+        return properties
+
+    def query(self):
+        try:
+            result = subprocess.run(
+                [self.loginctl, "show-session", self.session,
+                 "-p", "IdleHint", "-p", "IdleSinceHintMonotonic"],
+                capture_output=True, text=True, timeout=2, check=True
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return self.parse_properties(result.stdout)
+
+    def available(self):
+        if not self.loginctl or not self.session:
+            return False
+        properties = self.query()
+        return bool(properties) and "IdleHint" in properties
+
+    @staticmethod
+    def idle_from_properties(properties, now):
+        if not properties or "IdleHint" not in properties:
+            return None
+        if properties["IdleHint"] != "yes":
+            return 0.0
+        since = int(properties.get("IdleSinceHintMonotonic") or 0)
+        if not since:
+            return None
+        # Horodatage en microsecondes sur CLOCK_MONOTONIC, comme time.monotonic
+        return max(0.0, now - since / 1e6)
+
+    def idle_seconds(self):
+        return self.idle_from_properties(self.query(), time.monotonic())
+
+
+class InterruptsBackend(IdleBackend):
+    """Repli : activité déduite des compteurs d'interruptions des périphériques de saisie
+
+    Les compteurs ne disent pas quand la dernière saisie a eu lieu, seulement
+    s'il y en a eu une depuis le relevé précédent. La durée retournée est donc
+    une borne inférieure : 0 si les compteurs ont changé depuis le dernier
+    relevé, sinon le temps écoulé depuis le relevé où ils ont changé.
+    """
+
+    name = "interrupts"
+
+    def __init__(self, path="/proc/interrupts", clock=time.monotonic):
+        self.path = path
+        self.clock = clock
+        self.last_total = None
+        self.changed_at = None
+
+    def read_total(self):
+        """Somme des interruptions des périphériques de saisie (None si illisible)"""
+        try:
+            with open(self.path) as f:
+                header = f.readline()
+                cpus = len(header.split())
+                total = 0
+                matched = False
+                for line in f:
+                    fields = line.split()
+                    if not fields:
+                        continue
+                    counts = fields[1:1 + cpus]
+                    name = " ".join(fields[1 + cpus:]).lower()
+                    if not any(pattern in name for pattern in INPUT_IRQ_PATTERNS):
+                        continue
+                    matched = True
+                    total += sum(int(count) for count in counts if count.isdigit())
+        except OSError:
+            return None
+        return total if matched else None
+
+    def available(self):
+        self.last_total = self.read_total()
+        self.changed_at = self.clock()
+        return self.last_total is not None
+
+    def idle_seconds(self):
+        total = self.read_total()
+        now = self.clock()
+        if total is None:
+            return None
+        if total != self.last_total:
+            self.last_total = total
+            self.changed_at = now
+            return 0.0
+        return now - self.changed_at
+
+
+BACKENDS = {
+    XScreenSaverBackend.name: XScreenSaverBackend,
+    EvdevBackend.name: EvdevBackend,
+    LogindBackend.name: LogindBackend,
+    InterruptsBackend.name: InterruptsBackend,
+}
+
+
+def select_backend(name="auto"):
+    """Choisit la source d'inactivité (à appeler une fois au démarrage)
+
+    Args:
+        name: "auto" (première source disponible) ou le nom d'une source
+
+    Returns:
+        La source retenue, ou None si aucune n'est disponible
+    """
+    if name == "auto":
+        candidates = list(BACKENDS)
+    elif name in BACKENDS:
+        candidates = [name]
+    else:
+        logger.error(f"Source d'inactivité inconnue: {name}")
+        return None
+
+    for candidate in candidates:
+        backend = BACKENDS[candidate]()
+        try:
+            if backend.available():
+                logger.info(f"Détection de l'inactivité: {candidate}")
+                return backend
+        except Exception as e:
+            logger.debug(f"Source d'inactivité {candidate} indisponible: {e}")
+        backend.close()
+
+    logger.info("Aucune source d'inactivité disponible, les vérifications ne sont jamais reportées")
+    return None
+
+
+class IdleGate:
+    """Fonction de report du planificateur : repousse une vérification si une saisie est récente"""
+
+    def __init__(self, backend, threshold=IDLE_THRESHOLD, max_postpone=MAX_POSTPONE):
+        self.backend = backend
+        self.threshold = threshold
+        self.max_postpone = max_postpone
+
+    def __call__(self, postponed_for):
+        """Retourne le report (secondes) à appliquer, 0 pour afficher la vérification
+
+        Args:
+            postponed_for: Report déjà accordé à cette vérification (secondes)
+        """
+        if postponed_for >= self.max_postpone:
+            return 0
+        try:
+            idle = self.backend.idle_seconds()
+        except Exception as e:
+            logger.error(f"Erreur de la détection de l'inactivité: {e}")
+            return 0
+        if idle is None or idle >= self.threshold:
+            return 0
+
+        delay = max(MIN_POSTPONE, self.threshold - idle)
+        delay = min(delay, self.max_postpone - postponed_for)
+        logger.info(f"Saisie il y a {idle:.0f} s, vérification reportée de {delay:.0f} s")
+        return delay
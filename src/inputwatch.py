@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Surveillance des périphériques de saisie Linux (evdev)
+
+Pour les machines sans serveur X (bornes, salles de TP), l'activité est lue
+directement sur les périphériques /dev/input/event* dans un seul thread :
+tous les descripteurs sont enregistrés dans un sélecteur (epoll), et le
+thread dort sans délai tant qu'aucune saisie n'arrive. Les événements sont
+lus puis jetés : seul l'instant de la dernière activité est conservé.
+
+Seuls les claviers et les dispositifs de pointage sont retenus, d'après
+leurs capacités (ioctl EVIOCGBIT) : un accéléromètre, un interrupteur de
+capot, un bouton d'alimentation ou une manette qui émettent des événements
+ne doivent pas faire passer l'utilisateur pour actif.
+
+Les branchements et débranchements sont suivis par inotify sur /dev/input
+(appelé via ctypes). Un périphérique créé sans droit de lecture est retenté
+lorsque ses attributs changent (règles udev appliquées après la création).
+"""
+
+import os
+import time
+import ctypes
+import ctypes.util
+import struct
+import fnmatch
+import logging
+import selectors
+import threading
+
+logger = logging.getLogger("NightMod.InputWatch")
+
+# Répertoire et motif des périphériques evdev
+INPUT_DIR = "/dev/input"
+DEVICE_PATTERN = "event*"
+
+# Taille de lecture : plusieurs struct input_event (24 octets en 64 bits)
+READ_SIZE = 24 * 64
+
+# Masques inotify (linux/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+# Types et codes d'événements (linux/input-event-codes.h)
+EV_KEY = 0x01
+EV_REL = 0x02
+EV_ABS = 0x03
+KEY_MAX = 0x2ff
+REL_X, REL_Y = 0x00, 0x01
+ABS_X, ABS_Y = 0x00, 0x01
+# Touches présentes sur tout clavier (Q, A, Z, espace) ; un bouton
+# d'alimentation ou de volume n'en a aucune
+KEYBOARD_KEYS = (16, 30, 44, 57)
+# BTN_LEFT, BTN_TOOL_FINGER, BTN_TOUCH : souris, pavé tactile, écran tactile
+POINTER_BUTTONS = (0x110, 0x145, 0x14a)
+
+# Taille des masques de bits lus par EVIOCGBIT (octets), par type d'événement
+CAPABILITY_SIZES = ((0, 4), (EV_KEY, KEY_MAX // 8 + 1), (EV_REL, 2), (EV_ABS, 8))
+
+
+def open_inotify(directory):
+    """Ouvre un descripteur inotify sur un répertoire (None si indisponible)"""
+    libc_path = ctypes.util.find_library("c")
+    if not libc_path:
+        return None
+    libc = ctypes.CDLL(libc_path, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CREATE | IN_DELETE | IN_ATTRIB) < 0:
+        logger.debug(f"inotify indisponible sur {directory}: {os.strerror(ctypes.get_errno())}")
+        os.close(fd)
+        return None
+    return fd
+
+
+def parse_inotify_events(data):
+    """Décode les événements inotify : liste de (masque, nom)"""
+    events = []
+    offset = 0
+    while offset + INOTIFY_EVENT.size <= len(data):
+        _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+        offset += INOTIFY_EVENT.size
+        name = data[offset:offset + length].rstrip(b"\0")
+        offset += length
+        events.append((mask, os.fsdecode(name)))
+    return events
+
+
+def eviocgbit(event_type, length):
+    """Numéro de la requête ioctl EVIOCGBIT(event_type, length) (linux/input.h)"""
+    return (2 << 30) | (length << 16) | (ord("E") << 8) | (0x20 + event_type)
+
+
+def read_capabilities(fd):
+    """Masques des types d'événements (clé 0) et des codes EV_KEY, EV_REL, EV_ABS"""
+    import fcntl
+
+    capabilities = {}
+    for event_type, length in CAPABILITY_SIZES:
+        buffer = bytearray(length)
+        fcntl.ioctl(fd, eviocgbit(event_type, length), buffer)
+        capabilities[event_type] = int.from_bytes(buffer, "little")
+    return capabilities
+
+
+def has_bits(mask, *codes):
+    return all(mask >> code & 1 for code in codes)
+
+
+def is_user_input(capabilities):
+    """Indique si les capacités sont celles d'un clavier ou d'un dispositif de pointage"""
+    types = capabilities.get(0, 0)
+    keys = capabilities.get(EV_KEY, 0) if has_bits(types, EV_KEY) else 0
+    if has_bits(keys, *KEYBOARD_KEYS):
+        return True
+    # Sans bouton ni contact, des axes sont ceux d'un capteur ou d'une manette
+    if not any(has_bits(keys, button) for button in POINTER_BUTTONS):
+        return False
+    if has_bits(types, EV_REL) and has_bits(capabilities.get(EV_REL, 0), REL_X, REL_Y):
+        return True
+    return has_bits(types, EV_ABS) and has_bits(capabilities.get(EV_ABS, 0), ABS_X, ABS_Y)
+
+
+def is_user_input_device(fd):
+    """Filtre par défaut des périphériques : claviers et dispositifs de pointage"""
+    try:
+        return is_user_input(read_capabilities(fd))
+    except OSError:
+        return False
+
+
+class InputWatcher:
+    """Conserve l'instant de la dernière saisie sur les périphériques evdev"""
+
+    def __init__(self, directory=INPUT_DIR, pattern=DEVICE_PATTERN, clock=time.monotonic,
+                 accept=is_user_input_device):
+        """
+        Args:
+            directory: Répertoire des périphériques (remplaçable pour les tests)
+            pattern: Motif des noms de périphériques
+            clock: Horloge monotone de l'instant de la dernière activité
+            accept: Fonction qui reçoit le descripteur ouvert et indique si le
+                périphérique est retenu
+        """
+        self.directory = directory
+        self.pattern = pattern
+        self.clock = clock
+        self.accept = accept
+        self.last_activity = None
+        self.devices = {}
+        self.ignored = set()
+        self.selector = None
+        self.inotify_fd = None
+        self.wake_fds = None
+        self.thread = None
+
+    def start(self):
+        """Ouvre les périphériques et démarre le thread de lecture
+
+        Returns:
+            True si au moins un périphérique est lisible
+        """
+        self.selector = selectors.DefaultSelector()
+        self.wake_fds = os.pipe()
+        self.selector.register(self.wake_fds[0], selectors.EVENT_READ, None)
+
+        self.inotify_fd = open_inotify(self.directory)
+        if self.inotify_fd is not None:
+            self.selector.register(self.inotify_fd, selectors.EVENT_READ, self.directory)
+
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError:
+            names = []
+        for name in names:
+            self.open_device(name)
+
+        if not self.devices:
+            self.close()
+            return False
+
+        # L'instant de démarrage tient lieu de dernière activité connue
+        self.last_activity = self.clock()
+        self.thread = threading.Thread(target=self._run, name="NightModInput", daemon=True)
+        self.thread.start()
+        logger.info(f"{len(self.devices)} périphérique(s) de saisie surveillé(s)")
+        return True
+
+    def stop(self):
+        """Arrête le thread et ferme les périphériques"""
+        if self.thread is not None:
+            os.write(self.wake_fds[1], b"\0")
+            self.thread.join()
+            self.thread = None
+        self.close()
+
+    def close(self):
+        for name in list(self.devices):
+            self.close_device(name)
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+        if self.wake_fds is not None:
+            for fd in self.wake_fds:
+                os.close(fd)
+            self.wake_fds = None
+        if self.selector is not None:
+            self.selector.close()
+            self.selector = None
+
+    def idle_seconds(self):
+        """Secondes écoulées depuis la dernière saisie (None si la surveillance n'a pas démarré)"""
+        last = self.last_activity
+        if last is None:
+            return None
+        return max(0.0, self.clock() - last)
+
+    def open_device(self, name):
+        if name in self.devices or name in self.ignored or not fnmatch.fnmatch(name, self.pattern):
+            return
+        path = os.path.join(self.directory, name)
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+        except OSError as e:
+            # Droits pas encore appliqués par udev : nouvel essai sur IN_ATTRIB
+            logger.debug(f"Périphérique {path} illisible: {e}")
+            return
+        if not self.accept(fd):
+            # Interrupteur, capteur, manette... : ignoré jusqu'à son débranchement
+            os.close(fd)
+            self.ignored.add(name)
+            logger.debug(f"Périphérique {path} ignoré (ni clavier ni pointage)")
+            return
+        self.devices[name] = fd
+        self.selector.register(fd, selectors.EVENT_READ, name)
+        logger.debug(f"Périphérique de saisie ajouté: {path}")
+
+    def close_device(self, name):
+        fd = self.devices.pop(name, None)
+        if fd is None:
+            return
+        try:
+            self.selector.unregister(fd)
+        except (KeyError, ValueError):
+            pass
+        os.close(fd)
+        logger.debug(f"Périphérique de saisie retiré: {name}")
+
+    def drain(self, name, fd):
+        """Lit et jette les événements disponibles ; retourne False si le périphérique a disparu"""
+        received = False
+        present = True
+        while True:
+            try:
+                data = os.read(fd, READ_SIZE)
+            except BlockingIOError:
+                break
+            except InterruptedError:
+                continue
+            except OSError:
+                # ENODEV : périphérique débranché
+                present = False
+                break
+            if not data:
+                present = False
+                break
+            received = True
+        if received:
+            self.last_activity = self.clock()
+        return present
+
+    def handle_inotify(self):
+        try:
+            data = os.read(self.inotify_fd, 4096)
+        except BlockingIOError:
+            return
+        for mask, name in parse_inotify_events(data):
+            if mask & IN_DELETE:
+                self.ignored.discard(name)
+                self.close_device(name)
+            elif mask & (IN_CREATE | IN_ATTRIB):
+                self.open_device(name)
+
+    def _run(self):
+        wake_fd = self.wake_fds[0]
+        while True:
+            # Aucun délai : le thread ne se réveille qu'à une saisie ou un branchement
+            for key, _ in self.selector.select():
+                if key.fd == wake_fd:
+                    return
+                if key.fd == self.inotify_fd:
+                    self.handle_inotify()
+                elif not self.drain(key.data, key.fd):
+                    self.close_device(key.data)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Surveillance de la réactivité de la boucle Tk
+
+Tout NightMod s'exécute dans la boucle Tk : le compte à rebours du popup,
+le déclenchement de l'action, mais aussi des appels bloquants (boîtes de
+dialogue, son joué par `aplay`, commandes de SystemActions). Une sonde
+programme un rappel périodique et mesure son retard ; les retards sont
+comptés dans un histogramme à seuils fixes.
+
+Un thread de garde dort jusqu'à l'instant où le rappel en attente serait en
+retard au-delà du seuil : si la boucle est encore bloquée, il relève la pile
+du thread principal et la journalise, pendant le blocage. La sonde est rapide
+lorsqu'une fenêtre est visible et lente sinon, pour ne pas réveiller la
+machine la nuit.
+"""
+
+import sys
+import time
+import logging
+import threading
+import traceback
+
+logger = logging.getLogger("NightMod.LagMonitor")
+
+# Limites supérieures des classes de l'histogramme (millisecondes)
+LAG_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Intervalles de la sonde (secondes) : fenêtre visible / application masquée
+FAST_INTERVAL = 1.0
+SLOW_INTERVAL = 30.0
+
+# Retard à partir duquel la boucle est considérée comme bloquée (secondes)
+STALL_THRESHOLD = 0.25
+
+
+class LagHistogram:
+    """Histogramme des retards à classes fixes"""
+
+    def __init__(self, buckets_ms=LAG_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.total = 0
+        self.max_ms = 0.0
+
+    def add(self, lag_ms):
+        index = 0
+        while index < len(self.buckets_ms) and lag_ms > self.buckets_ms[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def labels(self):
+        """Libellés des classes (« ≤ 5 ms », ..., « > 5000 ms »)"""
+        return [f"≤ {limit} ms" for limit in self.buckets_ms] + [f"> {self.buckets_ms[-1]} ms"]
+
+    def percentile(self, p):
+        """Borne supérieure de la classe contenant le percentile p (None sans mesure)"""
+        if not self.total:
+            return None
+        rank = p * self.total
+        seen = 0
+        for limit, count in zip(self.buckets_ms + (None,), self.counts):
+            seen += count
+            if seen >= rank:
+                return limit if limit is not None else self.max_ms
+        return self.max_ms
+
+
+class LagProbe:
+    """Mesure le retard des rappels de la boucle Tk et détecte les blocages"""
+
+    def __init__(self, clock, fast_interval=FAST_INTERVAL, slow_interval=SLOW_INTERVAL,
+                 threshold=STALL_THRESHOLD, watchdog=True):
+        """
+        Args:
+            clock: Horloge de l'application (TkClock : même base que time.monotonic)
+            fast_interval: Intervalle de la sonde lorsqu'une fenêtre est visible
+            slow_interval: Intervalle de la sonde lorsque l'application est masquée
+            threshold: Retard (secondes) au-delà duquel un blocage est signalé
+            watchdog: Relever la pile du thread principal pendant un blocage
+        """
+        self.clock = clock
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.threshold = threshold
+        self.histogram = LagHistogram()
+        self.stalls = 0
+        self.last_stall = None
+        self.last_stack = None
+
+        self.fast = False
+        self.job = None
+        self.expected = None
+        self.generation = 0
+        self.sampled_generation = None
+        self.watching_until = None
+        self.main_thread_id = threading.get_ident()
+
+        self.condition = threading.Condition()
+        self.running = False
+        self.watchdog = watchdog
+        self.watcher = None
+
+    def start(self):
+        """Démarre la sonde (et le thread de garde)"""
+        if self.running:
+            return
+        self.running = True
+        self.main_thread_id = threading.get_ident()
+        if self.watchdog:
+            self.watcher = threading.Thread(target=self._watch, name="NightModLagWatch", daemon=True)
+            self.watcher.start()
+        self._arm()
+
+    def stop(self):
+        """Arrête la sonde"""
+        with self.condition:
+            self.running = False
+            self.expected = None
+            self.condition.notify()
+        if self.watcher is not None:
+            # Attendre le thread de garde : l'interpréteur Tcl référencé par
+            # l'horloge ne doit pas être libéré depuis un autre thread
+            self.watcher.join()
+            self.watcher = None
+        if self.job is not None:
+            self.clock.cancel(self.job)
+            self.job = None
+
+    def set_fast(self, fast):
+        """Choisit l'intervalle rapide (fenêtre visible) ou lent (application masquée)"""
+        fast = bool(fast)
+        if fast == self.fast:
+            return
+        self.fast = fast
+        if self.running and self.job is not None:
+            self.clock.cancel(self.job)
+            self._arm()
+
+    def interval(self):
+        return self.fast_interval if self.fast else self.slow_interval
+
+    def _arm(self):
+        interval = self.interval()
+        with self.condition:
+            self.expected = self.clock.now() + interval
+            self.generation += 1
+            # Le thread de garde n'est réveillé que si la nouvelle échéance est
+            # plus proche que celle qu'il attend (sinon il la verra à son réveil)
+            if self.watching_until is None or self.expected + self.threshold < self.watching_until:
+                self.condition.notify()
+        self.job = self.clock.call_later(interval, self._probe)
+
+    def _probe(self):
+        self.job = None
+        lag = max(0.0, self.clock.now() - self.expected)
+        self.histogram.add(lag * 1000)
+        if lag > self.threshold:
+            self.stalls += 1
+            self.last_stall = (time.time(), lag)
+            logger.warning(f"Boucle Tk bloquée pendant {lag * 1000:.0f} ms")
+        if self.running:
+            self._arm()
+
+    def _watch(self):
+        """Thread de garde : relève la pile du thread principal pendant un blocage"""
+        with self.condition:
+            while self.running:
+                if self.expected is None or self.sampled_generation == self.generation:
+                    # Sonde arrêtée ou blocage déjà relevé : attendre le prochain réarmement
+                    self.watching_until = None
+                    self.condition.wait()
+                    continue
+
+                self.watching_until = self.expected + self.threshold
+                remaining = self.watching_until - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+
+                self.sampled_generation = self.generation
+                late = time.monotonic() - self.expected
+                stack = self.sample_main_stack()
+                self.last_stack = stack
+                logger.warning(
+                    f"Boucle Tk bloquée depuis {late * 1000:.0f} ms, pile du thread principal:\n{stack}"
+                )
+
+    def sample_main_stack(self):
+        """Retourne la pile courante du thread principal"""
+        frame = sys._current_frames().get(self.main_thread_id)
+        if frame is None:
+            return "(pile indisponible)"
+        return "".join(traceback.format_stack(frame)).rstrip()
+
+    def summary(self):
+        """Instantané pour la vue de diagnostic"""
+        return {
+            "samples": self.histogram.total,
+            "labels": self.histogram.labels(),
+            "counts": list(self.histogram.counts),
+            "p50_ms": self.histogram.percentile(0.5),
+            "p99_ms": self.histogram.percentile(0.99),
+            "max_ms": self.histogram.max_ms,
+            "stalls": self.stalls,
+            "last_stall": self.last_stall,
+            "last_stack": self.last_stack,
+            "interval": self.interval(),
+        }
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Journalisation asynchrone de NightMod
+
+Les threads de l'application (Tk, pystray, surveillance) se contentent de
+déposer les enregistrements dans une file (QueueHandler). Un seul thread
+d'écoute (QueueListener) les formate et les écrit dans
+~/.nightmod/logs/nightmod.log. Le fichier tourne par taille et chaque jour,
+les anciens fichiers sont compressés en gzip dans un thread séparé, et un
+limiteur de débit par point d'appel empêche une erreur répétitive de remplir
+le disque.
+"""
+
+import os
+import sys
+import gzip
+import time
+import queue
+import shutil
+import atexit
+import logging
+import threading
+import logging.handlers
+
+from src.utils import get_config_dir
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FILENAME = "nightmod.log"
+
+# Rotation : taille maximale d'un fichier et nombre d'archives conservées
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 7
+
+# Limiteur de débit : rafale autorisée puis un message par intervalle et par point d'appel
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_INTERVAL = 60.0
+
+_listener = None
+_queue_handler = None
+
+
+def get_log_dir():
+    """Retourne le répertoire des fichiers de log"""
+    return os.path.join(get_config_dir(), "logs")
+
+
+def get_log_path():
+    """Retourne le chemin du fichier de log courant"""
+    return os.path.join(get_log_dir(), LOG_FILENAME)
+
+
+class RateLimitFilter(logging.Filter):
+    """Limite le débit des messages émis depuis un même point d'appel
+
+    Chaque point d'appel (logger, fichier, ligne) dispose d'un seau de jetons :
+    RATE_LIMIT_BURST messages passent d'un coup, puis un seul par intervalle.
+    Le nombre de messages supprimés est ajouté au message suivant qui passe.
+    """
+
+    def __init__(self, burst=RATE_LIMIT_BURST, interval=RATE_LIMIT_INTERVAL, clock=time.monotonic):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.clock = clock
+        self.lock = threading.Lock()
+        # Point d'appel -> [jetons, dernier remplissage, messages supprimés]
+        self.buckets = {}
+
+    def filter(self, record):
+        key = (record.name, record.pathname, record.lineno)
+        now = self.clock()
+
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [float(self.burst), now, 0]
+            else:
+                tokens = bucket[0] + (now - bucket[1]) / self.interval
+                bucket[0] = min(float(self.burst), tokens)
+                bucket[1] = now
+
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                return False
+
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} messages similaires supprimés)"
+        return True
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Fichier de log qui tourne par taille et chaque jour, archives compressées en arrière-plan"""
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding='utf-8', delay=True)
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self.compress_in_background
+        self.compress_thread = None
+        self.rollover_at = self.compute_rollover(time.time())
+
+    @staticmethod
+    def compute_rollover(now):
+        """Retourne l'instant du prochain minuit (heure locale)"""
+        tm = time.localtime(now)
+        midnight = time.mktime((tm.tm_year, tm.tm_mon, tm.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+        return midnight
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at:
+            # Pas de rotation d'un fichier vide (application inactive toute la journée)
+            if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+                return True
+            self.rollover_at = self.compute_rollover(time.time())
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        # Les archives sont renommées pendant la rotation : attendre la compression précédente
+        self.wait_for_compression()
+        super().doRollover()
+        self.rollover_at = self.compute_rollover(time.time())
+
+    def compress_in_background(self, source, dest):
+        """Déplace le fichier courant puis le compresse dans un thread séparé"""
+        pending = f"{dest}.pending"
+        os.replace(source, pending)
+        self.compress_thread = threading.Thread(
+            target=self.compress, args=(pending, dest), name="NightModLogCompress", daemon=True
+        )
+        self.compress_thread.start()
+
+    @staticmethod
+    def compress(source, dest):
+        """Compresse une archive en gzip (écriture atomique)"""
+        try:
+            tmp_dest = f"{dest}.tmp"
+            with open(source, 'rb') as f_in, gzip.open(tmp_dest, 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            os.replace(tmp_dest, dest)
+            os.remove(source)
+        except OSError as e:
+            sys.stderr.write(f"NightMod: compression du log impossible: {e}\n")
+
+    def wait_for_compression(self):
+        """Attend la fin de la compression en cours"""
+        if self.compress_thread is not None:
+            self.compress_thread.join()
+            self.compress_thread = None
+
+    def close(self):
+        self.wait_for_compression()
+        super().close()
+
+
+def setup_logging(level=logging.INFO, console=True):
+    """Installe la journalisation asynchrone (sans effet si elle est déjà installée)
+
+    Args:
+        level: Niveau minimal des messages
+        console: Copier aussi les messages sur la sortie d'erreur
+
+    Returns:
+        Le chemin du fichier de log
+    """
+    global _listener, _queue_handler
+
+    log_path = get_log_path()
+    if _listener is not None:
+        return log_path
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+
+    try:
+        os.makedirs(get_log_dir(), exist_ok=True)
+        file_handler = CompressingRotatingFileHandler(log_path)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    except OSError as e:
+        sys.stderr.write(f"NightMod: fichier de log indisponible ({e})\n")
+
+    # Pas de console avec pythonw / exécutable fenêtré
+    if console and sys.stderr is not None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        handlers.append(stream_handler)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _queue_handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    return log_path
+
+
+def shutdown_logging():
+    """Vide la file, arrête le thread d'écoute et ferme les fichiers"""
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+
+    _listener = None
+    _queue_handler = None
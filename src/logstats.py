@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Analyse en flux des fichiers nightmod.log
+
+Les fichiers sont lus ligne par ligne (mmap pour les fichiers texte, gzip pour
+les archives de rotation) à travers une chaîne de générateurs : la mémoire
+utilisée ne dépend pas de la taille des logs. Chaque fichier produit un
+résumé indépendant, ce qui permet de répartir l'analyse de nombreux fichiers
+sur un pool de processus puis de fusionner les résultats.
+"""
+
+import os
+import re
+import gzip
+import json
+import mmap
+import glob
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Séparateur du format '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+FIELD_SEPARATOR = b" - "
+
+# Événements reconnus : logger -> [(début du message, nom de l'événement)]
+EVENT_PATTERNS = {
+    "NightMod.App": [
+        ("Surveillance démarrée", "monitoring_started"),
+        ("Surveillance arrêtée", "monitoring_stopped"),
+        ("L'utilisateur a répondu au popup", "popup_answered"),
+        ("Aucune réponse de l'utilisateur", "no_response"),
+        ("Erreur lors de l'exécution de l'action", "action_error:perform_action"),
+    ],
+    "NightMod.SystemActions": [
+        ("Extinction de l'ordinateur", "action:shutdown"),
+        ("Mise en veille de l'ordinateur", "action:sleep"),
+        ("Verrouillage de l'écran", "action:lock"),
+        ("Erreur lors de l'extinction", "action_error:shutdown"),
+        ("Erreur lors de la mise en veille", "action_error:sleep"),
+        ("Erreur lors du verrouillage", "action_error:lock"),
+        ("Action non reconnue", "action_error:perform_action"),
+    ],
+}
+
+# Les lignes ne sont jamais décodées : motifs précompilés en UTF-8
+BYTE_PATTERNS = {
+    name.encode(): [(prefix.encode('utf-8'), event) for prefix, event in patterns]
+    for name, patterns in EVENT_PATTERNS.items()
+}
+
+# Messages regroupés par le limiteur de débit de src/logs.py
+SUPPRESSED_PATTERN = re.compile(r"\((\d+) messages similaires supprimés\)\s*$".encode('utf-8'))
+
+# Colonnes du tableau par fichier
+TABLE_COLUMNS = [
+    ("monitoring_started", "Démarrages"),
+    ("popup_answered", "Réponses"),
+    ("no_response", "Sans réponse"),
+    ("action:shutdown", "Extinctions"),
+    ("action:sleep", "Veilles"),
+    ("action:lock", "Verrous"),
+    ("errors", "Erreurs"),
+]
+
+
+def iter_lines(path):
+    """Génère les lignes (bytes) d'un fichier de log, compressé ou non"""
+    if path.endswith(".gz"):
+        with gzip.open(path, 'rb') as f:
+            yield from f
+        return
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b"")
+
+
+def parse_records(lines):
+    """Découpe les lignes en (horodatage, logger, niveau, message)
+
+    Les lignes de continuation (traces d'exceptions) sont ignorées.
+    """
+    for line in lines:
+        fields = line.rstrip(b"\r\n").split(FIELD_SEPARATOR, 3)
+        if len(fields) == 4 and fields[1].startswith(b"NightMod"):
+            yield fields
+
+
+def extract_events(records):
+    """Génère (horodatage, événement, occurrences) pour les messages reconnus"""
+    for timestamp, name, _level, message in records:
+        patterns = BYTE_PATTERNS.get(name)
+        if not patterns:
+            continue
+
+        for prefix, event in patterns:
+            if message.startswith(prefix):
+                match = SUPPRESSED_PATTERN.search(message)
+                count = 1 + int(match.group(1)) if match else 1
+                yield timestamp, event, count
+                break
+
+
+def scan_file(path):
+    """Analyse un fichier et retourne son résumé (sérialisable pour le pool de processus)"""
+    counts = Counter()
+    first = last = None
+
+    for timestamp, event, count in extract_events(parse_records(iter_lines(path))):
+        counts[event] += count
+        if first is None:
+            first = timestamp
+        last = timestamp
+
+    return {
+        "file": path,
+        "events": dict(counts),
+        "first": first.decode(errors='replace') if first else None,
+        "last": last.decode(errors='replace') if last else None,
+    }
+
+
+def expand_paths(paths):
+    """Développe les répertoires en fichiers nightmod.log* (archives et sous-répertoires compris)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", "nightmod.log*"), recursive=True)))
+        else:
+            files.append(path)
+    return [path for path in files if not path.endswith((".pending", ".tmp"))]
+
+
+def scan_files(paths, jobs=None):
+    """Analyse plusieurs fichiers, en parallèle s'il y en a plus d'un"""
+    if jobs == 1 or len(paths) <= 1:
+        return [scan_file(path) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(scan_file, paths, chunksize=4))
+
+
+def merge_summaries(summaries):
+    """Fusionne les résumés par fichier en un total"""
+    totals = Counter()
+    for summary in summaries:
+        totals.update(summary["events"])
+    return dict(totals)
+
+
+def error_count(events):
+    """Nombre total d'erreurs d'action"""
+    return sum(count for event, count in events.items() if event.startswith("action_error:"))
+
+
+def format_columns(headers, rows):
+    """Aligne des lignes en colonnes (première colonne à gauche, les autres à droite)"""
+    widths = [max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))]
+    lines = ["  ".join(cell.ljust(widths[i]) if i == 0 else cell.rjust(widths[i])
+                       for i, cell in enumerate(row))
+             for row in [headers] + rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def format_table(summaries, totals):
+    """Formate les résumés en tableau texte"""
+    headers = ["Fichier"] + [title for _, title in TABLE_COLUMNS]
+    rows = []
+    for summary in summaries + [{"file": "TOTAL", "events": totals}]:
+        events = dict(summary["events"], errors=error_count(summary["events"]))
+        rows.append([summary["file"]] + [str(events.get(key, 0)) for key, _ in TABLE_COLUMNS])
+
+    lines = [format_columns(headers, rows)]
+
+    # Détail des erreurs par méthode de SystemActions
+    errors = sorted((event.split(":", 1)[1], count) for event, count in totals.items()
+                    if event.startswith("action_error:"))
+    if errors:
+        lines.append("")
+        lines.append("Erreurs par action:")
+        lines.extend(f"  {method}: {count}" for method, count in errors)
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Point d'entrée de nightmod-logstats"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="nightmod-logstats",
+        description="Statistiques des événements de NightMod à partir des fichiers de log"
+    )
+    parser.add_argument("paths", nargs="+",
+                        help="Fichiers nightmod.log (ou .gz) ou répertoires de logs")
+    parser.add_argument("--json", action="store_true", help="Sortie au format JSON")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Nombre de processus d'analyse (défaut: nombre de processeurs)")
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        parser.error(f"fichier introuvable: {', '.join(missing)}")
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        parser.error("aucun fichier de log trouvé")
+
+    summaries = scan_files(paths, args.jobs)
+    totals = merge_summaries(summaries)
+
+    if args.json:
+        print(json.dumps({"files": summaries, "totals": totals}, indent=2, ensure_ascii=False))
+    else:
+        print(format_table(summaries, totals))
+    return 0
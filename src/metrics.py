@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Métriques de NightMod au format texte Prometheus
+
+Un registre contient des compteurs, des jauges et des histogrammes. Les
+enregistrements des chemins critiques (thread Tk, chien de garde) ne prennent
+aucun verrou : une observation est un simple ajout dans une file
+(`deque.append`, atomique), et les agrégats ne sont calculés qu'à la
+collecte, dans le thread d'export.
+
+L'export se fait par un fichier réécrit atomiquement à intervalle régulier
+(compatible avec le collecteur « textfile » de node_exporter) et, si un port
+est configuré, par un serveur HTTP n'écoutant que sur localhost
+(`GET /metrics`). Un seul thread gère les deux et ne se réveille qu'à chaque
+écriture du fichier ou à chaque requête.
+"""
+
+import os
+import math
+import time
+import socket
+import logging
+import selectors
+import threading
+from collections import deque
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from src import history
+from src.utils import get_config_dir
+
+logger = logging.getLogger("NightMod.Metrics")
+
+# Type de contenu du format texte Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Intervalle d'écriture du fichier de métriques (secondes)
+EXPORT_INTERVAL = 60.0
+
+# Classes des histogrammes (secondes)
+LATENCY_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 45, 60)
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Délai d'inactivité accordé à un client HTTP, et attente maximale du thread
+# d'export à l'arrêt (secondes)
+REQUEST_TIMEOUT = 5.0
+STOP_TIMEOUT = 2 * REQUEST_TIMEOUT
+
+
+def get_metrics_path():
+    """Retourne le chemin par défaut du fichier de métriques"""
+    return os.path.join(get_config_dir(), "metrics.prom")
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs) + "}"
+
+
+class Metric:
+    """Base des métriques : nom, description et noms des étiquettes"""
+
+    kind = None
+
+    def __init__(self, registry, name, description, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+
+    def label_values(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    """Compteur monotone, éventuellement par étiquettes"""
+
+    kind = "counter"
+
+    def __init__(self, registry, name, description, labelnames=()):
+        super().__init__(registry, name, description, labelnames)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        """Incrémente le compteur (sans verrou)"""
+        self.registry.pending.append((self, self.label_values(labels), amount))
+
+    def fold(self, key, amount):
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        if not self.values and not self.labelnames:
+            return [f"{self.name} 0"]
+        return [f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}"
+                for key, value in sorted(self.values.items())]
+
+
+class Gauge(Metric):
+    """Jauge : valeur affectée, ou calculée à la collecte par une fonction"""
+
+    kind = "gauge"
+
+    def __init__(self, registry, name, description, function=None):
+        super().__init__(registry, name, description)
+        self.value = 0
+        self.function = function
+
+    def set(self, value):
+        """Affecte la jauge (une affectation d'attribut, sans verrou)"""
+        self.value = value
+
+    def samples(self):
+        value = self.function() if self.function else self.value
+        if value is None:
+            return []
+        return [f"{self.name} {format_value(value)}"]
+
+
+class Histogram(Metric):
+    """Histogramme à classes fixes, éventuellement par étiquettes"""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, description, buckets, labelnames=()):
+        super().__init__(registry, name, description, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.series = {}
+
+    def observe(self, value, **labels):
+        """Enregistre une observation (sans verrou)"""
+        self.registry.pending.append((self, self.label_values(labels), value))
+
+    def fold(self, key, value):
+        counts, total = self.series.get(key) or ([0] * len(self.buckets), 0.0)
+        for index, limit in enumerate(self.buckets):
+            if value <= limit:
+                counts[index] += 1
+                break
+        self.series[key] = (counts, total + value)
+
+    def samples(self):
+        lines = []
+        for key, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for limit, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = format_labels(self.labelnames, key, [("le", format_value(float(limit)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registre des métriques et file des observations en attente d'agrégation"""
+
+    def __init__(self):
+        self.metrics = []
+        self.pending = deque()
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, description, labelnames=()):
+        return self.register(Counter(self, name, description, labelnames))
+
+    def gauge(self, name, description, function=None):
+        return self.register(Gauge(self, name, description, function))
+
+    def histogram(self, name, description, buckets, labelnames=()):
+        return self.register(Histogram(self, name, description, buckets, labelnames))
+
+    def collect(self):
+        """Agrège les observations en attente et retourne le texte Prometheus"""
+        with self.lock:
+            pending = self.pending
+            while pending:
+                metric, key, value = pending.popleft()
+                metric.fold(key, value)
+
+            lines = []
+            for metric in self.metrics:
+                try:
+                    samples = metric.samples()
+                except Exception as e:
+                    logger.error(f"Erreur lors de la collecte de {metric.name}: {e}")
+                    continue
+                lines.extend(metric.header())
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+class NightModMetrics:
+    """Métriques de l'application, alimentées par les événements de l'historique"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        registry = self.registry
+        self.checks = registry.counter("nightmod_checks_total", "Vérifications affichées")
+        self.responses = registry.counter("nightmod_responses_total", "Réponses de l'utilisateur")
+        self.timeouts = registry.counter("nightmod_timeouts_total", "Vérifications sans réponse")
+        self.actions = registry.counter("nightmod_actions_total", "Actions exécutées",
+                                        ("action", "result"))
+        self.monitoring = registry.gauge("nightmod_monitoring", "Surveillance active (1) ou non (0)")
+        self.next_check = registry.gauge("nightmod_next_check_seconds",
+                                         "Secondes avant la prochaine vérification")
+        self.response_latency = registry.histogram("nightmod_response_latency_seconds",
+                                                   "Temps de réponse de l'utilisateur", LATENCY_BUCKETS)
+        self.action_duration = registry.histogram("nightmod_action_duration_seconds",
+                                                  "Durée d'exécution des actions", DURATION_BUCKETS,
+                                                  ("action",))
+
+    def bind_monitor(self, monitor):
+        """Calcule l'état de la surveillance et la prochaine échéance à la collecte"""
+        self.monitoring.function = lambda: 1 if monitor.is_running else 0
+
+        def seconds_to_next_check():
+            deadline = monitor.deadline
+            if deadline is None:
+                return None
+            return round(max(0.0, deadline - monitor.clock.now()), 3)
+
+        self.next_check.function = seconds_to_next_check
+
+    def record(self, event, action=None, result=None, duration=None, **details):
+        """Enregistre un événement de l'historique (mêmes arguments que EventHistory.record)"""
+        if event == history.POPUP_SHOWN:
+            self.checks.inc()
+        elif event == history.RESPONSE:
+            self.responses.inc()
+            if duration is not None:
+                self.response_latency.observe(duration)
+        elif event == history.TIMEOUT:
+            self.timeouts.inc()
+        elif event == history.ACTION_EXECUTED:
+            # Les messages d'erreur ne deviennent pas des étiquettes (cardinalité bornée)
+            outcome = result if result in ("success", "failure") else "error"
+            self.actions.inc(action=action, result=outcome)
+            if duration is not None:
+                self.action_duration.observe(duration, action=action)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Sert le registre du serveur sur /metrics"""
+
+    # Un client muet ne bloque pas le thread d'export au-delà de ce délai
+    timeout = REQUEST_TIMEOUT
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.registry.collect().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"HTTP {self.address_string()} {format % args}")
+
+
+class MetricsExporter:
+    """Écrit le fichier de métriques et sert l'interface HTTP dans un thread"""
+
+    def __init__(self, registry, path=None, interval=EXPORT_INTERVAL, port=None, host="127.0.0.1"):
+        """
+        Args:
+            registry: Registre à exporter
+            path: Fichier de métriques (None: pas de fichier)
+            interval: Intervalle d'écriture du fichier (secondes)
+            port: Port HTTP sur localhost (None: pas de serveur, 0: port libre)
+            host: Adresse d'écoute du serveur HTTP
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.port = port
+        self.host = host
+        self.server = None
+        self.thread = None
+        self.waker = None
+
+    def start(self):
+        """Démarre l'export (lève OSError si le port HTTP est indisponible)"""
+        if self.port is not None:
+            self.server = HTTPServer((self.host, self.port), MetricsHandler)
+            self.server.registry = self.registry
+            self.server.timeout = 0
+            logger.info(f"Métriques disponibles sur http://{self.host}:{self.server.server_address[1]}/metrics")
+        self.waker = socket.socketpair()
+        self.thread = threading.Thread(target=self._run, name="NightModMetrics", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Arrête l'export après une dernière écriture du fichier"""
+        if self.thread is None:
+            return
+        self.waker[1].send(b"\0")
+        self.thread.join(timeout=STOP_TIMEOUT)
+        if self.thread.is_alive():
+            # Le thread (démon) reste bloqué : ses sockets ne sont pas fermés sous lui
+            logger.warning("Le thread d'export des métriques ne s'est pas arrêté")
+            self.thread = None
+            return
+        self.thread = None
+        for sock in self.waker:
+            sock.close()
+        if self.server:
+            self.server.server_close()
+            self.server = None
+
+    def write_file(self):
+        """Réécrit le fichier de métriques de façon atomique"""
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.registry.collect())
+        os.replace(tmp_path, self.path)
+
+    def write_file_safely(self):
+        try:
+            self.write_file()
+        except OSError as e:
+            logger.error(f"Erreur lors de l'écriture des métriques: {e}")
+
+    def _run(self):
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.waker[0], selectors.EVENT_READ, "stop")
+            if self.server:
+                selector.register(self.server.socket, selectors.EVENT_READ, "http")
+
+            next_write = time.monotonic()
+            while True:
+                if self.path:
+                    now = time.monotonic()
+                    if now >= next_write:
+                        self.write_file_safely()
+                        next_write = now + self.interval
+                    timeout = next_write - now
+                else:
+                    # Sans fichier, seul le serveur HTTP réveille le thread
+                    timeout = None
+
+                for key, _ in selector.select(timeout):
+                    if key.data == "stop":
+                        self.write_file_safely()
+                        return
+                    self.server.handle_request()
@@ -1,72 +1,141 @@
-import threading
-import time
-from datetime import datetime
-from src.popup import PopupChecker
-from src.system_actions import SystemActions
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Planificateur de la surveillance pour NightMod
+
+Les vérifications sont programmées par échéance sur une horloge injectée
+(TkClock dans l'application, VirtualClock dans les tests et le simulateur) :
+aucun thread, aucune attente active. La vérification suivante n'est armée
+qu'une fois le popup précédent résolu, avec l'intervalle donné par la
+politique (fixe ou adaptative). À l'échéance, une fonction de report
+(détection d'inactivité, src/idletime.py) peut repousser la vérification si
+l'utilisateur est manifestement actif.
+"""
+
 import logging
 
+from src import tracing
+
 logger = logging.getLogger("NightMod.Monitoring")
 
 class MonitoringManager:
-    def __init__(self, root, config, on_user_response, on_no_response):
-        self.root = root
-        self.config = config
-        self.on_user_response = on_user_response
-        self.on_no_response = on_no_response
+    """Programme les vérifications périodiques à partir d'une horloge"""
+
+    def __init__(self, clock, policy, on_check, on_scheduled=None, postpone=None, on_postponed=None):
+        """
+        Initialise le planificateur
+
+        Args:
+            clock: Horloge (interface de src/clock.py)
+            policy: Politique d'intervalle (src/scheduling.py)
+            on_check: Fonction appelée à l'échéance pour afficher la vérification
+            on_scheduled: Fonction appelée avec (intervalle, échéance) à chaque programmation
+            postpone: Fonction appelée à l'échéance avec la durée du report déjà
+                accordé ; elle retourne le délai supplémentaire (0 pour afficher)
+            on_postponed: Fonction appelée avec (report, nouvelle échéance) lorsque
+                la vérification est reportée (on_scheduled n'est pas appelée : un
+                report n'est pas une nouvelle vérification)
+        """
+        self.clock = clock
+        self.policy = policy
+        self.on_check = on_check
+        self.on_scheduled = on_scheduled
+        self.postpone = postpone
+        self.on_postponed = on_postponed
 
         self.is_running = False
-        self.next_check_time = None
-        self.timer_thread = None
+        self.check_pending = False
+        self.started_at = None
+        self.deadline = None
+        self.postponed_since = None
+        self.job = None
 
-    def start_monitoring(self):
+    def start(self):
+        """Démarre la surveillance et programme la première vérification"""
         if self.is_running:
             return
         self.is_running = True
-        self.timer_thread = threading.Thread(target=self.monitoring_loop, daemon=True)
-        self.timer_thread.start()
-        logger.info("Surveillance démarrée")
+        self.check_pending = False
+        self.schedule_next()
 
-    def stop_monitoring(self):
+    def stop(self):
+        """Arrête la surveillance et annule la vérification programmée"""
         self.is_running = False
-        self.next_check_time = None
-        logger.info("Surveillance arrêtée")
-
-    def monitoring_loop(self):
-        while self.is_running:
-            interval_seconds = self.config.get("check_interval_minutes", 20) * 60
-            self.next_check_time = datetime.now().timestamp() + interval_seconds
-
-            for _ in range(interval_seconds):
-                if not self.is_running:
-                    break
-                time.sleep(1)
-
-            if not self.is_running:
-                break
-
-            self.root.after(0, self.show_check_popup)
-
-    def show_check_popup(self):
-        response_time = self.config.get("response_time_seconds", 30)
-        PopupChecker(
-            self.root,
-            response_time,
-            self.on_user_response_callback,
-            self.on_no_response_callback,
-            self.config
-        )
-
-    def on_user_response_callback(self):
-        logger.info("L'utilisateur a répondu au popup.")
-        if self.on_user_response:
-            self.on_user_response()
-
-    def on_no_response_callback(self):
-        logger.info("Aucune réponse détectée. Exécution de l'action configurée.")
-        action = self.config.get("shutdown_action", "shutdown")
+        self.check_pending = False
+        self.started_at = None
+        self.deadline = None
+        self.postponed_since = None
+        if self.job is not None:
+            self.clock.cancel(self.job)
+            self.job = None
+
+    def schedule_next(self):
+        """Programme la prochaine vérification selon la politique d'intervalle"""
+        self.schedule_in(self.policy.next_interval())
+
+    def schedule_in(self, interval):
+        """Programme la prochaine vérification dans un délai donné (secondes)"""
+        self._arm(interval)
+        if self.on_scheduled:
+            self.on_scheduled(interval, self.deadline)
+
+    def _arm(self, interval):
+        self.started_at = self.clock.now()
+        self.deadline = self.started_at + interval
+        self.job = self.clock.call_later(interval, self._fire)
+
+    def remaining(self):
+        """Secondes restantes avant la prochaine vérification (None si aucune n'est prévue)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self.clock.now())
+
+    def record_response(self, latency, response_time):
+        """Résout la vérification en cours par une réponse et programme la suivante"""
+        if latency is not None:
+            self.policy.observe_response(latency, response_time)
+        self._resolve()
+
+    def record_timeout(self):
+        """Résout la vérification en cours par une absence de réponse"""
+        self.policy.observe_timeout()
+        self.check_pending = False
+
+    def _resolve(self):
+        if not self.check_pending:
+            return
+        self.check_pending = False
+        if self.is_running:
+            self.schedule_next()
+
+    def _fire(self):
+        self.job = None
+        if not self.is_running:
+            return
+        # Retard du rappel par rapport à l'échéance
+        tracing.complete("monitoring.deadline", self.deadline, self.clock.now())
+
+        if self.postpone:
+            if self.postponed_since is None:
+                self.postponed_since = self.deadline
+            delay = self.postpone(self.clock.now() - self.postponed_since)
+            if delay:
+                tracing.instant("monitoring.postponed", delay=delay)
+                self._arm(delay)
+                if self.on_postponed:
+                    self.on_postponed(delay, self.deadline)
+                return
+            self.postponed_since = None
+
+        self.check_pending = True
+        self.deadline = None
         try:
-            SystemActions.perform_action(action)
+            with tracing.span("monitoring.check"):
+                self.on_check()
         except Exception as e:
-            logger.error(f"Erreur lors de l'exécution de l'action: {e}")
-        if self.on_no_response:
-            self.on_no_response()
+            # Sans popup, rien ne résoudrait la vérification : programmer la suivante
+            logger.error(f"Erreur lors de l'affichage de la vérification: {e}")
+            self.check_pending = False
+            if self.is_running:
+                self.schedule_next()
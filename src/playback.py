@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lecture multimédia en cours
+
+Afficher une vérification, puis éteindre la machine, au milieu d'un film est
+toujours une erreur. Plutôt que d'interroger les lecteurs à intervalles
+réguliers, NightMod s'abonne au bus de session (dbus-monitor) et suit :
+
+- les changements de PlaybackStatus des lecteurs MPRIS
+  (org.mpris.MediaPlayer2.*, navigateurs compris) ;
+- les inhibitions de l'économiseur d'écran et de la mise en veille
+  (org.freedesktop.ScreenSaver, org.freedesktop.PowerManagement.Inhibit,
+  org.gnome.SessionManager), posées par les lecteurs vidéo ;
+- la disparition des clients du bus, qui lève leurs lectures et inhibitions.
+
+Un thread lit la sortie de dbus-monitor (bloqué en lecture tant qu'aucun
+message n'arrive) et tient à jour l'indicateur `active`, que le planificateur
+lit sans aucun coût avant chaque vérification.
+"""
+
+import re
+import shutil
+import logging
+import threading
+import subprocess
+
+logger = logging.getLogger("NightMod.Playback")
+
+# Report d'une vérification pendant une lecture, et report cumulé maximal (secondes)
+PLAYBACK_POSTPONE = 5 * 60.0
+MAX_POSTPONE = 3 * 3600.0
+
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+MPRIS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_PLAYER = "org.mpris.MediaPlayer2.Player"
+PLAYBACK_STATUSES = ("Playing", "Paused", "Stopped")
+
+# Interfaces dont les appels Inhibit/UnInhibit sont suivis
+INHIBIT_INTERFACES = ("org.freedesktop.ScreenSaver", "org.freedesktop.PowerManagement.Inhibit")
+GNOME_SESSION = "org.gnome.SessionManager"
+# Drapeaux GNOME pris en compte : mise en veille (4) et inactivité (8)
+GNOME_INHIBIT_FLAGS = 4 | 8
+
+MATCH_RULES = (
+    f"type='signal',interface='org.freedesktop.DBus.Properties',"
+    f"member='PropertiesChanged',path='{MPRIS_PATH}'",
+    "type='signal',sender='org.freedesktop.DBus',interface='org.freedesktop.DBus',"
+    "member='NameOwnerChanged'",
+    *(f"type='method_call',interface='{interface}'" for interface in INHIBIT_INTERFACES),
+    f"type='method_call',interface='{GNOME_SESSION}',member='Inhibit'",
+    f"type='method_call',interface='{GNOME_SESSION}',member='Uninhibit'",
+)
+
+HEADER_KINDS = ("signal", "method call", "method return", "error")
+HEADER_FIELD = re.compile(r"(\w+)=([^ ;]+)")
+BODY_VALUE = re.compile(r'^(?:variant\s+)?(string|object path|uint32|int32|boolean)\s+(.*)$')
+
+
+def parse_value(kind, text):
+    """Valeur d'une ligne du corps d'un message affiché par dbus-monitor"""
+    if kind in ("string", "object path"):
+        return text[1:-1] if text.startswith('"') and text.endswith('"') else text
+    if kind == "boolean":
+        return text == "true"
+    return int(text)
+
+
+def parse_strings(output):
+    """Chaînes d'une réponse affichée par dbus-send --print-reply"""
+    return re.findall(r'string "([^"]*)"', output)
+
+
+class PlaybackMonitor:
+    """Indicateur « lecture en cours » tenu à jour par les signaux du bus de session"""
+
+    def __init__(self, address=None):
+        """
+        Args:
+            address: Adresse du bus (None pour le bus de session de l'utilisateur)
+        """
+        self.address = address
+        self.players = {}
+        self.inhibitors = {}
+        self.active = False
+        self.message = None
+        self.process = None
+        self.thread = None
+        self.ready = threading.Event()
+
+    def bus_arguments(self, tool):
+        if self.address is None:
+            return ["--session"]
+        return ["--address", self.address] if tool == "dbus-monitor" else [f"--bus={self.address}"]
+
+    def start(self):
+        """Lance dbus-monitor et le thread de lecture (False si le bus est inaccessible)"""
+        executable = shutil.which("dbus-monitor")
+        if not executable:
+            logger.info("dbus-monitor introuvable, lectures multimédia non détectées")
+            return False
+        try:
+            self.process = subprocess.Popen(
+                [executable, *self.bus_arguments("dbus-monitor"), *MATCH_RULES],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, errors="replace", bufsize=1
+            )
+        except OSError as e:
+            logger.error(f"Impossible de lancer dbus-monitor: {e}")
+            return False
+        self.thread = threading.Thread(target=self._run, name="NightModPlayback", daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Arrête dbus-monitor et attend la fin du thread"""
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+        if self.process is not None:
+            self.process.stdout.close()
+            self.process = None
+
+    def _run(self):
+        for line in self.process.stdout:
+            if not self.ready.is_set():
+                # Premier message : la surveillance est active, les lectures
+                # commencées avant le démarrage peuvent être relevées
+                self.query_players()
+                self.ready.set()
+            self.feed(line.rstrip("\n"))
+        logger.info("Surveillance du bus de session terminée")
+        self.players.clear()
+        self.inhibitors.clear()
+        self.update()
+
+    def query(self, *arguments):
+        """Appel de méthode avec dbus-send (sortie texte, None en cas d'erreur)"""
+        try:
+            result = subprocess.run(
+                ["dbus-send", *self.bus_arguments("dbus-send"), "--print-reply", *arguments],
+                capture_output=True, text=True, timeout=2, check=True
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return result.stdout
+
+    def query_players(self):
+        """Relève l'état des lecteurs MPRIS déjà présents sur le bus"""
+        names = parse_strings(self.query(
+            "--dest=org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus.ListNames"
+        ) or "")
+        for name in names:
+            if not name.startswith(MPRIS_PREFIX):
+                continue
+            owner = parse_strings(self.query(
+                "--dest=org.freedesktop.DBus", "/org/freedesktop/DBus",
+                "org.freedesktop.DBus.GetNameOwner", f"string:{name}"
+            ) or "")
+            status = parse_strings(self.query(
+                f"--dest={name}", MPRIS_PATH, "org.freedesktop.DBus.Properties.Get",
+                f"string:{MPRIS_PLAYER}", "string:PlaybackStatus"
+            ) or "")
+            if owner and status:
+                self.set_player(owner[0], status[0])
+
+    def feed(self, line):
+        """Traite une ligne de la sortie de dbus-monitor
+
+        Les messages ne sont pas délimités : chaque valeur est traitée dès sa
+        lecture, sans attendre l'en-tête du message suivant.
+        """
+        if line.startswith(HEADER_KINDS):
+            kind = next(kind for kind in HEADER_KINDS if line.startswith(kind))
+            self.message = dict(HEADER_FIELD.findall(line), kind=kind, args=[])
+            self.on_header(self.message)
+            return
+        match = BODY_VALUE.match(line.strip())
+        if self.message is None or not match:
+            return
+        try:
+            value = parse_value(*match.groups())
+        except ValueError:
+            return
+        self.message["args"].append(value)
+        self.on_value(self.message)
+
+    def on_header(self, message):
+        if message["kind"] != "method call" or message.get("interface") not in INHIBIT_INTERFACES:
+            return
+        if message.get("member") == "Inhibit":
+            self.set_inhibitor(message.get("sender"), 1)
+        elif message.get("member") == "UnInhibit":
+            self.set_inhibitor(message.get("sender"), -1)
+
+    def on_value(self, message):
+        args = message["args"]
+        member = message.get("member")
+        if member == "PropertiesChanged":
+            # Dictionnaire aplati : ..., "PlaybackStatus", "Playing", ...
+            if (args[0] == MPRIS_PLAYER and len(args) >= 3 and args[-2] == "PlaybackStatus"
+                    and args[-1] in PLAYBACK_STATUSES):
+                self.set_player(message.get("sender"), args[-1])
+        elif member == "NameOwnerChanged":
+            # name, ancien propriétaire, nouveau propriétaire ("" : disparu)
+            if len(args) == 3 and not args[2]:
+                self.forget(args[0])
+        elif message.get("interface") == GNOME_SESSION and message["kind"] == "method call":
+            # Inhibit(app_id, toplevel_xid, reason, flags) / Uninhibit(cookie)
+            if member == "Inhibit" and len(args) == 4 and args[3] & GNOME_INHIBIT_FLAGS:
+                self.set_inhibitor(message.get("sender"), 1)
+            elif member == "Uninhibit" and len(args) == 1:
+                self.set_inhibitor(message.get("sender"), -1)
+
+    def set_player(self, sender, status):
+        if sender:
+            self.players[sender] = status
+            self.update()
+
+    def set_inhibitor(self, sender, delta):
+        if not sender:
+            return
+        count = max(0, self.inhibitors.get(sender, 0) + delta)
+        if count:
+            self.inhibitors[sender] = count
+        else:
+            self.inhibitors.pop(sender, None)
+        self.update()
+
+    def forget(self, name):
+        """Un client a quitté le bus : ses lectures et inhibitions prennent fin"""
+        if self.players.pop(name, None) is not None or self.inhibitors.pop(name, None) is not None:
+            self.update()
+
+    def update(self):
+        active = "Playing" in self.players.values() or bool(self.inhibitors)
+        if active != self.active:
+            logger.info("Lecture multimédia en cours" if active else "Fin de la lecture multimédia")
+        self.active = active
+
+    def describe(self):
+        """Origine de l'indicateur (pour les journaux)"""
+        playing = sum(1 for status in list(self.players.values()) if status == "Playing")
+        parts = []
+        if playing:
+            parts.append(f"{playing} lecteur(s)")
+        if self.inhibitors:
+            parts.append(f"{len(self.inhibitors)} inhibition(s)")
+        return ", ".join(parts) or "aucune lecture"
+
+
+class PlaybackGate:
+    """Fonction de report du planificateur : repousse une vérification pendant une lecture"""
+
+    def __init__(self, monitor, delay=PLAYBACK_POSTPONE, max_postpone=MAX_POSTPONE):
+        self.monitor = monitor
+        self.delay = delay
+        self.max_postpone = max_postpone
+
+    def __call__(self, postponed_for):
+        """Retourne le report (secondes) à appliquer, 0 pour afficher la vérification
+
+        Args:
+            postponed_for: Report déjà accordé à cette vérification (secondes)
+        """
+        if not self.monitor.active or postponed_for >= self.max_postpone:
+            return 0
+        delay = min(self.delay, self.max_postpone - postponed_for)
+        logger.info(f"Lecture en cours ({self.monitor.describe()}), vérification reportée de {delay:.0f} s")
+        return delay
@@ -8,23 +8,31 @@ Module de gestion des popups de vérification pour NightMod
 import tkinter as tk
 from tkinter import ttk
 import logging
-import os
 import platform
 
+from src import tracing
+from src.clock import TkClock, Countdown
+from src.fonts import ensure_fonts
+from src.styles import POPUP_CLASS, get_palette
+
 # Obtenir le logger
 logger = logging.getLogger("NightMod.Popup")
 
 class PopupChecker(tk.Toplevel):
     """Fenêtre popup qui vérifie si l'utilisateur est éveillé"""
     
-    def __init__(self, parent, response_time, on_response, on_timeout, config=None):
-        super().__init__(parent)
+    def __init__(self, parent, response_time, on_response, on_timeout, config=None, clock=None):
+        super().__init__(parent, class_=POPUP_CLASS)
         self.parent = parent
         self.response_time = response_time
         self.on_response = on_response
         self.on_timeout = on_timeout
         self.remaining_time = response_time
+        self.shown_at = None
+        self.response_latency = None
         self.config = config or {}
+        self.clock = clock or TkClock(self)
+        self.timer = Countdown(self.clock, response_time, self.countdown, self.on_countdown_expired)
         self.animation_speed = 1  # Pour l'animation optionnelle
         
         # Configuration de la fenêtre
@@ -33,77 +41,41 @@ class PopupChecker(tk.Toplevel):
         self.resizable(False, False)
         
         # Configurer le style
-        self.setup_style()
+        with tracing.span("popup.style"):
+            self.setup_style()
         
         # Toujours au premier plan et centré
-        self.attributes("-topmost", True)
-        self.withdraw()  # Masquer d'abord
-        self.update_idletasks()
-        
-        # Centrer la fenêtre sur l'écran
-        self.center_window()
-        
-        # Rendre la fenêtre visible
-        self.deiconify()
+        with tracing.span("popup.center"):
+            self.attributes("-topmost", True)
+            self.withdraw()  # Masquer d'abord
+            self.update_idletasks()
+            
+            # Centrer la fenêtre sur l'écran
+            self.center_window()
+            
+            # Rendre la fenêtre visible
+            self.deiconify()
         
         # Jouer un son si activé
-        self.play_sound()
+        with tracing.span("popup.sound"):
+            self.play_sound()
         
         # Éléments d'interface
-        self.create_widgets()
+        with tracing.span("popup.widgets"):
+            self.create_widgets()
         
-        # Démarrer le compte à rebours
-        self.countdown()
+        # Démarrer le compte à rebours (le temps de réponse est mesuré à partir d'ici)
+        self.timer.start()
+        self.shown_at = self.timer.started_at
     
     def setup_style(self):
-        """Configure un style moderne et minimaliste pour la fenêtre popup"""
-        # Utiliser un thème sombre pour moins fatiguer les yeux
-        self.configure(background="#202020")
-
-        self.style = ttk.Style(self)
-
-        # Style de base sombre pour le confort nocturne
-        self.style.configure("Dark.TFrame", background="#202020")
-        self.style.configure("Dark.TLabel", background="#202020", foreground="#FFFFFF")
+        """Récupère la palette du thème actif et les polices partagées
 
-        # Texte du titre
-        self.style.configure("Title.TLabel", 
-                             background="#202020", 
-                             foreground="#FFFFFF", 
-                             font=("Segoe UI", 16, "bold"))
-
-        # Style du compte à rebours
-        self.style.configure("Time.TLabel", 
-                             background="#202020", 
-                             foreground="#4CAF50",  # Vert pour un départ calme
-                             font=("Segoe UI", 32, "bold"))
-
-        # Style info
-        self.style.configure("Info.TLabel", 
-                             background="#202020", 
-                             foreground="#AAAAAA",
-                             font=("Segoe UI", 9))
-
-        # Style du bouton principal - Visible mais pas agressif
-        self.style.configure("Wake.TButton", 
-                             font=("Segoe UI", 12, "bold"),
-                             padding=12,
-                             background="#4CAF50",
-                             foreground="#FFFFFF")
-
-        self.style.map("Wake.TButton", 
-                       background=[("pressed", "#3C9E3C"), ("active", "#3C9E3C")],
-                       foreground=[("pressed", "#FFFFFF"), ("active", "#FFFFFF")])
-
-        # Tenter de charger un thème moderne si disponible
-        if platform.system() == "Windows":
-            try:
-                theme_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "themes/azure.tcl")
-                if os.path.exists(theme_path):
-                    self.tk.call("source", theme_path)
-                    self.tk.call("set_theme", "dark")
-            except Exception as e:
-                logger.warning(f"Impossible de charger le thème: {e}")
+        Les styles ttk (Dark.TFrame, Wake.TButton...) et le fond de la fenêtre sont
+        fournis par le thème compilé de l'application (voir src/styles.py).
+        """
+        self.palette = get_palette(self.parent)
+        self.fonts = ensure_fonts(self.parent)
 
     def create_widgets(self):
         """Crée les éléments d'interface de la fenêtre popup avec un design plus élégant"""
@@ -121,7 +93,7 @@ class PopupChecker(tk.Toplevel):
         ttk.Label(
             title_frame, 
             text="Êtes-vous encore éveillé ?", 
-            font=("Segoe UI", 16, "bold"),
+            font=self.fonts["title"],
             style="Title.TLabel"
         ).pack(anchor=tk.CENTER)
         
@@ -154,8 +126,7 @@ class PopupChecker(tk.Toplevel):
         ttk.Label(
             info_frame,
             text="Appuyez sur Échap ou cliquez pour rester actif",
-            font=("Segoe UI", 9),
-            foreground="#AAAAAA",
+            font=self.fonts["info"],
             style="Info.TLabel"
         ).pack(side=tk.LEFT)
         
@@ -168,8 +139,7 @@ class PopupChecker(tk.Toplevel):
         ttk.Label(
             info_frame,
             text=f"Action si inactif: {action_text}",
-            font=("Segoe UI", 9),
-            foreground="#AAAAAA",
+            font=self.fonts["info"],
             style="Info.TLabel"
         ).pack(side=tk.RIGHT)
         
@@ -179,28 +149,29 @@ class PopupChecker(tk.Toplevel):
         # Intercepter la fermeture de la fenêtre
         self.protocol("WM_DELETE_WINDOW", self.handle_response)
     
-    def countdown(self):
-        """Gère le compte à rebours et vérifie si le temps est écoulé"""
-        if self.remaining_time > 0:
-            # Mettre à jour l'indicateur visuel
-            self.update_countdown_indicator()
-            
-            # Faire clignoter si moins de 5 secondes
-            if self.remaining_time <= 5:
-                self.animate_warning()
-                # Jouer un son plus urgent si moins de 5 secondes
-                if self.remaining_time % 2 == 0:
-                    self.bell()
-            
-            # Décrémenter le temps restant
-            self.remaining_time -= 1
-            
-            # Continuer le compte à rebours
-            self.after(1000, self.countdown)
-        else:
-            logger.info("Aucune réponse reçue dans le délai imparti")
-            self.destroy()
-            self.on_timeout()
+    def countdown(self, remaining):
+        """Met à jour le compte à rebours (appelé à chaque seconde par la minuterie)"""
+        self.remaining_time = remaining
+        if remaining == self.response_time - 1:
+            # Retard du premier tick programmé (boucle Tk bloquée après l'affichage)
+            tracing.complete("popup.first_tick", self.timer.started_at + 1, self.clock.now())
+        
+        # Mettre à jour l'indicateur visuel
+        self.update_countdown_indicator()
+        
+        # Faire clignoter si moins de 5 secondes
+        if self.remaining_time <= 5:
+            self.animate_warning()
+            # Jouer un son plus urgent si moins de 5 secondes
+            if self.remaining_time % 2 == 0:
+                self.bell()
+    
+    def on_countdown_expired(self):
+        """Appelé lorsque le délai de réponse est écoulé"""
+        logger.info("Aucune réponse reçue dans le délai imparti")
+        tracing.instant("popup.timeout")
+        self.destroy()
+        self.on_timeout()
     
     def center_window(self):
         """Centre la fenêtre sur l'écran et ajoute une légère animation de fondu"""
@@ -272,7 +243,6 @@ class PopupChecker(tk.Toplevel):
             parent,
             width=self.canvas_size,
             height=self.canvas_size,
-            background="#202020",
             highlightthickness=0
         )
         self.canvas.pack(pady=(0, 10))
@@ -290,7 +260,7 @@ class PopupChecker(tk.Toplevel):
             self.circle_x + self.circle_radius,
             self.circle_y + self.circle_radius,
             width=self.circle_width,
-            outline="#353535"
+            outline=self.palette["ring_bg"]
         )
         
         # Cercle de progression (coloré)
@@ -303,7 +273,7 @@ class PopupChecker(tk.Toplevel):
             extent=-359.9,  # Presque un cercle complet
             width=self.circle_width,
             style=tk.ARC,
-            outline="#4CAF50"  # Commence vert
+            outline=self.palette["accent"]  # Commence vert
         )
         
         # Texte au centre pour le compte à rebours
@@ -311,8 +281,8 @@ class PopupChecker(tk.Toplevel):
             self.circle_x,
             self.circle_y,
             text=str(self.remaining_time),
-            fill="#ffffff",
-            font=("Segoe UI", 32, "bold")
+            fill=self.palette["fg"],
+            font=self.fonts["countdown"]
         )
         
         # Texte plus petit en dessous
@@ -320,8 +290,8 @@ class PopupChecker(tk.Toplevel):
             self.circle_x,
             self.circle_y + 30,
             text="secondes",
-            fill="#aaaaaa",
-            font=("Segoe UI", 10)
+            fill=self.palette["muted"],
+            font=self.fonts["unit"]
         )
         
         return self.canvas
@@ -351,14 +321,18 @@ class PopupChecker(tk.Toplevel):
                 self.canvas.itemconfig(self.circle_progress, outline="#ff8888")  # Rouge plus clair
                 self.canvas.itemconfig(self.time_label, fill="#ff8888")
         elif self.remaining_time <= 10:
-            self.canvas.itemconfig(self.circle_progress, outline="#FFA500")  # Orange
-            self.canvas.itemconfig(self.time_label, fill="#FFA500")
+            self.canvas.itemconfig(self.circle_progress, outline=self.palette["warning"])  # Orange
+            self.canvas.itemconfig(self.time_label, fill=self.palette["warning"])
         else:
-            self.canvas.itemconfig(self.circle_progress, outline="#4CAF50")  # Vert
-            self.canvas.itemconfig(self.time_label, fill="#FFFFFF")  # Texte blanc
+            self.canvas.itemconfig(self.circle_progress, outline=self.palette["accent"])  # Vert
+            self.canvas.itemconfig(self.time_label, fill=self.palette["fg"])  # Texte principal
 
     def handle_response(self, event=None):
         """Appelé quand l'utilisateur répond au popup"""
         logger.info("Réponse reçue de l'utilisateur")
+        if self.shown_at is not None:
+            self.response_latency = self.timer.elapsed()
+        tracing.instant("popup.response", latency=self.response_latency)
+        self.timer.cancel()
         self.destroy()
         self.on_response()
\ No newline at end of file
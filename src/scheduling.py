@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Politiques d'intervalle entre les vérifications
+
+En mode fixe, l'intervalle est toujours `check_interval_minutes`. En mode
+adaptatif, les temps de réponse récents (et les absences de réponse) sont
+conservés dans un tampon circulaire compact : un utilisateur qui répond vite
+et régulièrement est dérangé moins souvent, un utilisateur lent ou irrégulier
+est vérifié plus tôt, toujours entre les bornes configurées.
+
+Les politiques ne dépendent ni de Tk ni de l'horloge, ce qui permet de les
+rejouer dans le simulateur.
+"""
+
+import math
+import logging
+from array import array
+
+logger = logging.getLogger("NightMod.Scheduling")
+
+# Modes d'intervalle disponibles
+INTERVAL_MODES = ("fixed", "adaptive")
+
+# Poids de l'observation la plus récente dans la moyenne exponentielle
+RECENCY_WEIGHT = 0.35
+
+
+class LatencyRing:
+    """Tampon circulaire des derniers temps de réponse, exprimés en fraction du délai
+
+    0.0 correspond à une réponse immédiate, 1.0 à une absence de réponse.
+    Le stockage est un tableau de doubles de taille fixe.
+    """
+
+    def __init__(self, capacity=8):
+        self.capacity = max(1, int(capacity))
+        self.values = array('d', [0.0] * self.capacity)
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, value):
+        """Ajoute une observation (écrase la plus ancienne si le tampon est plein)"""
+        end = (self.start + self.size) % self.capacity
+        self.values[end] = value
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def add_response(self, latency, response_time):
+        """Ajoute un temps de réponse (secondes) rapporté au délai de réponse"""
+        self.append(min(1.0, max(0.0, latency / response_time)) if response_time > 0 else 0.0)
+
+    def add_timeout(self):
+        """Ajoute une absence de réponse"""
+        self.append(1.0)
+
+    def __iter__(self):
+        """Parcourt les observations de la plus ancienne à la plus récente"""
+        for i in range(self.size):
+            yield self.values[(self.start + i) % self.capacity]
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+
+
+class FixedIntervalPolicy:
+    """Intervalle constant (comportement historique)"""
+
+    def __init__(self, interval_seconds):
+        self.interval_seconds = interval_seconds
+
+    def observe_response(self, latency, response_time):
+        pass
+
+    def observe_timeout(self):
+        pass
+
+    def next_interval(self):
+        """Retourne l'intervalle avant la prochaine vérification (secondes)"""
+        return self.interval_seconds
+
+
+class AdaptiveIntervalPolicy:
+    """Intervalle ajusté selon la rapidité et la régularité des réponses récentes"""
+
+    def __init__(self, base_seconds, min_seconds, max_seconds, window=8, warmup=2):
+        """
+        Args:
+            base_seconds: Intervalle tant que les observations sont insuffisantes
+            min_seconds: Intervalle minimal (utilisateur lent ou irrégulier)
+            max_seconds: Intervalle maximal (utilisateur rapide et régulier)
+            window: Nombre de réponses récentes conservées
+            warmup: Nombre d'observations avant d'adapter l'intervalle
+        """
+        self.min_seconds = min(min_seconds, max_seconds)
+        self.max_seconds = max(min_seconds, max_seconds)
+        self.base_seconds = min(self.max_seconds, max(self.min_seconds, base_seconds))
+        self.warmup = warmup
+        self.ring = LatencyRing(window)
+
+    def observe_response(self, latency, response_time):
+        self.ring.add_response(latency, response_time)
+
+    def observe_timeout(self):
+        self.ring.add_timeout()
+
+    def alertness(self):
+        """Score de vigilance entre 0 (endormi) et 1 (rapide et régulier), None si inconnu"""
+        if len(self.ring) < self.warmup:
+            return None
+
+        # Moyenne exponentielle : les dernières réponses comptent davantage
+        mean = None
+        for value in self.ring:
+            mean = value if mean is None else mean + RECENCY_WEIGHT * (value - mean)
+
+        # Irrégularité : écart-type des observations
+        values = list(self.ring)
+        average = sum(values) / len(values)
+        spread = math.sqrt(sum((value - average) ** 2 for value in values) / len(values))
+
+        return max(0.0, 1.0 - mean) / (1.0 + 4.0 * spread)
+
+    def next_interval(self):
+        """Retourne l'intervalle avant la prochaine vérification (secondes)"""
+        score = self.alertness()
+        if score is None:
+            return self.base_seconds
+        # La vigilance est rarement parfaite : 0.8 suffit pour atteindre le maximum
+        score = min(1.0, score / 0.8)
+        return round(self.min_seconds + (self.max_seconds - self.min_seconds) * score)
+
+
+def create_interval_policy(config, previous=None):
+    """Crée la politique d'intervalle décrite par la configuration
+
+    Args:
+        config: Configuration de l'application
+        previous: Politique précédente, dont les observations sont conservées
+    """
+    base_seconds = config.get("check_interval_minutes", 20) * 60
+    mode = config.get("interval_mode", "fixed")
+
+    if mode == "adaptive":
+        policy = AdaptiveIntervalPolicy(
+            base_seconds,
+            config.get("interval_min_minutes", 5) * 60,
+            config.get("interval_max_minutes", 45) * 60,
+            config.get("latency_window", 8)
+        )
+        # Un changement de paramètres ne fait pas oublier les réponses récentes
+        if isinstance(previous, AdaptiveIntervalPolicy) and previous.ring.capacity == policy.ring.capacity:
+            policy.ring = previous.ring
+        return policy
+
+    if mode != "fixed":
+        logger.warning(f"Mode d'intervalle non reconnu: {mode}, intervalle fixe utilisé")
+    return FixedIntervalPolicy(base_seconds)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Simulateur à événements discrets des politiques d'intervalle
+
+Une nuit de surveillance est rejouée sur une horloge virtuelle avec le
+planificateur de l'application (MonitoringManager, politique créée par
+create_interval_policy, fonction de report éventuelle) : chaque vérification
+arme le compte à rebours du popup (Countdown) et, si l'utilisateur est
+éveillé, une réponse ; le premier des deux l'emporte et est transmis au
+planificateur comme le fait NightModApp. Une nuit de plusieurs heures est
+simulée en quelques millisecondes.
+
+Les nuits sont soit enregistrées (temps de réponse et absences de réponse
+extraits de nightmod.log), soit synthétiques. Pour chaque politique, le
+simulateur mesure le nombre de popups par nuit, le délai entre
+l'endormissement et l'action, et les actions exécutées alors que
+l'utilisateur était éveillé.
+"""
+
+import math
+import random
+import itertools
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from src.clock import VirtualClock, Countdown
+from src.scheduling import create_interval_policy
+from src.monitoring import MonitoringManager
+from src.logstats import expand_paths, iter_lines, parse_records, format_columns
+
+# Messages de nightmod.log utilisés pour reconstruire les nuits
+LOG_STARTED = "Surveillance démarrée".encode('utf-8')
+LOG_STOPPED = "Surveillance arrêtée".encode('utf-8')
+LOG_POPUP = "Affichage de la fenêtre de vérification".encode('utf-8')
+LOG_ANSWERED = "L'utilisateur a répondu au popup en ".encode('utf-8')
+LOG_TIMEOUT = "Aucune réponse de l'utilisateur".encode('utf-8')
+
+LOG_TIME_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+
+# Durée maximale d'une nuit simulée (secondes)
+MAX_NIGHT_SECONDS = 12 * 3600
+
+
+class Night:
+    """Comportement de l'utilisateur pendant une nuit
+
+    Args:
+        latencies: Temps de réponse (secondes) lorsque l'utilisateur est éveillé,
+            utilisés dans l'ordre puis en boucle
+        sleep_at: Instant d'endormissement depuis le début de la surveillance (None : jamais)
+        duration: Durée de la surveillance (secondes)
+    """
+
+    def __init__(self, latencies, sleep_at, duration):
+        self.latencies = list(latencies) or [5.0]
+        self.sleep_at = sleep_at
+        self.duration = duration
+
+    def latency_at(self, index):
+        """Temps de réponse de la n-ième vérification à laquelle l'utilisateur est éveillé"""
+        return self.latencies[index % len(self.latencies)]
+
+
+def simulate_night(night, policy_config, response_time, postpone=None):
+    """Simule une nuit avec une politique et retourne ses mesures
+
+    Args:
+        postpone: Fonction de report du planificateur (comme dans l'application)
+
+    Returns:
+        Dictionnaire: popups, action (instant ou None), false_action, sleep_delay
+    """
+    clock = VirtualClock()
+    state = {"popups": 0, "answers": 0, "action": None, "false_action": False}
+
+    def on_check():
+        if clock.now() >= night.duration:
+            monitor.stop()
+            return
+        state["popups"] += 1
+        countdown = Countdown(clock, response_time, lambda remaining: None, on_timeout)
+        countdown.start()
+
+        asleep = night.sleep_at is not None and clock.now() >= night.sleep_at
+        if not asleep:
+            latency = night.latency_at(state["answers"])
+            if latency < response_time:
+                clock.call_later(latency, on_response, countdown, latency)
+
+    def on_response(countdown, latency):
+        countdown.cancel()
+        state["answers"] += 1
+        monitor.record_response(latency, response_time)
+
+    def on_timeout():
+        monitor.record_timeout()
+        monitor.stop()
+        state["action"] = clock.now()
+        state["false_action"] = night.sleep_at is None or clock.now() - response_time < night.sleep_at
+
+    monitor = MonitoringManager(clock, create_interval_policy(policy_config), on_check, postpone=postpone)
+    monitor.start()
+    clock.run(until=night.duration + response_time)
+
+    sleep_delay = None
+    if state["action"] is not None and not state["false_action"]:
+        sleep_delay = state["action"] - night.sleep_at
+
+    return {
+        "popups": state["popups"],
+        "action": state["action"],
+        "false_action": state["false_action"],
+        "sleep_delay": sleep_delay,
+    }
+
+
+def quantile(values, p):
+    """Quantile d'une liste triée (interpolation linéaire)"""
+    if not values:
+        return None
+    position = (len(values) - 1) * p
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def evaluate_policy(policy_config, nights, response_time, postpone=None):
+    """Simule toutes les nuits avec une politique et agrège les mesures"""
+    results = [simulate_night(night, policy_config, response_time, postpone) for night in nights]
+
+    delays = sorted(result["sleep_delay"] for result in results if result["sleep_delay"] is not None)
+    false_actions = sum(1 for result in results if result["false_action"])
+
+    return {
+        "policy": policy_config,
+        "nights": len(nights),
+        "popups_per_night": sum(result["popups"] for result in results) / max(1, len(nights)),
+        "sleep_delay_median_min": none_or_minutes(quantile(delays, 0.5)),
+        "sleep_delay_p90_min": none_or_minutes(quantile(delays, 0.9)),
+        "missed_sleep": sum(1 for night, result in zip(nights, results)
+                            if night.sleep_at is not None and result["action"] is None),
+        "false_actions": false_actions,
+        "false_action_rate": false_actions / max(1, len(nights)),
+    }
+
+
+def none_or_minutes(seconds):
+    return None if seconds is None else seconds / 60.0
+
+
+def synthetic_nights(count, seed=0, response_time=30):
+    """Génère des nuits synthétiques
+
+    L'utilisateur s'endort en moyenne 2 h 30 après le début de la surveillance ;
+    ses temps de réponse suivent une loi log-normale et s'allongent à l'approche
+    de l'endormissement.
+    """
+    rng = random.Random(seed)
+    nights = []
+    for _ in range(count):
+        sleep_at = max(600.0, rng.gauss(2.5 * 3600, 3600))
+        median = rng.uniform(2.0, 6.0)
+        latencies = []
+        for step in range(64):
+            # Somnolence croissante : le temps médian double sur la fin de la soirée
+            drowsiness = 1.0 + min(1.0, step / 16.0)
+            latencies.append(min(response_time * 2, rng.lognormvariate(math.log(median * drowsiness), 0.6)))
+        nights.append(Night(latencies, sleep_at, MAX_NIGHT_SECONDS))
+    return nights
+
+
+def parse_log_time(timestamp):
+    return datetime.strptime(timestamp.decode(), LOG_TIME_FORMAT).timestamp()
+
+
+def recorded_nights(paths, seed=0):
+    """Reconstruit les nuits enregistrées dans des fichiers nightmod.log
+
+    Une nuit va de « Surveillance démarrée » à l'arrêt de la surveillance.
+    L'endormissement est tiré entre la dernière réponse et le popup resté sans
+    réponse.
+    """
+    rng = random.Random(seed)
+    nights = []
+
+    for path in expand_paths(paths):
+        session = None
+        for timestamp, name, _level, message in parse_records(iter_lines(path)):
+            if name != b"NightMod.App":
+                continue
+
+            if message.startswith(LOG_STARTED):
+                session = {"start": parse_log_time(timestamp), "latencies": [],
+                           "last_answer": None, "popup": None}
+            elif session is None:
+                continue
+            elif message.startswith(LOG_POPUP):
+                session["popup"] = parse_log_time(timestamp)
+            elif message.startswith(LOG_ANSWERED):
+                try:
+                    session["latencies"].append(float(message[len(LOG_ANSWERED):].split()[0]))
+                except (ValueError, IndexError):
+                    pass
+                session["last_answer"] = parse_log_time(timestamp)
+            elif message.startswith(LOG_TIMEOUT) and session["popup"] is not None:
+                start = session["start"]
+                awake_until = session["last_answer"] or start
+                sleep_at = rng.uniform(awake_until, session["popup"]) - start
+                nights.append(Night(session["latencies"], sleep_at, MAX_NIGHT_SECONDS))
+                session = None
+            elif message.startswith(LOG_STOPPED):
+                # Arrêt manuel : l'utilisateur ne s'est pas endormi pendant la surveillance
+                duration = parse_log_time(timestamp) - session["start"]
+                if session["latencies"]:
+                    nights.append(Night(session["latencies"], None, duration))
+                session = None
+
+    return nights
+
+
+def parse_policy(spec):
+    """Convertit « mode:clé=valeur,... » en configuration de politique"""
+    mode, _, params = spec.partition(":")
+    config = {"interval_mode": mode}
+    for item in filter(None, params.split(",")):
+        key, _, value = item.partition("=")
+        config[key.strip()] = float(value) if "." in value else int(value)
+    return config
+
+
+def expand_grid(spec):
+    """Développe une grille « mode:clé=v1|v2,clé=v3|v4 » en liste de configurations"""
+    mode, _, params = spec.partition(":")
+    keys = []
+    choices = []
+    for item in filter(None, params.split(",")):
+        key, _, values = item.partition("=")
+        keys.append(key.strip())
+        choices.append(values.split("|"))
+
+    return [
+        parse_policy(f"{mode}:" + ",".join(f"{key}={value}" for key, value in zip(keys, combination)))
+        for combination in itertools.product(*choices)
+    ]
+
+
+def run_policies(policies, nights, response_time, jobs=None):
+    """Évalue les politiques, en parallèle s'il y en a plusieurs"""
+    if jobs == 1 or len(policies) <= 1:
+        return [evaluate_policy(policy, nights, response_time) for policy in policies]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(evaluate_policy, policy, nights, response_time) for policy in policies]
+        return [future.result() for future in futures]
+
+
+def format_policy(config):
+    params = ",".join(f"{key}={value}" for key, value in config.items() if key != "interval_mode")
+    return f"{config['interval_mode']}:{params}" if params else config["interval_mode"]
+
+
+# Colonnes du tableau de résultats
+REPORT_HEADERS = ["Politique", "Popups/nuit", "Délai médian (min)", "Délai p90 (min)",
+                  "Non détectés", "Fausses actions"]
+
+
+def report_rows(reports):
+    """Lignes du tableau de résultats (une par politique)"""
+    def number(value, digits=1):
+        return "—" if value is None else f"{value:.{digits}f}"
+
+    return [[
+        format_policy(report["policy"]),
+        number(report["popups_per_night"]),
+        number(report["sleep_delay_median_min"]),
+        number(report["sleep_delay_p90_min"]),
+        str(report["missed_sleep"]),
+        f"{report['false_actions']} ({report['false_action_rate']:.1%})",
+    ] for report in reports]
+
+
+def main(argv=None):
+    """Point d'entrée de nightmod-sim"""
+    import json
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="nightmod-sim",
+        description="Simule des politiques d'intervalle sur des nuits enregistrées ou synthétiques"
+    )
+    parser.add_argument("--log", nargs="+", default=[],
+                        help="Fichiers ou répertoires nightmod.log à rejouer")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Nombre de nuits synthétiques (défaut: 1000 sans --log)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur aléatoire")
+    parser.add_argument("--response-time", type=int, default=30,
+                        help="Délai de réponse du popup en secondes")
+    parser.add_argument("--policy", action="append", default=[],
+                        help="Politique, par exemple fixed:check_interval_minutes=20")
+    parser.add_argument("--grid", action="append", default=[],
+                        help="Grille, par exemple adaptive:interval_min_minutes=5|10,interval_max_minutes=30|45")
+    parser.add_argument("--jobs", type=int, default=None, help="Nombre de processus")
+    parser.add_argument("--json", action="store_true", help="Sortie au format JSON")
+    args = parser.parse_args(argv)
+
+    nights = recorded_nights(args.log, args.seed) if args.log else []
+    synthetic = args.synthetic or (0 if args.log else 1000)
+    nights += synthetic_nights(synthetic, args.seed, args.response_time)
+    if not nights:
+        parser.error("aucune nuit à simuler")
+
+    try:
+        policies = [parse_policy(spec) for spec in args.policy]
+        for spec in args.grid:
+            policies.extend(expand_grid(spec))
+    except ValueError as e:
+        parser.error(f"politique invalide: {e}")
+    if not policies:
+        policies = [parse_policy("fixed:check_interval_minutes=20"), parse_policy("adaptive")]
+
+    reports = run_policies(policies, nights, args.response_time, args.jobs)
+
+    if args.json:
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+    else:
+        print(f"{len(nights)} nuits simulées, délai de réponse {args.response_time} s\n")
+        print(format_columns(REPORT_HEADERS, report_rows(reports)))
+    return 0
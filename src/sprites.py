@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Planche de sprites pour l'icône de progression de la barre des tâches
+
+Toutes les images de progression (un secteur grisé qui se remplit dans le sens
+horaire jusqu'à la prochaine vérification) sont calculées une seule fois avec des masques
+NumPy vectorisés, sur-échantillonnés pour l'anticrénelage, puis mises en cache
+sur le disque. L'animation ne touche l'icône que lorsque l'indice de l'image
+change, à l'instant exact calculé depuis l'échéance de la vérification.
+"""
+
+import os
+import hashlib
+import logging
+
+from src.utils import get_config_dir
+
+logger = logging.getLogger("NightMod.Sprites")
+
+# Version du format de la planche (à incrémenter si le rendu change)
+SPRITE_VERSION = 1
+
+# Facteur de sur-échantillonnage pour l'anticrénelage
+SUPERSAMPLE = 4
+
+
+def build_progress_frames(active, inactive, frame_count, supersample=SUPERSAMPLE):
+    """Calcule toutes les images de progression en une seule passe vectorisée
+
+    Args:
+        active: Tableau (taille, taille, 4) uint8 de l'icône active
+        inactive: Tableau (taille, taille, 4) uint8 de l'icône inactive
+        frame_count: Nombre d'images (la première vide, la dernière pleine)
+        supersample: Facteur de sur-échantillonnage du masque
+
+    Returns:
+        Tableau (frame_count, taille, taille, 4) uint8
+    """
+    import numpy as np
+
+    size = active.shape[0]
+    fine = size * supersample
+
+    # Angle de chaque sous-pixel, 0 en haut et croissant dans le sens horaire
+    coords = (np.arange(fine, dtype=np.float32) + 0.5) / supersample - size / 2.0
+    dy, dx = np.meshgrid(coords, coords, indexing='ij')
+    angle = (np.arctan2(dx, -dy) % (2 * np.pi)) / (2 * np.pi)
+
+    # Masques de toutes les images d'un coup : (images, fine, fine)
+    fractions = np.linspace(0.0, 1.0, frame_count, dtype=np.float32)[:, None, None]
+    masks = angle[None, :, :] < fractions
+    masks[-1] = True
+
+    # Couverture moyenne par pixel (anticrénelage)
+    coverage = masks.reshape(frame_count, size, supersample, size, supersample).mean(axis=(2, 4))
+    coverage = coverage[..., None].astype(np.float32)
+
+    # Le secteur écoulé passe de l'icône active à l'icône inactive
+    base = active.astype(np.float32)[None]
+    top = inactive.astype(np.float32)[None]
+    frames = base + (top - base) * coverage
+    return np.clip(np.rint(frames), 0, 255).astype(np.uint8)
+
+
+def sprite_cache_key(active, inactive, frame_count):
+    """Calcule la clé de cache de la planche à partir des images sources"""
+    digest = hashlib.sha1()
+    digest.update(f"{SPRITE_VERSION}:{frame_count}:{SUPERSAMPLE}:{active.shape}".encode())
+    digest.update(active.tobytes())
+    digest.update(inactive.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def load_progress_frames(active_image, inactive_image, frame_count, cache_dir=None):
+    """Retourne les images de progression (PIL) en utilisant le cache disque si possible"""
+    import numpy as np
+    from PIL import Image
+
+    active = np.asarray(active_image.convert('RGBA'))
+    inactive = np.asarray(inactive_image.convert('RGBA'))
+
+    cache_dir = cache_dir or os.path.join(get_config_dir(), "cache")
+    cache_file = os.path.join(
+        cache_dir, f"sprites-{sprite_cache_key(active, inactive, frame_count)}.npy"
+    )
+
+    frames = None
+    try:
+        frames = np.load(cache_file)
+        if frames.shape != (frame_count,) + active.shape:
+            frames = None
+    except (OSError, ValueError):
+        frames = None
+
+    if frames is None:
+        frames = build_progress_frames(active, inactive, frame_count)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.tmp.npy"
+            np.save(tmp_file, frames)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Impossible de mettre en cache la planche de sprites: {e}")
+        logger.info(f"Planche de {frame_count} images de progression calculée")
+
+    return [Image.fromarray(frame, 'RGBA') for frame in frames]
+
+
+class CountdownAnimator:
+    """Affiche l'image de progression correspondant au temps écoulé vers l'échéance
+
+    Aucun minuteur périodique : un seul rappel est programmé, à l'instant où
+    l'indice de l'image change.
+    """
+
+    def __init__(self, frame_count, show_frame, clock):
+        """
+        Args:
+            frame_count: Nombre d'images de la planche
+            show_frame: Fonction appelée avec l'indice de l'image à afficher
+            clock: Horloge de l'application (même base de temps que l'échéance)
+        """
+        self.frame_count = frame_count
+        self.show_frame = show_frame
+        self.clock = clock
+        self.start_time = None
+        self.deadline = None
+        self.current_frame = None
+        self.job = None
+
+    def frame_at(self, moment):
+        """Retourne l'indice de l'image pour un instant donné"""
+        duration = self.deadline - self.start_time
+        if duration <= 0:
+            return self.frame_count - 1
+        fraction = (moment - self.start_time) / duration
+        # La marge évite qu'un arrondi à l'instant exact du changement d'image
+        # ne redonne l'image précédente (et ne reprogramme le même rappel)
+        return max(0, min(self.frame_count - 1, int(fraction * (self.frame_count - 1) + 1e-9)))
+
+    def start(self, start_time, deadline):
+        """Démarre l'animation pour un nouveau cycle de vérification"""
+        self.stop()
+        self.start_time = start_time
+        self.deadline = deadline
+        self._tick()
+
+    def stop(self):
+        """Arrête l'animation"""
+        if self.job is not None:
+            self.clock.cancel(self.job)
+            self.job = None
+        self.deadline = None
+        self.current_frame = None
+
+    def _tick(self):
+        """Affiche l'image courante et programme le prochain changement d'image"""
+        self.job = None
+        if self.deadline is None:
+            return
+
+        moment = self.clock.now()
+        frame = self.frame_at(moment)
+        if frame != self.current_frame:
+            self.current_frame = frame
+            self.show_frame(frame)
+
+        if frame >= self.frame_count - 1:
+            return
+
+        # Instant où l'image suivante commence
+        duration = self.deadline - self.start_time
+        next_change = self.start_time + duration * (frame + 1) / (self.frame_count - 1)
+        self.job = self.clock.call_later(next_change - moment, self._tick)
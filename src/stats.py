@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Statistiques cumulées de NightMod
+
+Les statistiques affichées dans la fenêtre principale ne sont jamais
+recalculées à partir de l'historique : des agrégats (compteurs, estimateur de
+quantile P² pour le temps de réponse, histogrammes par heure) sont mis à jour
+à chaque événement et sauvegardés sous forme compacte dans
+~/.nightmod/stats.json. Leur lecture coûte O(1) quelle que soit la taille de
+l'historique.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+from src.utils import get_config_dir
+
+logger = logging.getLogger("NightMod.Stats")
+
+# Version du format du fichier de statistiques
+STATS_VERSION = 1
+
+# Les nuits sont comptées à partir de midi : 23 h et 1 h appartiennent à la même nuit
+NIGHT_START_HOUR = 12
+
+
+def get_stats_path():
+    """Retourne le chemin du fichier de statistiques"""
+    return os.path.join(get_config_dir(), "stats.json")
+
+
+class P2Quantile:
+    """Estimation en flux d'un quantile (algorithme P² de Jain et Chlamtac)
+
+    Cinq marqueurs suffisent, quel que soit le nombre d'observations.
+    """
+
+    def __init__(self, p=0.5):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    @property
+    def count(self):
+        return self.positions[4] if len(self.heights) == 5 else len(self.heights)
+
+    def add(self, value):
+        """Ajoute une observation"""
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        # Cellule de la nouvelle observation et ajustement des extrêmes
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajustement des marqueurs intermédiaires
+        for i in range(1, 4):
+            delta = self.desired[i] - self.positions[i]
+            if ((delta >= 1 and self.positions[i + 1] - self.positions[i] > 1) or
+                    (delta <= -1 and self.positions[i - 1] - self.positions[i] < -1)):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                self.positions[i] += step
+
+    def _parabolic(self, i, step):
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, step):
+        q, n = self.heights, self.positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    def value(self):
+        """Retourne l'estimation courante (None sans observation)"""
+        heights = self.heights
+        if not heights:
+            return None
+        if len(heights) < 5:
+            return heights[min(len(heights) - 1, int(round(self.p * (len(heights) - 1))))]
+        return heights[2]
+
+    def to_dict(self):
+        return {"p": self.p, "q": self.heights, "n": self.positions, "d": self.desired}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["p"])
+        sketch.heights = list(data["q"])
+        sketch.positions = list(data["n"])
+        sketch.desired = list(data["d"])
+        return sketch
+
+
+class RunningStats:
+    """Agrégats cumulés des vérifications, mis à jour à chaque événement"""
+
+    def __init__(self, path=None):
+        """
+        Charge les agrégats sauvegardés
+
+        Args:
+            path: Fichier de statistiques (défaut: ~/.nightmod/stats.json)
+        """
+        self.path = path or get_stats_path()
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.reset()
+        self.load()
+
+    def reset(self):
+        """Remet les agrégats à zéro"""
+        self.answered = 0
+        self.timeouts = 0
+        self.actions = {}
+        self.latency = P2Quantile(0.5)
+        self.answered_by_hour = [0] * 24
+        self.asleep_by_hour = [0] * 24
+
+    def record_response(self, latency, when=None):
+        """Comptabilise une réponse au popup et son temps de réponse (secondes)"""
+        hour = time.localtime(when).tm_hour
+        with self.lock:
+            self.answered += 1
+            self.answered_by_hour[hour] += 1
+            if latency is not None:
+                self.latency.add(latency)
+            self.dirty = True
+
+    def record_timeout(self, when=None):
+        """Comptabilise une absence de réponse (heure d'endormissement)"""
+        hour = time.localtime(when).tm_hour
+        with self.lock:
+            self.timeouts += 1
+            self.asleep_by_hour[hour] += 1
+            self.dirty = True
+
+    def record_action(self, action):
+        """Comptabilise une action système exécutée"""
+        with self.lock:
+            self.actions[action] = self.actions.get(action, 0) + 1
+            self.dirty = True
+
+    def typical_sleep_hour(self):
+        """Heure d'endormissement la plus fréquente (None sans donnée)"""
+        if not self.timeouts:
+            return None
+        # Parcours dans l'ordre de la nuit pour départager les égalités
+        order = [(NIGHT_START_HOUR + offset) % 24 for offset in range(24)]
+        return max(order, key=lambda hour: self.asleep_by_hour[hour])
+
+    def summary(self):
+        """Retourne un instantané des statistiques (coût constant)"""
+        with self.lock:
+            return {
+                "checks": self.answered + self.timeouts,
+                "answered": self.answered,
+                "timeouts": self.timeouts,
+                "median_latency": self.latency.value(),
+                "actions": dict(self.actions),
+                "sleep_hour": self.typical_sleep_hour(),
+            }
+
+    def to_dict(self):
+        return {
+            "version": STATS_VERSION,
+            "answered": self.answered,
+            "timeouts": self.timeouts,
+            "actions": self.actions,
+            "latency": self.latency.to_dict(),
+            "answered_by_hour": self.answered_by_hour,
+            "asleep_by_hour": self.asleep_by_hour,
+        }
+
+    def load(self):
+        """Charge les agrégats depuis le fichier (agrégats vides s'il est absent ou invalide)"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != STATS_VERSION:
+                return
+            self.answered = data["answered"]
+            self.timeouts = data["timeouts"]
+            self.actions = dict(data["actions"])
+            self.latency = P2Quantile.from_dict(data["latency"])
+            self.answered_by_hour = list(data["answered_by_hour"])
+            self.asleep_by_hour = list(data["asleep_by_hour"])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Statistiques illisibles, remise à zéro: {e}")
+            self.reset()
+
+    def save(self):
+        """Sauvegarde les agrégats s'ils ont changé (écriture atomique)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps(self.to_dict(), separators=(',', ':'))
+            self.dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Erreur lors de la sauvegarde des statistiques: {e}")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fichier d'état de NightMod pour les barres d'état (polybar, waybar, i3status)
+
+L'état courant (surveillance active, échéance de la prochaine vérification en
+temps monotone et en horodatage Unix, popup ouvert, dernière action) est
+publié dans un enregistrement JSON de taille fixe, complété par des espaces,
+dans un fichier projeté en mémoire sous `$XDG_RUNTIME_DIR/nightmod/`.
+
+L'enregistrement n'est réécrit, en place, que lorsque l'état change : les
+lecteurs calculent eux-mêmes le compte à rebours à partir des échéances, sans
+rien coûter à l'application. Le champ `seq` est incrémenté à chaque écriture ;
+un lecteur qui obtient un JSON invalide (lecture pendant une écriture) relit
+simplement le fichier.
+
+Une seule instance publie dans un fichier donné : elle le verrouille
+(flock exclusif) avant d'y écrire, et ne supprime à la fermeture que le
+fichier qu'elle détient.
+"""
+
+import os
+import json
+import mmap
+import time
+import logging
+import threading
+
+from src.utils import get_config_dir
+
+logger = logging.getLogger("NightMod.Status")
+
+# Taille de l'enregistrement (octets, saut de ligne final compris)
+RECORD_SIZE = 512
+
+# Version du format de l'enregistrement
+STATUS_VERSION = 1
+
+# État initial publié au démarrage
+DEFAULT_STATUS = {
+    "monitoring": False,
+    "next_check_monotonic": None,
+    "next_check_wall": None,
+    "popup_open": False,
+    "popup_deadline_wall": None,
+    "last_action": None,
+    "last_action_result": None,
+    "last_action_wall": None,
+}
+
+
+def get_status_path():
+    """Retourne le chemin du fichier d'état ($XDG_RUNTIME_DIR, sinon le répertoire de configuration)
+
+    Un répertoire de configuration imposé par NIGHTMOD_CONFIG_DIR (tests,
+    bancs d'essai, instance séparée) reçoit aussi le fichier d'état.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir) and not os.environ.get("NIGHTMOD_CONFIG_DIR"):
+        return os.path.join(runtime_dir, "nightmod", "status.json")
+    return os.path.join(get_config_dir(), "status.json")
+
+
+def read_status(path=None, attempts=5):
+    """Lit le fichier d'état (pour les scripts et les tests)
+
+    Returns:
+        Le dictionnaire d'état, ou None si le fichier est absent ou illisible
+    """
+    for _ in range(attempts):
+        try:
+            with open(path or get_status_path(), 'rb') as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Lecture pendant une écriture : relire
+            time.sleep(0.001)
+    return None
+
+
+class StatusFile:
+    """Enregistrement d'état projeté en mémoire, réécrit uniquement lors d'un changement"""
+
+    def __init__(self, path=None):
+        self.path = path or get_status_path()
+        self.status = dict(DEFAULT_STATUS)
+        self.seq = 0
+        self.file = None
+        self.map = None
+        self.lock = threading.Lock()
+
+    def open(self):
+        """Crée et verrouille le fichier, le projette en mémoire et publie l'état initial
+
+        Returns:
+            False si le fichier est détenu par une autre instance de NightMod
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        file = self.acquire()
+        if file is None:
+            logger.warning(f"Fichier d'état déjà utilisé par une autre instance: {self.path}")
+            return False
+        self.file = file
+        self.file.truncate(RECORD_SIZE)
+        self.map = mmap.mmap(self.file.fileno(), RECORD_SIZE)
+        self.write()
+        logger.info(f"Fichier d'état: {self.path}")
+        return True
+
+    def acquire(self, attempts=3):
+        """Ouvre le fichier sans le tronquer et le verrouille (None s'il est déjà verrouillé)"""
+        try:
+            import fcntl
+        except ImportError:
+            # Windows : pas de verrou consultatif
+            return open(self.path, 'a+b')
+
+        for _ in range(attempts):
+            file = open(self.path, 'a+b')
+            try:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                file.close()
+                return None
+            # Le détenteur précédent a pu supprimer le fichier entre l'ouverture
+            # et le verrouillage : le verrou porte alors sur un fichier orphelin
+            try:
+                if os.stat(self.path).st_ino == os.fstat(file.fileno()).st_ino:
+                    return file
+            except FileNotFoundError:
+                pass
+            file.close()
+        return None
+
+    def update(self, **fields):
+        """Met à jour des champs de l'état ; l'enregistrement n'est réécrit que s'il change
+
+        Returns:
+            True si l'enregistrement a été réécrit
+        """
+        with self.lock:
+            changed = {key: value for key, value in fields.items() if self.status.get(key) != value}
+            if not changed or self.map is None:
+                return False
+            status = dict(self.status, **changed)
+            if not self.write(status):
+                return False
+            self.status = status
+            return True
+
+    def encode(self, status, seq):
+        record = {"version": STATUS_VERSION, "pid": os.getpid(), "seq": seq}
+        record.update(status)
+        record["updated_wall"] = round(time.time(), 3)
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+    def write(self, status=None):
+        data = self.encode(self.status if status is None else status, self.seq + 1)
+        if len(data) >= RECORD_SIZE:
+            logger.error(f"État trop volumineux pour le fichier d'état ({len(data)} octets)")
+            return False
+        # Longueur constante : l'écriture en place ne laisse jamais de reste de l'état précédent
+        self.map[:] = data.ljust(RECORD_SIZE - 1) + b"\n"
+        self.seq += 1
+        return True
+
+    def close(self):
+        """Ferme la projection et supprime le fichier détenu (NightMod ne tourne plus)"""
+        with self.lock:
+            if self.map is not None:
+                self.map.close()
+                self.map = None
+            if self.file is not None:
+                # Supprimé avant la levée du verrou : une autre instance ne
+                # peut pas l'avoir repris entre-temps
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+                self.file.close()
+                self.file = None
@@ -1,158 +1,436 @@
-import tkinter as tk
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Moteur de thèmes pour NightMod
+
+Un thème est compilé une seule fois (depuis une palette intégrée ou un fichier
+themes/*.tcl, combiné aux couleurs de la configuration) en deux fichiers mis en
+cache dans ~/.nightmod/cache :
+  - un fichier de base d'options Tk (widgets tk standard), chargé d'un seul
+    appel à option readfile ;
+  - un script Tcl qui crée et active le thème ttk, exécuté d'un seul appel à
+    source.
+
+Le changement de thème à chaud ne nécessite donc pas de reconstruire
+l'interface : les widgets ttk suivent le thème actif, les widgets tk créés
+ensuite lisent la nouvelle base d'options, et seuls les quelques widgets tk
+déjà affichés qui ont été déclarés au moteur (track) sont recolorés.
+Les styles ttk font référence aux polices nommées de src/fonts.py.
+"""
+
+import os
+import json
+import hashlib
 import logging
 
+from src.config import DEFAULT_CONFIG
+from src.fonts import font_name
+from src.utils import get_config_dir, get_theme_path
+
 logger = logging.getLogger("NightMod.Styles")
 
-def apply_custom_styles(style):
-    """Applique les styles personnalisés à l'interface.
-    
-    Cette fonction configure les styles globaux de l'application.
-    Elle devrait être appelée une seule fois au démarrage.
-    
-    Args:
-        style: L'objet ttk.Style de l'application
-    """
+# Version du format compilé (à incrémenter si la génération change)
+THEME_ENGINE_VERSION = 3
+
+# Palettes intégrées
+THEME_PALETTES = {
+    "dark": {
+        "bg": "#1a1a1a",           # Arrière-plan principal (très sombre)
+        "fg": "#FFFFFF",           # Texte (blanc)
+        "input_bg": "#333333",     # Fond des champs de saisie (gris foncé)
+        "button_bg": "#2d2d2d",    # Fond des boutons normaux (gris moyen)
+        "button_fg": "#FFFFFF",    # Texte des boutons
+        "accent": "#4CAF50",       # Couleur d'accent (vert)
+        "accent_dark": "#3C9E3C",  # Accent au survol
+        "danger": "#F44336",       # Couleur d'alerte (rouge)
+        "warning": "#FFA500",      # Avertissement (orange)
+        "disabled": "#666666",     # Couleur désactivée (gris)
+        "inactive": "#888888",     # Indicateur d'état inactif
+        "muted": "#AAAAAA",        # Texte secondaire
+        "popup_bg": "#202020",     # Fond de la fenêtre de vérification
+        "ring_bg": "#353535",      # Fond de l'indicateur circulaire
+    },
+    "light": {
+        "bg": "#F5F5F5",
+        "fg": "#212121",
+        "input_bg": "#FFFFFF",
+        "button_bg": "#E0E0E0",
+        "button_fg": "#212121",
+        "accent": "#4CAF50",
+        "accent_dark": "#388E3C",
+        "danger": "#F44336",
+        "warning": "#FB8C00",
+        "disabled": "#9E9E9E",
+        "inactive": "#9E9E9E",
+        "muted": "#616161",
+        "popup_bg": "#FAFAFA",
+        "ring_bg": "#DDDDDD",
+    },
+}
+
+# Correspondance entre les couleurs des fichiers .tcl et la palette NightMod
+TCL_COLOR_KEYS = {
+    "-bg": "bg",
+    "-fg": "fg",
+    "-darkbg": "input_bg",
+    "-lightbg": "button_bg",
+    "-accent": "accent",
+    "-accentdark": "accent_dark",
+    "-error": "danger",
+    "-warning": "warning",
+    "-disabledfg": "disabled",
+    "-darkerbg": "popup_bg",
+    "-border": "ring_bg",
+}
+
+# Couleurs de la configuration qui remplacent celles de la palette (uniquement
+# si elles diffèrent de la valeur par défaut, présente dans toute configuration)
+CONFIG_COLOR_KEYS = {
+    "button_bg_color": "button_bg",
+    "button_fg_color": "button_fg",
+    "accent_color": "accent",
+}
+
+# Classe Tk de la fenêtre de vérification (permet de la cibler dans la base d'options)
+POPUP_CLASS = "NightModPopup"
+
+# Options des widgets tk standard : (classe, ressource, clé de palette)
+OPTION_DATABASE = [
+    ("Tk", "background", "bg"),
+    ("Toplevel", "background", "bg"),
+    ("Frame", "background", "bg"),
+    ("Label", "background", "bg"),
+    ("Label", "foreground", "fg"),
+    # Boutons
+    ("Button", "background", "button_bg"),
+    ("Button", "foreground", "button_fg"),
+    ("Button", "activeBackground", "accent"),
+    ("Button", "activeForeground", "button_fg"),
+    ("Button", "relief", None),
+    # Entrées
+    ("Entry", "background", "input_bg"),
+    ("Entry", "foreground", "fg"),
+    ("Entry", "insertBackground", "fg"),
+    ("Entry", "selectBackground", "accent"),
+    ("Entry", "selectForeground", "fg"),
+    ("Entry", "relief", None),
+    # Spinbox
+    ("Spinbox", "background", "input_bg"),
+    ("Spinbox", "foreground", "fg"),
+    ("Spinbox", "buttonBackground", "button_bg"),
+    ("Spinbox", "relief", None),
+    # Cases à cocher
+    ("Checkbutton", "background", "bg"),
+    ("Checkbutton", "foreground", "fg"),
+    ("Checkbutton", "activeBackground", "bg"),
+    ("Checkbutton", "activeForeground", "fg"),
+    ("Checkbutton", "selectColor", "input_bg"),
+    # Menus déroulants (tk.OptionMenu est un Menubutton)
+    ("Menubutton", "background", "input_bg"),
+    ("Menubutton", "foreground", "fg"),
+    ("Menubutton", "activeBackground", "accent"),
+    ("Menubutton", "activeForeground", "fg"),
+    # Popups des menus
+    ("Menu", "background", "input_bg"),
+    ("Menu", "foreground", "fg"),
+    ("Menu", "activeBackground", "accent"),
+    ("Menu", "activeForeground", "fg"),
+    ("Menu", "relief", None),
+    # Éléments de liste
+    ("Listbox", "background", "input_bg"),
+    ("Listbox", "foreground", "fg"),
+    ("Listbox", "selectBackground", "accent"),
+    ("Listbox", "selectForeground", "fg"),
+    # Zone de texte
+    ("Text", "background", "input_bg"),
+    ("Text", "foreground", "fg"),
+    ("Text", "selectBackground", "accent"),
+    ("Text", "selectForeground", "fg"),
+    # Fenêtre de vérification
+    (POPUP_CLASS, "background", "popup_bg"),
+    (f"{POPUP_CLASS}*Canvas", "background", "popup_bg"),
+]
+
+# Valeurs fixes (sans clé de palette) de la base d'options
+OPTION_CONSTANTS = {
+    "relief": "flat",
+}
+
+def _tcl_quote(value):
+    """Protège une valeur pour l'insérer dans un script Tcl"""
+    return "{" + str(value) + "}"
+
+
+def available_themes():
+    """Retourne la liste des thèmes utilisables dans la configuration"""
+    themes = list(THEME_PALETTES)
+    themes_dir = os.path.dirname(get_theme_path())
     try:
-        # Récupérer l'objet root (fenêtre principale)
-        root = style.master
-        
-        # --- Configuration des couleurs ---
-        BG_COLOR = "#1a1a1a"        # Arrière-plan principal (très sombre)
-        FG_COLOR = "#FFFFFF"        # Texte (blanc)
-        INPUT_BG = "#333333"        # Fond des champs de saisie (gris foncé)
-        BUTTON_BG = "#2d2d2d"       # Fond des boutons normaux (gris moyen)
-        PRIMARY_COLOR = "#4CAF50"   # Couleur d'accent (vert)
-        DANGER_COLOR = "#F44336"    # Couleur d'alerte (rouge)
-        DISABLED_COLOR = "#666666"  # Couleur désactivée (gris)
-        
-        # --- Configuration globale ---
-        
-        # Styles pour les widgets standard (tk)
-        # Ces configurations s'appliquent à tous les widgets, même ceux créés après cette fonction
-        
-        # Boutons
-        root.option_add("*Button.background", BUTTON_BG)
-        root.option_add("*Button.foreground", FG_COLOR)
-        root.option_add("*Button.activeBackground", PRIMARY_COLOR)
-        root.option_add("*Button.activeForeground", FG_COLOR)
-        root.option_add("*Button.relief", "flat")
-        
-        # Entrées
-        root.option_add("*Entry.background", INPUT_BG)
-        root.option_add("*Entry.foreground", FG_COLOR)
-        root.option_add("*Entry.insertBackground", FG_COLOR)  # Curseur
-        root.option_add("*Entry.selectBackground", PRIMARY_COLOR)
-        root.option_add("*Entry.selectForeground", FG_COLOR)
-        root.option_add("*Entry.relief", "flat")
-        
-        # Spinbox
-        root.option_add("*Spinbox.background", INPUT_BG)
-        root.option_add("*Spinbox.foreground", FG_COLOR)
-        root.option_add("*Spinbox.buttonBackground", BUTTON_BG)
-        root.option_add("*Spinbox.relief", "flat")
-        
-        # Cases à cocher
-        root.option_add("*Checkbutton.background", BG_COLOR)
-        root.option_add("*Checkbutton.foreground", FG_COLOR)
-        root.option_add("*Checkbutton.activeBackground", BG_COLOR)
-        root.option_add("*Checkbutton.activeForeground", FG_COLOR)
-        root.option_add("*Checkbutton.selectColor", INPUT_BG)
-        
-        # Menus déroulants
-        root.option_add("*OptionMenu.background", INPUT_BG)
-        root.option_add("*OptionMenu.foreground", FG_COLOR)
-        root.option_add("*OptionMenu.activeBackground", PRIMARY_COLOR)
-        root.option_add("*OptionMenu.activeForeground", FG_COLOR)
-        
-        # Popups des menus
-        root.option_add("*Menu.background", INPUT_BG)
-        root.option_add("*Menu.foreground", FG_COLOR)
-        root.option_add("*Menu.activeBackground", PRIMARY_COLOR)
-        root.option_add("*Menu.activeForeground", FG_COLOR)
-        root.option_add("*Menu.relief", "flat")
-        
-        # Éléments de liste
-        root.option_add("*Listbox.background", INPUT_BG)
-        root.option_add("*Listbox.foreground", FG_COLOR)
-        root.option_add("*Listbox.selectBackground", PRIMARY_COLOR)
-        root.option_add("*Listbox.selectForeground", FG_COLOR)
-        
-        # Zone de texte
-        root.option_add("*Text.background", INPUT_BG)
-        root.option_add("*Text.foreground", FG_COLOR)
-        root.option_add("*Text.selectBackground", PRIMARY_COLOR)
-        root.option_add("*Text.selectForeground", FG_COLOR)
-        
-        # --- Configuration des styles ttk ---
-        # Pour les widgets ttk qui pourraient encore être utilisés
-        
-        # Frames
-        style.configure("TFrame", background=BG_COLOR)
-        
-        # Labels
-        style.configure("TLabel", 
-                       background=BG_COLOR, 
-                       foreground=FG_COLOR)
-        
-        # Boutons
-        style.configure("TButton", 
-                       background=BUTTON_BG, 
-                       foreground=FG_COLOR)
-        
-        style.configure("Accent.TButton", 
-                       background=PRIMARY_COLOR, 
-                       foreground=FG_COLOR)
-        
-        # Configuration maximale des widgets d'entrée
-        style.configure("TEntry", 
-                       foreground=FG_COLOR,
-                       fieldbackground=INPUT_BG,
-                       insertcolor=FG_COLOR)
-        
-        style.configure("TCombobox", 
-                       foreground=FG_COLOR,
-                       fieldbackground=INPUT_BG,
-                       selectbackground=PRIMARY_COLOR,
-                       selectforeground=FG_COLOR)
-        
-        # Configuration spéciale pour la fenêtre de popup
-        style.configure("Wake.TButton", 
-                        background=PRIMARY_COLOR, 
-                        foreground=FG_COLOR, 
-                        font=("Segoe UI", 12, "bold"),
-                        padding=(12, 10))
-        
-        # Fonction utilitaire pour personnaliser un widget après sa création
-        def fix_widget_colors(widget):
-            """Applique manuellement les couleurs à un widget spécifique.
-            Utile pour les cas où les options globales ne suffisent pas."""
-            widget_type = widget.winfo_class()
-            
-            if widget_type == "Button":
-                widget.config(bg=BUTTON_BG, fg=FG_COLOR, 
-                             activebackground=PRIMARY_COLOR, activeforeground=FG_COLOR)
-            
-            elif widget_type == "Entry":
-                widget.config(bg=INPUT_BG, fg=FG_COLOR, insertbackground=FG_COLOR)
-            
-            elif widget_type == "Checkbutton":
-                widget.config(bg=BG_COLOR, fg=FG_COLOR, selectcolor=INPUT_BG,
-                             activebackground=BG_COLOR, activeforeground=FG_COLOR)
-            
-            elif widget_type in ["Menu", "Menubutton"]:
-                widget.config(bg=INPUT_BG, fg=FG_COLOR,
-                             activebackground=PRIMARY_COLOR, activeforeground=FG_COLOR)
-            
-            # Récursion pour les conteneurs
-            if widget_type in ["Frame", "Toplevel", "LabelFrame"]:
-                widget.config(bg=BG_COLOR)
-                for child in widget.winfo_children():
-                    fix_widget_colors(child)
-        
-        # Exposer la fonction utilitaire au niveau global pour pouvoir l'utiliser ailleurs
-        apply_custom_styles.fix_widget_colors = fix_widget_colors
-        
-        logger.info("Styles personnalisés appliqués avec succès")
-    except Exception as e:
-        logger.error(f"Erreur lors de l'application des styles personnalisés: {e}")     
-        
\ No newline at end of file
+        for filename in sorted(os.listdir(themes_dir)):
+            if filename.endswith(".tcl"):
+                themes.append(filename[:-4])
+    except OSError:
+        pass
+    return themes
+
+
+def get_palette(widget=None):
+    """Retourne la palette du thème actif de l'application de ce widget"""
+    if widget is not None:
+        try:
+            engine = getattr(widget.nametowidget("."), "theme", None)
+            if engine is not None and engine.palette:
+                return engine.palette
+        except Exception:
+            pass
+    return THEME_PALETTES["dark"]
+
+
+class CompiledTheme:
+    """Résultat de la compilation d'un thème (fichiers en cache et palette)"""
+
+    def __init__(self, name, key, ttk_theme, palette, option_file, script_file):
+        self.name = name
+        self.key = key
+        self.ttk_theme = ttk_theme
+        self.palette = palette
+        self.option_file = option_file
+        self.script_file = script_file
+
+
+class ThemeEngine:
+    """Compile les thèmes, les met en cache et les applique à l'application"""
+
+    def __init__(self, root, cache_dir=None):
+        """
+        Initialise le moteur de thèmes
+
+        Args:
+            root: La fenêtre racine Tk
+            cache_dir: Répertoire du cache (par défaut ~/.nightmod/cache)
+        """
+        self.root = root
+        self.cache_dir = cache_dir or os.path.join(get_config_dir(), "cache")
+        self.current = None
+        self._compiled = {}
+        self._tracked = []
+
+    @property
+    def palette(self):
+        """Palette du thème actif"""
+        return self.current.palette if self.current else None
+
+    def compile(self, config):
+        """Compile le thème décrit par la configuration (ou le relit depuis le cache)"""
+        theme_name = config.get("ui_theme", "dark")
+        tcl_path = None
+        tcl_source = b""
+
+        if theme_name not in THEME_PALETTES:
+            tcl_path = get_theme_path(f"{theme_name}.tcl")
+            try:
+                with open(tcl_path, 'rb') as f:
+                    tcl_source = f.read()
+            except OSError as e:
+                logger.warning(f"Thème '{theme_name}' introuvable, utilisation du thème sombre: {e}")
+                theme_name, tcl_path = "dark", None
+
+        overrides = {
+            palette_key: config[config_key]
+            for config_key, palette_key in CONFIG_COLOR_KEYS.items()
+            if config.get(config_key) and config[config_key] != DEFAULT_CONFIG.get(config_key)
+        }
+
+        digest = hashlib.sha1()
+        digest.update(json.dumps([THEME_ENGINE_VERSION, theme_name, overrides], sort_keys=True).encode())
+        digest.update(tcl_source)
+        key = digest.hexdigest()[:16]
+
+        # Les fichiers d'un thème déjà compilé ont pu être supprimés depuis
+        # (compilation d'un autre thème) : il est alors recompilé
+        compiled = self._compiled.get(key)
+        if compiled is not None and os.path.exists(compiled.option_file) \
+                and os.path.exists(compiled.script_file):
+            return compiled
+
+        base = os.path.join(self.cache_dir, f"theme-{key}")
+        option_file, script_file, palette_file = f"{base}.opt", f"{base}.tcl", f"{base}.json"
+        ttk_theme = theme_name if tcl_path else f"nightmod-{theme_name}-{key[:8]}"
+
+        palette = None
+        if os.path.exists(option_file) and os.path.exists(script_file):
+            try:
+                with open(palette_file, 'r') as f:
+                    palette = json.load(f)
+            except (OSError, ValueError):
+                palette = None
+
+        if palette is None:
+            palette = dict(THEME_PALETTES["dark"])
+            if tcl_path:
+                palette.update(self._read_tcl_palette(tcl_path, theme_name))
+            else:
+                palette.update(THEME_PALETTES[theme_name])
+            palette.update(overrides)
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write_atomic(option_file, self._build_option_file(palette))
+            self._write_atomic(script_file, self._build_script(palette, ttk_theme, tcl_path, theme_name))
+            self._write_atomic(palette_file, json.dumps(palette))
+            self._prune_cache(key)
+            logger.info(f"Thème '{theme_name}' compilé ({key})")
+
+        compiled = CompiledTheme(theme_name, key, ttk_theme, palette, option_file, script_file)
+        self._compiled[key] = compiled
+        return compiled
+
+    def apply(self, config):
+        """Applique le thème décrit par la configuration"""
+        try:
+            compiled = self.compile(config)
+            if self.current is not None and compiled.key == self.current.key:
+                return compiled
+
+            # Une seule lecture de la base d'options et un seul script Tcl
+            self.root.option_clear()
+            self.root.option_readfile(compiled.option_file, "widgetDefault")
+            self.root.tk.call("source", compiled.script_file)
+            self._restyle_tracked(compiled.palette)
+
+            self.current = compiled
+            logger.info(f"Thème '{compiled.name}' appliqué")
+            return compiled
+        except Exception as e:
+            logger.error(f"Erreur lors de l'application du thème: {e}")
+            return None
+
+    def track(self, *widgets):
+        """Déclare des widgets tk à recolorer lors d'un changement de thème
+
+        Les widgets ttk et les widgets créés après le changement n'ont pas
+        besoin d'être déclarés.
+        """
+        self._tracked.extend(widgets)
+
+    def _restyle_tracked(self, palette):
+        """Applique la palette aux widgets déclarés encore affichés"""
+        self._tracked = [widget for widget in self._tracked if widget.winfo_exists()]
+        for widget in [self.root] + self._tracked:
+            self._restyle(widget, palette)
+
+    def _restyle(self, widget, palette):
+        """Applique à un widget tk les options de sa classe"""
+        widget_class = widget.winfo_class()
+        options = {
+            resource.lower(): palette[palette_key] if palette_key else OPTION_CONSTANTS[resource]
+            for option_class, resource, palette_key in OPTION_DATABASE
+            if option_class == widget_class
+        }
+        if options:
+            widget.configure(**options)
+        # Le menu d'un tk.OptionMenu suit son bouton
+        if widget_class == "Menubutton" and widget.cget("menu"):
+            self._restyle(widget.nametowidget(widget.cget("menu")), palette)
+
+    def _prune_cache(self, key):
+        """Supprime les thèmes compilés d'une autre clé"""
+        try:
+            filenames = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for filename in filenames:
+            if filename.startswith("theme-") and not filename.startswith(f"theme-{key}."):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    pass
+
+    def _read_tcl_palette(self, tcl_path, theme_name):
+        """Extrait les couleurs d'un fichier de thème .tcl sans charger Tk"""
+        import tkinter
+
+        interp = tkinter.Tcl()
+        interp.call("source", tcl_path)
+        raw = interp.call("array", "get", f"ttk::theme::{theme_name}::colors")
+        values = interp.splitlist(raw)
+        colors = dict(zip(values[::2], values[1::2]))
+
+        return {
+            palette_key: str(colors[tcl_key])
+            for tcl_key, palette_key in TCL_COLOR_KEYS.items()
+            if tcl_key in colors
+        }
+
+    def _build_option_file(self, palette):
+        """Génère le contenu du fichier de base d'options Tk"""
+        lines = [f"! Thème NightMod compilé (moteur v{THEME_ENGINE_VERSION})"]
+        for widget_class, resource, palette_key in OPTION_DATABASE:
+            value = palette[palette_key] if palette_key else OPTION_CONSTANTS[resource]
+            lines.append(f"*{widget_class}.{resource}: {value}")
+        return "\n".join(lines) + "\n"
+
+    def _build_script(self, palette, ttk_theme, tcl_path, theme_name):
+        """Génère le script Tcl qui crée, complète et active le thème ttk"""
+        p = palette
+        styles = [
+            f"ttk::style configure TFrame -background {p['bg']}",
+            f"ttk::style configure TLabel -background {p['bg']} -foreground {p['fg']}",
+            f"ttk::style configure TButton -background {p['button_bg']} -foreground {p['button_fg']}",
+            f"ttk::style configure Accent.TButton -background {p['accent']} -foreground {p['button_fg']}",
+            f"ttk::style configure TEntry -foreground {p['fg']} -fieldbackground {p['input_bg']} "
+            f"-insertcolor {p['fg']}",
+            f"ttk::style configure TCombobox -foreground {p['fg']} -fieldbackground {p['input_bg']} "
+            f"-selectbackground {p['accent']} -selectforeground {p['fg']}",
+            f"ttk::style configure TSeparator -background {p['ring_bg']}",
+            # Fenêtre de vérification
+            f"ttk::style configure Dark.TFrame -background {p['popup_bg']}",
+            f"ttk::style configure Dark.TLabel -background {p['popup_bg']} -foreground {p['fg']}",
+            f"ttk::style configure Title.TLabel -background {p['popup_bg']} -foreground {p['fg']} "
+            f"-font {font_name('title')}",
+            f"ttk::style configure Time.TLabel -background {p['popup_bg']} -foreground {p['accent']} "
+            f"-font {font_name('countdown')}",
+            f"ttk::style configure Info.TLabel -background {p['popup_bg']} -foreground {p['muted']} "
+            f"-font {font_name('info')}",
+            f"ttk::style configure Wake.TButton -background {p['accent']} -foreground {p['button_fg']} "
+            f"-font {font_name('button')} -padding {{12 10}}",
+            f"ttk::style map Wake.TButton "
+            f"-background [list pressed {p['accent_dark']} active {p['accent_dark']}] "
+            f"-foreground [list pressed {p['button_fg']} active {p['button_fg']}]",
+        ]
+        app_styles = "\n    ".join(styles)
+
+        script = [f"# Thème NightMod compilé (moteur v{THEME_ENGINE_VERSION})"]
+        if tcl_path:
+            # Thème fourni par un fichier .tcl : le charger une seule fois par
+            # interpréteur, en lui indiquant son répertoire (info script désigne
+            # ici le script du cache)
+            script.append(
+                f"if {{[info procs ::ttk::theme::{theme_name}::set_theme] eq \"\"}} {{\n"
+                f"    namespace eval ::ttk::theme::{theme_name} "
+                f"{{variable theme_dir {_tcl_quote(os.path.dirname(os.path.abspath(tcl_path)))}}}\n"
+                f"    source {_tcl_quote(tcl_path)}\n"
+                f"}}"
+            )
+            settings = f"ttk::theme::{theme_name}::set_theme"
+            parent = "default"
+        else:
+            settings = ""
+            parent = "clam"
+
+        script.append(
+            f"if {{[lsearch -exact [ttk::style theme names] {ttk_theme}] < 0}} {{\n"
+            f"    ttk::style theme create {ttk_theme} -parent {parent} -settings {{{settings}}}\n"
+            f"}}"
+        )
+        script.append(f"ttk::style theme settings {ttk_theme} {{\n    {app_styles}\n}}")
+        script.append(f"ttk::style theme use {ttk_theme}")
+        return "\n".join(script) + "\n"
+
+    @staticmethod
+    def _write_atomic(path, content):
+        """Écrit un fichier du cache de façon atomique"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
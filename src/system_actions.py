@@ -11,12 +11,29 @@ import platform
 import logging
 import subprocess
 
+from src import tracing
+
 # Obtenir le logger
 logger = logging.getLogger("NightMod.SystemActions")
 
 class SystemActions:
     """Classe utilitaire pour les actions système (extinction, veille, etc.)"""
     
+    @staticmethod
+    def run_command(command):
+        """Exécute une commande (tentative tracée) et lève une exception en cas d'échec"""
+        with tracing.span("actions.attempt", command=" ".join(command)):
+            subprocess.run(command, check=True)
+    
+    @staticmethod
+    def run_shell(command):
+        """Exécute une commande shell (tentative tracée) et retourne son code de retour"""
+        with tracing.span("actions.attempt", command=command) as span:
+            status = os.system(command)
+            if span is not None:
+                span.args["status"] = status
+            return status
+    
     @staticmethod
     def shutdown():
         """Éteint l'ordinateur"""
@@ -24,11 +41,11 @@ class SystemActions:
         
         try:
             if platform.system() == "Windows":
-                os.system("shutdown /s /t 10 /c \"NightMod: Extinction automatique\"")
+                SystemActions.run_shell("shutdown /s /t 10 /c \"NightMod: Extinction automatique\"")
             elif platform.system() == "Darwin":  # macOS
-                os.system("osascript -e 'tell app \"System Events\" to shut down'")
+                SystemActions.run_shell("osascript -e 'tell app \"System Events\" to shut down'")
             else:  # Linux et autres Unix
-                os.system("shutdown -h now")
+                SystemActions.run_shell("shutdown -h now")
             return True
         except Exception as e:
             logger.error(f"Erreur lors de l'extinction: {e}")
@@ -41,18 +58,18 @@ class SystemActions:
         
         try:
             if platform.system() == "Windows":
-                os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+                SystemActions.run_shell("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
             elif platform.system() == "Darwin":  # macOS
-                os.system("pmset sleepnow")
+                SystemActions.run_shell("pmset sleepnow")
             else:  # Linux
                 # Essayer plusieurs méthodes car cela peut varier selon les distributions
                 try:
-                    subprocess.run(["systemctl", "suspend"], check=True)
+                    SystemActions.run_command(["systemctl", "suspend"])
                 except:
                     try:
-                        subprocess.run(["pm-suspend"], check=True)
+                        SystemActions.run_command(["pm-suspend"])
                     except:
-                        os.system("echo mem > /sys/power/state")
+                        SystemActions.run_shell("echo mem > /sys/power/state")
             return True
         except Exception as e:
             logger.error(f"Erreur lors de la mise en veille: {e}")
@@ -65,9 +82,9 @@ class SystemActions:
         
         try:
             if platform.system() == "Windows":
-                os.system("rundll32.exe user32.dll,LockWorkStation")
+                SystemActions.run_shell("rundll32.exe user32.dll,LockWorkStation")
             elif platform.system() == "Darwin":  # macOS
-                os.system("pmset displaysleepnow")
+                SystemActions.run_shell("pmset displaysleepnow")
             else:  # Linux
                 # Essayer plusieurs méthodes car cela peut varier selon les distributions et environnements de bureau
                 methods = [
@@ -80,13 +97,13 @@ class SystemActions:
                 
                 for method in methods:
                     try:
-                        subprocess.run(method, check=True)
+                        SystemActions.run_command(method)
                         return True
                     except:
                         continue
                 
                 logger.warning("Aucune méthode de verrouillage d'écran n'a fonctionné. Essai de mise en veille de l'écran.")
-                os.system("xset dpms force off")
+                SystemActions.run_shell("xset dpms force off")
             return True
         except Exception as e:
             logger.error(f"Erreur lors du verrouillage: {e}")
@@ -102,7 +119,8 @@ class SystemActions:
         }
         
         if action in actions:
-            return actions[action]()
+            with tracing.span("actions.perform", action=action):
+                return actions[action]()
         else:
             logger.error(f"Action non reconnue: {action}")
             return False
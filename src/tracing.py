@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Traçage léger du chemin critique de NightMod
+
+Des intervalles (« spans ») horodatés sur l'horloge monotone sont enregistrés
+de l'échéance d'une vérification jusqu'à l'exécution de l'action : retard du
+planificateur, construction du popup (style, centrage, son, widgets), premier
+tick du compte à rebours, réponse ou absence de réponse, et chaque tentative
+des méthodes de repli de SystemActions.
+
+Les événements sont conservés dans un tampon circulaire en mémoire et
+exportés au format Chrome Trace (chrome://tracing, Perfetto) à la demande
+(signal SIGUSR1 sous Unix, ou dump()) et à la fermeture. Désactivé, le
+traçage se réduit à un test et à un gestionnaire de contexte vide.
+"""
+
+import os
+import json
+import time
+import atexit
+import signal
+import logging
+import threading
+import contextlib
+from collections import deque
+
+from src.utils import get_config_dir
+
+logger = logging.getLogger("NightMod.Tracing")
+
+# Nombre d'événements conservés par défaut
+TRACE_CAPACITY = 10000
+
+# Tampon des événements : (phase, nom, début, durée, thread, arguments), None si désactivé
+_buffer = None
+_dump_on_exit = False
+
+# Gestionnaire de contexte partagé lorsque le traçage est désactivé
+_NO_SPAN = contextlib.nullcontext()
+
+
+def get_trace_dir():
+    """Retourne le répertoire des traces exportées"""
+    return os.path.join(get_config_dir(), "traces")
+
+
+def enable(capacity=TRACE_CAPACITY, dump_on_exit=True):
+    """Active le traçage
+
+    Args:
+        capacity: Nombre d'événements conservés (les plus anciens sont écrasés)
+        dump_on_exit: Exporter la trace à la fermeture de l'application
+    """
+    global _buffer, _dump_on_exit
+    if _buffer is None or _buffer.maxlen != capacity:
+        _buffer = deque(_buffer or (), maxlen=capacity)
+    if dump_on_exit and not _dump_on_exit:
+        atexit.register(_dump_at_exit)
+    _dump_on_exit = _dump_on_exit or dump_on_exit
+    logger.info(f"Traçage activé ({capacity} événements)")
+
+
+def disable():
+    """Désactive le traçage et libère le tampon"""
+    global _buffer, _dump_on_exit
+    _buffer = None
+    if _dump_on_exit:
+        atexit.unregister(_dump_at_exit)
+        _dump_on_exit = False
+
+
+def is_enabled():
+    return _buffer is not None
+
+
+class _Span:
+    """Intervalle mesuré par un bloc `with`"""
+
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.monotonic()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        complete(self.name, self.start, end, **self.args)
+        return False
+
+
+def span(name, **args):
+    """Mesure la durée d'un bloc : `with tracing.span("popup.style"): ...`"""
+    if _buffer is None:
+        return _NO_SPAN
+    return _Span(name, args)
+
+
+def complete(name, start, end, **args):
+    """Enregistre un intervalle dont les instants (horloge monotone) sont déjà connus"""
+    buffer = _buffer
+    if buffer is not None:
+        buffer.append(("X", name, start, max(0.0, end - start), threading.get_ident(), args))
+
+
+def instant(name, **args):
+    """Enregistre un événement ponctuel"""
+    buffer = _buffer
+    if buffer is not None:
+        buffer.append(("i", name, time.monotonic(), 0.0, threading.get_ident(), args))
+
+
+def snapshot():
+    """Retourne une copie des événements enregistrés"""
+    buffer = _buffer
+    return list(buffer) if buffer is not None else []
+
+
+def to_chrome_trace(events=None):
+    """Convertit les événements au format Chrome Trace (horodatages en microsecondes)"""
+    pid = os.getpid()
+    threads = {thread.ident: thread.name for thread in threading.enumerate()}
+    trace_events = []
+
+    for phase, name, start, duration, tid, args in snapshot() if events is None else events:
+        event = {"name": name, "cat": name.split(".", 1)[0], "ph": phase,
+                 "ts": round(start * 1e6, 1), "pid": pid, "tid": tid}
+        if phase == "X":
+            event["dur"] = round(duration * 1e6, 1)
+        else:
+            event["s"] = "t"
+        if args:
+            event["args"] = args
+        trace_events.append(event)
+
+    # Noms des threads pour l'affichage
+    for tid in sorted({event["tid"] for event in trace_events}):
+        trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                             "args": {"name": threads.get(tid, str(tid))}})
+
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def dump(path=None):
+    """Exporte les événements en JSON Chrome Trace
+
+    Args:
+        path: Fichier de sortie (défaut: ~/.nightmod/traces/nightmod-trace-<date>.json)
+
+    Returns:
+        Le chemin du fichier écrit, ou None si le traçage est désactivé
+    """
+    if _buffer is None:
+        return None
+    if path is None:
+        os.makedirs(get_trace_dir(), exist_ok=True)
+        path = os.path.join(get_trace_dir(), time.strftime("nightmod-trace-%Y%m%d-%H%M%S.json"))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(to_chrome_trace(), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    logger.info(f"Trace exportée: {path}")
+    return path
+
+
+def install_dump_signal():
+    """Exporte la trace à la réception de SIGUSR1 (Unix, thread principal uniquement)"""
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    signal.signal(signal.SIGUSR1, lambda signum, frame: dump_safely())
+    return True
+
+
+def dump_safely():
+    """Exporte la trace si le traçage est actif, en journalisant les erreurs"""
+    if _buffer is None:
+        return
+    try:
+        dump()
+    except OSError as e:
+        logger.error(f"Erreur lors de l'export de la trace: {e}")
+
+
+def _dump_at_exit():
+    if _buffer:
+        dump_safely()
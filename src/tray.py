@@ -13,6 +13,195 @@ import platform
 # Obtenir le logger
 logger = logging.getLogger("NightMod.Tray")
 
+# Taille réelle (en pixels) des icônes affichées par chaque backend de pystray
+BACKEND_ICON_SIZES = {
+    "_win32": 16,
+    "_xorg": 24,
+    "_appindicator": 22,
+    "_gtk": 22,
+    "_darwin": 22,
+}
+
+
+def get_backend_icon_size(backend):
+    """Retourne la taille d'icône utilisée par le backend de pystray"""
+    if backend == "_win32":
+        try:
+            import ctypes
+            # SM_CXSMICON : largeur des petites icônes (tient compte du DPI)
+            size = ctypes.windll.user32.GetSystemMetrics(49)
+            if size > 0:
+                return size
+        except Exception:
+            pass
+    return BACKEND_ICON_SIZES.get(backend, 32)
+
+
+def prepare_icon_image(image, size):
+    """Réduit une image une seule fois à la taille d'affichage, en RGBA"""
+    from PIL import Image
+
+    prepared = image.convert('RGBA')
+    if prepared.size != (size, size):
+        prepared = prepared.resize((size, size), Image.LANCZOS)
+    return prepared
+
+
+class IconSwapper:
+    """Échange l'image de l'icône (méthode générique : affectation d'une image déjà réduite)"""
+
+    def __init__(self, tray_icon):
+        self.tray_icon = tray_icon
+
+    def prepare(self, images):
+        """Prépare une poignée d'icône pour chaque état"""
+        return dict(images)
+
+    def swap(self, handle):
+        """Affiche la poignée préparée"""
+        self.tray_icon.icon = handle
+
+    def close(self):
+        """Libère les ressources préparées"""
+
+
+class Win32IconSwapper(IconSwapper):
+    """Échange des HICON chargés une seule fois (évite la sérialisation ICO à chaque état)
+
+    Les HICON préparés appartiennent à l'échangeur et sont détruits par close().
+    Ils ne sont jamais placés dans le champ _icon_handle de pystray : celui-ci
+    détruit la poignée qui s'y trouve lors d'un échange générique et à la
+    destruction de l'icône.
+    """
+
+    def __init__(self, tray_icon):
+        super().__init__(tray_icon)
+        self.handles = []
+
+    def prepare(self, images):
+        from pystray._util import serialized_image, win32
+
+        handles = {}
+        for state, image in images.items():
+            with serialized_image(image, 'ICO') as icon_path:
+                hicon = win32.LoadImage(
+                    None, icon_path, win32.IMAGE_ICON, 0, 0,
+                    win32.LR_DEFAULTSIZE | win32.LR_LOADFROMFILE)
+            self.handles.append(hicon)
+            handles[state] = (image, hicon)
+        return handles
+
+    def swap(self, handle):
+        from pystray._util import win32
+
+        image, hicon = handle
+        icon = self.tray_icon
+        # Libérer la poignée chargée par pystray : s'il doit réafficher l'icône
+        # (redémarrage de l'explorateur), il en chargera une nouvelle depuis _icon
+        icon._release_icon()
+        icon._icon = image
+        if icon.visible:
+            icon._message(win32.NIM_MODIFY, win32.NIF_ICON, hIcon=hicon)
+        icon._icon_valid = True
+
+    def close(self):
+        from pystray._util import win32
+
+        for hicon in self.handles:
+            win32.DestroyIcon(hicon)
+        self.handles = []
+
+
+class GtkIconSwapper(IconSwapper):
+    """Échange des fichiers PNG écrits une seule fois (évite la réécriture à chaque état)"""
+
+    def prepare(self, images):
+        import tempfile
+
+        if not getattr(self, "cache_dir", None):
+            self.cache_dir = tempfile.mkdtemp(prefix="nightmod-tray-")
+        handles = {}
+        for state, image in images.items():
+            path = os.path.join(self.cache_dir, f"icon-{state}.png")
+            image.save(path, 'PNG')
+            handles[state] = (image, path)
+        return handles
+
+    def swap(self, handle):
+        from gi.repository import GLib
+
+        image, path = handle
+        icon = self.tray_icon
+        icon._icon = image
+        if not icon.visible:
+            return
+        if hasattr(icon, "_appindicator"):
+            GLib.idle_add(icon._appindicator.set_icon, path)
+        else:
+            GLib.idle_add(icon._status_icon.set_from_file, path)
+        icon._icon_valid = True
+
+    def close(self):
+        import shutil
+
+        if getattr(self, "cache_dir", None):
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+class SafeIconSwapper(IconSwapper):
+    """Utilise un échangeur natif et revient à la méthode générique en cas d'échec"""
+
+    def __init__(self, tray_icon, native):
+        super().__init__(tray_icon)
+        self.native = native
+        self.fallback = None
+
+    def prepare(self, images):
+        generic = super().prepare(images)
+        try:
+            native = self.native.prepare(images)
+        except Exception as e:
+            logger.warning(f"Pré-encodage natif de l'icône impossible, méthode générique utilisée: {e}")
+            self.native.close()
+            self.native = None
+            native = {}
+        return {state: (native.get(state), generic[state]) for state in images}
+
+    def swap(self, handle):
+        native_handle, image = handle
+        if self.native is not None and native_handle is not None:
+            try:
+                self.native.swap(native_handle)
+                return
+            except Exception as e:
+                logger.warning(f"Échange natif de l'icône impossible, méthode générique utilisée: {e}")
+                # Les poignées déjà préparées restent à libérer par close()
+                self.fallback = self.native
+                self.native = None
+        super().swap(image)
+
+    def close(self):
+        for swapper in (self.native, self.fallback):
+            if swapper is not None:
+                swapper.close()
+
+
+# Échangeurs natifs disponibles selon le backend de pystray
+NATIVE_SWAPPERS = {
+    "_win32": Win32IconSwapper,
+    "_appindicator": GtkIconSwapper,
+    "_gtk": GtkIconSwapper,
+}
+
+
+def create_icon_swapper(tray_icon, backend):
+    """Crée l'échangeur d'icône adapté au backend de pystray"""
+    swapper_class = NATIVE_SWAPPERS.get(backend)
+    if swapper_class is None:
+        return IconSwapper(tray_icon)
+    return SafeIconSwapper(tray_icon, swapper_class(tray_icon))
+
+
 class TrayIcon:
     """Gère l'icône dans la barre des tâches (si disponible)"""
     
@@ -32,6 +221,9 @@ class TrayIcon:
         self.quit_callback = quit_callback
         self.tray_icon = None
         self.is_running = False
+        self.current_state = None
+        self.animator = None
+        self.prepared_frames = None
     
     def setup(self):
         """Configure l'icône dans la barre des tâches si les dépendances sont disponibles"""
@@ -53,11 +245,13 @@ class TrayIcon:
                 # Créer une icône de secours plus élégante
                 icon_image = self.create_default_icon(is_active=False)
             
-            # Enregistrer les images d'état
-            self.active_icon = icon_image
-            
-            # Créer une version désactivée de l'icône
-            self.inactive_icon = self.create_grayscale_version(icon_image)
+            # Préparer une seule fois les images d'état à la taille réelle du backend
+            # (l'image source en pleine résolution n'est pas conservée)
+            self.backend = pystray.Icon.__module__.rsplit(".", 1)[-1]
+            self.icon_size = get_backend_icon_size(self.backend)
+            self.active_icon = prepare_icon_image(icon_image, self.icon_size)
+            self.inactive_icon = self.create_grayscale_version(self.active_icon)
+            icon_image.close()
             
             # Définir le menu avec libellés plus clairs
             menu = pystray.Menu(
@@ -67,8 +261,20 @@ class TrayIcon:
                 pystray.MenuItem("Quitter", self.quit_callback)
             )
             
-            # Créer l'icône
-            self.tray_icon = pystray.Icon("nightmod", icon_image, "NightMod (inactif)", menu)
+            # Créer l'icône (état initial : surveillance inactive)
+            self.tray_icon = pystray.Icon("nightmod", self.inactive_icon, "NightMod (inactif)", menu)
+            
+            # Pré-encoder les images d'état dans le format natif du backend
+            self.swapper = create_icon_swapper(self.tray_icon, self.backend)
+            self.prepared_icons = self.swapper.prepare({
+                True: self.active_icon,
+                False: self.inactive_icon
+            })
+            self.swapper.swap(self.prepared_icons[False])
+            self.current_state = False
+            
+            # Icône de progression vers la prochaine vérification (optionnelle)
+            self.setup_progress_frames()
             
             # Démarrer l'icône dans un thread
             self.is_running = True
@@ -87,6 +293,41 @@ class TrayIcon:
             self.tray_icon = None
             return False
     
+    def setup_progress_frames(self):
+        """Prépare la planche d'images de progression si elle est activée et si NumPy est disponible"""
+        config = getattr(self.app, "config", None) or {}
+        if not config.get("tray_progress_icon", True):
+            return
+        
+        try:
+            from src.sprites import CountdownAnimator, load_progress_frames
+            
+            frame_count = max(2, int(config.get("tray_progress_frames", 24)))
+            frames = load_progress_frames(self.active_icon, self.inactive_icon, frame_count)
+            self.prepared_frames = self.swapper.prepare(dict(enumerate(frames)))
+            self.animator = CountdownAnimator(frame_count, self.show_progress_frame, self.app.clock)
+        except ImportError as e:
+            logger.info(f"NumPy non installé, icône de progression désactivée: {e}")
+        except Exception as e:
+            logger.warning(f"Impossible de préparer l'icône de progression: {e}")
+    
+    def show_progress_frame(self, frame):
+        """Affiche une image pré-encodée de la planche de progression"""
+        try:
+            self.swapper.swap(self.prepared_frames[frame])
+        except Exception as e:
+            logger.error(f"Erreur lors de l'affichage de l'icône de progression: {e}")
+    
+    def start_countdown(self, start_time, deadline):
+        """Anime l'icône jusqu'à l'échéance (instants de l'horloge de l'application)"""
+        if self.animator and self.tray_icon:
+            self.animator.start(start_time, deadline)
+    
+    def stop_countdown(self):
+        """Arrête l'animation de l'icône de progression"""
+        if self.animator:
+            self.animator.stop()
+    
     def create_default_icon(self, is_active=False):
         """Crée une icône par défaut moderne en cas d'absence du fichier d'icône"""
         from PIL import Image, ImageDraw
@@ -154,15 +395,13 @@ class TrayIcon:
     
     def update_icon(self, is_monitoring):
         """Met à jour l'icône pour refléter l'état de la surveillance"""
-        if self.tray_icon:
+        is_monitoring = bool(is_monitoring)
+        if self.tray_icon and is_monitoring != self.current_state:
+            self.current_state = is_monitoring
             try:
-                # Mettre à jour l'icône en fonction de l'état
-                if is_monitoring:
-                    self.tray_icon.icon = self.active_icon
-                    self.tray_icon.title = "NightMod (actif)"
-                else:
-                    self.tray_icon.icon = self.inactive_icon  # Utiliser l'icône grisée
-                    self.tray_icon.title = "NightMod (inactif)"
+                # Échanger l'image pré-encodée correspondant à l'état
+                self.swapper.swap(self.prepared_icons[is_monitoring])
+                self.tray_icon.title = "NightMod (actif)" if is_monitoring else "NightMod (inactif)"
             except Exception as e:
                 logger.error(f"Erreur lors de la mise à jour de l'icône: {e}")
                 # Si la mise à jour de l'icône échoue, essayer une approche plus simple
@@ -212,6 +451,7 @@ class TrayIcon:
             try:
                 self.is_running = False
                 self.tray_icon.stop()
+                self.swapper.close()
             except Exception as e:
                 logger.error(f"Erreur lors de l'arrêt de l'icône de la barre des tâches: {e}")
     
@@ -9,3 +9,11 @@ def get_theme_path(theme_name="modern.tcl"):
     """Retourne le chemin absolu d'un fichier de thème."""
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base_dir, "themes", theme_name)
+
+def get_config_dir():
+    """Retourne le répertoire de configuration de NightMod.
+
+    La variable d'environnement NIGHTMOD_CONFIG_DIR permet de le remplacer
+    (utilisée notamment par les tests).
+    """
+    return os.environ.get("NIGHTMOD_CONFIG_DIR") or os.path.join(os.path.expanduser("~"), ".nightmod")
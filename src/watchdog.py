@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Chien de garde de l'échéance des vérifications
+
+L'action en l'absence de réponse dépend du compte à rebours du popup, donc de
+la boucle Tk : si celle-ci est bloquée (boîte de dialogue modale, appel
+bloquant), la machine ne s'éteint jamais. Le chien de garde conserve dans un
+thread indépendant de Tk l'échéance absolue de la vérification en cours.
+
+Chaque vérification est résolue une seule fois, par le premier qui se
+présente : la réponse de l'utilisateur, l'expiration du compte à rebours, ou
+le chien de garde lui-même si le compte à rebours n'a pas abouti dans le
+délai de grâce suivant l'échéance. Dans ce dernier cas, le rappel
+d'expiration est exécuté dans le thread du chien de garde.
+"""
+
+import time
+import logging
+import threading
+
+logger = logging.getLogger("NightMod.Watchdog")
+
+# Délai accordé au compte à rebours du popup après l'échéance (secondes)
+GRACE_PERIOD = 15.0
+
+# États d'une vérification
+PENDING = "pending"
+RESOLVED = "resolved"
+FIRED = "fired"
+
+
+class DeadlineWatchdog:
+    """Déclenche un rappel hors du thread Tk si une vérification n'est pas résolue à temps"""
+
+    def __init__(self, on_expire, grace=GRACE_PERIOD):
+        """
+        Args:
+            on_expire: Rappel exécuté dans le thread du chien de garde, avec le
+                retard (secondes) constaté par rapport à l'échéance
+            grace: Délai accordé au compte à rebours après l'échéance (secondes)
+        """
+        self.on_expire = on_expire
+        self.grace = grace
+        self.condition = threading.Condition()
+        self.check = 0
+        self.state = None
+        self.deadline = None
+        self.running = False
+        self.thread = None
+
+    def arm(self, delay):
+        """Enregistre une nouvelle vérification dont l'échéance est dans `delay` secondes
+
+        Returns:
+            L'identifiant de la vérification, à passer à resolve()
+        """
+        with self.condition:
+            self.check += 1
+            self.state = PENDING
+            self.deadline = time.monotonic() + delay
+            if not self.running:
+                # Le thread n'est démarré qu'à la première vérification
+                self.running = True
+                self.thread = threading.Thread(target=self._run, name="NightModWatchdog", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+            return self.check
+
+    def resolve(self, check=None):
+        """Résout la vérification en cours (réponse ou expiration du compte à rebours)
+
+        Args:
+            check: Identifiant retourné par arm() (défaut: la vérification en cours)
+
+        Returns:
+            True si l'appelant a résolu la vérification, False si elle l'était
+            déjà (en particulier si le chien de garde a exécuté son rappel)
+        """
+        with self.condition:
+            if self.state != PENDING or (check is not None and check != self.check):
+                return False
+            self.state = RESOLVED
+            self.deadline = None
+            self.condition.notify()
+            return True
+
+    def stop(self):
+        """Arrête le chien de garde (la vérification en cours est abandonnée)"""
+        with self.condition:
+            self.running = False
+            self.deadline = None
+            self.condition.notify()
+        thread, self.thread = self.thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running:
+                    if self.deadline is None:
+                        # Aucune vérification en cours : aucun réveil périodique
+                        self.condition.wait()
+                        continue
+                    remaining = self.deadline + self.grace - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if not self.running:
+                    return
+                self.state = FIRED
+                late = time.monotonic() - self.deadline
+                self.deadline = None
+
+            # Le rappel s'exécute hors du verrou : resolve() reste non bloquant
+            logger.warning(
+                f"Vérification non résolue {late:.0f} s après son échéance, "
+                "exécution de l'action par le chien de garde"
+            )
+            try:
+                self.on_expire(late)
+            except Exception as e:
+                logger.error(f"Erreur dans le chien de garde: {e}")
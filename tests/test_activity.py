@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.activity import (ActivitySampler, ActionGuard, Counters, Thresholds,
+                          read_proc_counters, MIN_INTERVAL, MAX_INTERVAL)
+from src.clock import VirtualClock
+
+PROC_STAT = "cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 1 0 0 1 0 0 0 0 0 0\n"
+DISKSTATS = """   8       0 sda 100 0 {read} 0 50 0 {written} 0 0 0 0
+   8       1 sda1 100 0 999 0 50 0 999 0 0 0 0
+   7       0 loop0 10 0 777 0 0 0 0 0 0 0 0
+"""
+NET_DEV = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:  900000     10    0    0    0     0          0         0   900000      10    0    0    0     0       0          0
+  eth0:  {rx}     10    0    0    0     0          0         0   {tx}      10    0    0    0     0       0          0
+"""
+
+class FakeReader:
+    """Compteurs cumulés qui progressent à débit constant sur l'horloge virtuelle"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = 0
+        self.rates = (0, 0, 0)
+        self.counters = Counters(0, 0, 0, 0)
+        self.updated_at = clock.now()
+
+    def set_rates(self, cpu_percent, disk_bps, net_bps):
+        self.advance()
+        self.rates = (cpu_percent, disk_bps, net_bps)
+
+    def advance(self):
+        cpu_percent, disk_bps, net_bps = self.rates
+        elapsed = self.clock.now() - self.updated_at
+        self.updated_at = self.clock.now()
+        self.counters = Counters(
+            self.counters.cpu_busy + cpu_percent * elapsed,
+            self.counters.cpu_total + 100 * elapsed,
+            self.counters.disk_bytes + disk_bps * elapsed,
+            self.counters.net_bytes + net_bps * elapsed,
+        )
+
+    def __call__(self):
+        self.calls += 1
+        self.advance()
+        return self.counters
+
+class TestProcCounters(unittest.TestCase):
+    """Tests pour le relevé des compteurs de /proc"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, "proc", "net"))
+        os.makedirs(os.path.join(self.temp_dir, "block", "sda"))
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content):
+        with open(os.path.join(self.temp_dir, "proc", name), 'w') as f:
+            f.write(content)
+
+    def test_counters(self):
+        """Vérifie que partitions, périphériques virtuels et boucle locale sont ignorés"""
+        self.write("stat", PROC_STAT.format(busy=300, idle=700))
+        self.write("diskstats", DISKSTATS.format(read=10, written=30))
+        self.write(os.path.join("net", "dev"), NET_DEV.format(rx=1000, tx=500))
+
+        counters = read_proc_counters(os.path.join(self.temp_dir, "proc"), os.path.join(self.temp_dir, "block"))
+        self.assertEqual(counters, Counters(300, 1000, 40 * 512, 1500))
+
+class TestActivitySampler(unittest.TestCase):
+    """Tests pour l'échantillonneur d'activité"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.clock = VirtualClock()
+        self.reader = FakeReader(self.clock)
+        self.sampler = ActivitySampler(self.clock, self.reader, Thresholds(50, 1000, 1000))
+
+    def test_rates_from_deltas(self):
+        """Vérifie le calcul des débits par différence entre deux relevés"""
+        self.reader.set_rates(80, 4000, 10)
+        self.sampler.start()
+        self.assertIsNone(self.sampler.rates)
+
+        self.clock.run(MIN_INTERVAL)
+        rates = self.sampler.rates
+        self.assertAlmostEqual(rates.cpu_percent, 80)
+        self.assertAlmostEqual(rates.disk_bps, 4000)
+        self.assertAlmostEqual(rates.net_bps, 10)
+        self.assertEqual(len(self.sampler.busy_reasons()), 2)
+
+    def test_adaptive_interval(self):
+        """Vérifie que le rythme ralentit au repos et se resserre à un changement d'état"""
+        self.sampler.start()
+        self.clock.run(600)
+        # 5, 10, 20, 40, 60, 60... : une quinzaine de relevés en 10 minutes
+        self.assertLess(self.reader.calls, 16)
+        self.assertEqual(self.sampler.interval, MAX_INTERVAL)
+
+        # La machine se met à travailler : relevés de nouveau rapprochés
+        self.reader.set_rates(90, 0, 0)
+        calls = self.reader.calls
+        self.clock.run(self.clock.now() + 2 * MAX_INTERVAL)
+        self.assertGreaterEqual(self.reader.calls - calls, 4)
+        self.assertTrue(self.sampler.busy_reasons())
+
+        self.sampler.stop()
+        self.assertEqual(self.clock.pending(), 0)
+
+class TestActionGuard(unittest.TestCase):
+    """Tests pour la décision de report ou de verrouillage"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.clock = VirtualClock()
+        self.reader = FakeReader(self.clock)
+        self.sampler = ActivitySampler(self.clock, self.reader, Thresholds(50, 1000, 1000))
+
+    def start_busy(self, **rates):
+        self.reader.set_rates(rates.get("cpu", 0), rates.get("disk", 0), rates.get("net", 0))
+        self.sampler.start()
+        self.clock.run(30)
+
+    def test_idle_machine_runs_action(self):
+        """Vérifie qu'une machine au repos exécute l'action configurée"""
+        guard = ActionGuard(self.sampler)
+        self.start_busy()
+        self.assertEqual(guard.decide("shutdown"), ("shutdown", 0))
+
+    def test_defer_until_max(self):
+        """Vérifie le report de l'action tant que la machine travaille, dans la limite fixée"""
+        guard = ActionGuard(self.sampler, "defer", defer_interval=300, max_defer=600)
+        self.start_busy(net=5000)
+        self.assertEqual(guard.decide("shutdown"), ("shutdown", 300))
+        self.clock.run(self.clock.now() + 300)
+        self.assertEqual(guard.decide("shutdown"), ("shutdown", 300))
+        self.clock.run(self.clock.now() + 300)
+        self.assertEqual(guard.decide("shutdown"), ("shutdown", 0))
+
+    def test_download_finishes_during_deferral(self):
+        """Vérifie que l'action est exécutée dès que la machine revient au repos"""
+        guard = ActionGuard(self.sampler, "defer", defer_interval=300)
+        self.start_busy(disk=50000)
+        self.assertEqual(guard.decide("sleep")[1], 300)
+        self.reader.set_rates(0, 0, 0)
+        self.clock.run(self.clock.now() + 300)
+        self.assertEqual(guard.decide("sleep"), ("sleep", 0))
+
+    def test_downgrade_to_lock(self):
+        """Vérifie le verrouillage à la place de l'action, et hors du thread Tk"""
+        self.start_busy(cpu=95)
+        self.assertEqual(ActionGuard(self.sampler, "lock").decide("shutdown"), ("lock", 0))
+        self.assertEqual(ActionGuard(self.sampler, "defer").decide("shutdown", allow_defer=False, fresh=False),
+                         ("lock", 0))
+        self.assertEqual(ActionGuard(self.sampler, "defer").decide("lock"), ("lock", 0))
+
+if __name__ == '__main__':
+    unittest.main()
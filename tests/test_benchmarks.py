@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import harness, ui_latency
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """Tests pour l'outillage des micro-benchmarks"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.baseline_path = os.path.join(self.temp_dir.name, "baseline.json")
+        self.registry = dict(harness.REGISTRY)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        harness.REGISTRY.clear()
+        harness.REGISTRY.update(self.registry)
+        self.temp_dir.cleanup()
+
+    def test_fixture_is_cleaned_up(self):
+        """Vérifie que le benchmark est mesuré puis que son environnement est nettoyé"""
+        events = []
+
+        @harness.benchmark("test.fixture")
+        def fixture():
+            events.append("setup")
+            yield lambda: None
+            events.append("teardown")
+
+        result = harness.run_benchmark("test.fixture", repeat=2, min_time=0.001)
+        self.assertEqual(events, ["setup", "teardown"])
+        self.assertGreater(result["loops"], 1)
+        self.assertLessEqual(result["best"], result["median"])
+
+    def test_regression_is_detected(self):
+        """Vérifie la comparaison à la référence et le seuil de régression"""
+        harness.save_baseline(self.baseline_path, {
+            "a": {"best": 1.0, "median": 1.0},
+            "b": {"best": 1.0, "median": 1.0},
+            "c": {"best": 1.0, "median": 1.0},
+        })
+        baseline = harness.load_baseline(self.baseline_path)
+
+        results = {
+            "a": {"best": 1.2, "median": 1.2},
+            "b": {"best": 1.5, "median": 1.5},
+            "c": {"best": 0.5, "median": 0.5},
+            "d": {"best": 1.0, "median": 1.0},
+        }
+        statuses = {row[0]: row[4] for row in harness.compare(results, baseline, threshold=0.3)}
+        self.assertEqual(statuses, {"a": "ok", "b": "régression", "c": "amélioration", "d": "nouveau"})
+
+    def test_benchmark_threshold_overrides_global_threshold(self):
+        """Vérifie le seuil propre à un benchmark"""
+        harness.benchmark("noisy", threshold=1.0)(lambda: iter(()))
+        baseline = {"benchmarks": {"noisy": {"best": 1.0, "median": 1.0}}}
+        rows = harness.compare({"noisy": {"best": 1.5, "median": 1.5}}, baseline, threshold=0.3)
+        self.assertEqual(rows[0][4], "ok")
+
+    def test_skipped_benchmarks_are_not_reported(self):
+        """Vérifie qu'un benchmark impossible sur la machine est ignoré"""
+        @harness.benchmark("test.skipped")
+        def skipped():
+            raise harness.SkipBenchmark("non pris en charge")
+            yield
+
+        self.assertEqual(harness.run_all(["test.skipped"], repeat=1, min_time=0.001), {})
+
+class TestUiLatencyReport(unittest.TestCase):
+    """Tests pour l'agrégation du benchmark de bout en bout (sans affichage)"""
+
+    def test_percentiles_and_sound_overhead(self):
+        """Vérifie les percentiles par mesure et le surcoût du son"""
+        summary = ui_latency.summarize({
+            "popup_visible": [0.030, 0.010, 0.020],
+            "popup_visible_sound": [0.050, 0.040, 0.060],
+        })
+        self.assertEqual(summary["popup_visible"]["runs"], 3)
+        self.assertAlmostEqual(summary["popup_visible"]["p50"], 0.020)
+        self.assertAlmostEqual(summary["popup_visible"]["max"], 0.030)
+        self.assertAlmostEqual(summary["sound_overhead"]["p50"], 0.030)
+
+        report = ui_latency.format_report(summary)
+        self.assertIn("20.0 ms", report)
+        self.assertIn("Surcoût du son (médiane): 30.0 ms", report)
+
+if __name__ == '__main__':
+    unittest.main()
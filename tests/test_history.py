@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import csv
+import json
+import sqlite3
+import tempfile
+import unittest
+import sys
+import shutil
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import history
+
+class TestEventHistory(unittest.TestCase):
+    """Tests pour l'historique des événements"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "history.db")
+        self.history = history.EventHistory(self.db_path, batch_delay=0.05)
+    
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.history.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_events_are_written_in_wal_mode(self):
+        """Vérifie l'écriture des événements et le mode WAL"""
+        self.history.record(history.POPUP_SHOWN, response_time=30)
+        self.history.record(history.TIMEOUT, duration=30.0)
+        self.history.record(history.ACTION_EXECUTED, action="lock", result="success", duration=0.2)
+        self.assertTrue(self.history.flush(5))
+        
+        connection = sqlite3.connect(self.db_path)
+        try:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            rows = connection.execute("SELECT event, action, result FROM events ORDER BY id").fetchall()
+            indexes = {row[1] for row in connection.execute("PRAGMA index_list(events)")}
+        finally:
+            connection.close()
+        
+        self.assertEqual(mode, "wal")
+        self.assertEqual(rows, [
+            (history.POPUP_SHOWN, None, None),
+            (history.TIMEOUT, None, None),
+            (history.ACTION_EXECUTED, "lock", "success"),
+        ])
+        self.assertIn("idx_events_timestamp", indexes)
+        self.assertIn("idx_events_event_timestamp", indexes)
+    
+    def test_close_writes_pending_events(self):
+        """Vérifie que la fermeture écrit les événements encore dans la file"""
+        for _ in range(250):
+            self.history.record(history.CHECK_SCHEDULED, interval=1200)
+        self.history.close()
+        
+        self.assertEqual(sum(1 for _ in history.iter_events(self.db_path)), 250)
+    
+    def test_export_csv_and_jsonl(self):
+        """Vérifie les exports CSV et JSONL filtrés"""
+        self.history.record(history.RESPONSE, duration=4.5)
+        self.history.record(history.POPUP_SHOWN, response_time=30)
+        self.history.flush(5)
+        
+        output = io.StringIO()
+        count = history.export_events(output, "csv", db_path=self.db_path, chunk_size=1)
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(count, 2)
+        self.assertEqual(rows[0], list(history.EXPORT_COLUMNS))
+        
+        output = io.StringIO()
+        history.export_events(output, "jsonl", db_path=self.db_path, event=history.POPUP_SHOWN)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["details"], {"response_time": 30})
+
+if __name__ == '__main__':
+    unittest.main()
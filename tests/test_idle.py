@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import glob
+import json
+import shutil
+import tempfile
+import tkinter
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import history
+from src.clock import TkClock
+from src.monitoring import MonitoringManager
+from src.scheduling import FixedIntervalPolicy
+from src.sprites import CountdownAnimator
+
+# Durée de la fenêtre de mesure (secondes) ; une fenêtre plus longue affine les budgets
+IDLE_WINDOW = float(os.environ.get("NIGHTMOD_IDLE_WINDOW", "6"))
+
+# Budgets par heure de surveillance en attente. Une scrutation à chaque seconde
+# coûte 3600 réveils par heure : le budget de réveils la détecte.
+WAKEUPS_PER_HOUR = 1800
+# /proc/self/stat compte en tops d'horloge (10 ms) : le budget tolère deux tops par fenêtre
+CPU_MS_PER_HOUR = 15000
+RSS_KB_PER_HOUR = 20 * 1024
+
+def read_wakeups():
+    """Changements de contexte volontaires de tous les threads du processus"""
+    total = 0
+    for path in glob.glob("/proc/self/task/*/status"):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith("voluntary_ctxt_switches:"):
+                        total += int(line.split()[1])
+        except FileNotFoundError:
+            pass  # Thread terminé entre le listage et la lecture
+    return total
+
+def read_cpu_ms():
+    """Temps CPU utilisateur et système du processus (millisecondes)"""
+    with open("/proc/self/stat") as f:
+        # Le nom du programme (entre parenthèses) peut contenir des espaces
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = int(fields[11]) + int(fields[12])
+    return ticks * 1000 / os.sysconf("SC_CLK_TCK")
+
+def read_rss_kb():
+    """Mémoire résidente du processus (kio)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+def measure_idle(run_event_loop, seconds=IDLE_WINDOW):
+    """Exécute la boucle d'événements pendant la fenêtre et retourne les coûts par heure"""
+    # Échauffement : démarrage du notificateur Tcl et premières allocations
+    run_event_loop(0.2)
+
+    wakeups, cpu_ms, rss_kb = read_wakeups(), read_cpu_ms(), read_rss_kb()
+    run_event_loop(seconds)
+    scale = 3600 / seconds
+    return {
+        "wakeups": (read_wakeups() - wakeups) * scale,
+        "cpu_ms": (read_cpu_ms() - cpu_ms) * scale,
+        "rss_kb": (read_rss_kb() - rss_kb) * scale,
+    }
+
+@unittest.skipUnless(os.path.exists("/proc/self/status"), "Mesure basée sur /proc (Linux)")
+class TestIdleOverhead(unittest.TestCase):
+    """Coût de la surveillance en attente de la prochaine vérification"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.previous_config_dir = os.environ.get("NIGHTMOD_CONFIG_DIR")
+        os.environ["NIGHTMOD_CONFIG_DIR"] = self.temp_dir
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        if self.previous_config_dir is None:
+            os.environ.pop("NIGHTMOD_CONFIG_DIR", None)
+        else:
+            os.environ["NIGHTMOD_CONFIG_DIR"] = self.previous_config_dir
+        shutil.rmtree(self.temp_dir)
+
+    def assert_within_budget(self, costs):
+        self.assertLessEqual(costs["wakeups"], WAKEUPS_PER_HOUR, f"Réveils par heure: {costs}")
+        self.assertLessEqual(costs["cpu_ms"], CPU_MS_PER_HOUR, f"CPU par heure: {costs}")
+        self.assertLessEqual(costs["rss_kb"], RSS_KB_PER_HOUR, f"Croissance RSS par heure: {costs}")
+
+    def test_headless_engine(self):
+        """Planificateur, animation de l'icône et historique sur une boucle Tcl sans affichage"""
+        interpreter = tkinter.Tcl()
+        clock = TkClock(interpreter)
+        events = history.EventHistory(os.path.join(self.temp_dir, "history.db"))
+        animator = CountdownAnimator(24, lambda frame: None, clock)
+
+        def on_scheduled(interval, deadline):
+            events.record(history.CHECK_SCHEDULED, interval=interval)
+            animator.start(deadline - interval, deadline)
+
+        monitor = MonitoringManager(clock, FixedIntervalPolicy(20 * 60), self.fail, on_scheduled)
+
+        def run_event_loop(seconds):
+            interpreter.after(int(seconds * 1000), interpreter.setvar, "nightmod_idle_done", 1)
+            interpreter.eval("vwait nightmod_idle_done")
+
+        try:
+            monitor.start()
+            costs = measure_idle(run_event_loop)
+        finally:
+            monitor.stop()
+            animator.stop()
+            events.close()
+        self.assert_within_budget(costs)
+
+    @unittest.skipUnless(os.environ.get("DISPLAY"), "Nécessite un affichage (DISPLAY)")
+    def test_application_in_tray(self):
+        """NightModApp masquée, surveillance active (pystray écarté pour isoler Tk)"""
+        # Ni la saisie ni une lecture sur la machine de test ne reportent la vérification
+        with open(os.path.join(self.temp_dir, "config.json"), 'w') as f:
+            json.dump({"idle_detection_enabled": False, "playback_detection_enabled": False}, f)
+
+        previous_pystray = sys.modules.get("pystray")
+        sys.modules["pystray"] = None
+        try:
+            from src.app import NightModApp
+            app = NightModApp()
+        finally:
+            if previous_pystray is None:
+                sys.modules.pop("pystray", None)
+            else:
+                sys.modules["pystray"] = previous_pystray
+
+        def run_event_loop(seconds):
+            app.after(int(seconds * 1000), app.quit)
+            app.mainloop()
+
+        try:
+            app.start_monitoring()
+            app.hide_main_window()
+            costs = measure_idle(run_event_loop)
+        finally:
+            app.stop_monitoring()
+            app.on_close()
+        self.assert_within_budget(costs)
+
+if __name__ == '__main__':
+    unittest.main()
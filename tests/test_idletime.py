@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.idletime import InterruptsBackend, LogindBackend, IdleGate, select_backend, MIN_POSTPONE
+
+INTERRUPTS = """           CPU0       CPU1
+  1:        {kbd}          0   IO-APIC    1-edge      i8042
+  8:          0          1   IO-APIC    8-edge      rtc0
+ 12:        {mouse}          7   IO-APIC   12-edge      i8042
+ 16:      {disk}        100   IO-APIC   16-fasteoi   ahci[0000:00:1f.2]
+NMI:          0          0   Non-maskable interrupts
+"""
+
+class FakeBackend:
+    def __init__(self, idle):
+        self.idle = idle
+
+    def idle_seconds(self):
+        return self.idle
+
+class TestInterruptsBackend(unittest.TestCase):
+    """Tests pour la détection par les compteurs d'interruptions"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "interrupts")
+        self.now = 1000.0
+        self.backend = InterruptsBackend(self.path, clock=lambda: self.now)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, kbd, mouse, disk=500):
+        with open(self.path, 'w') as f:
+            f.write(INTERRUPTS.format(kbd=kbd, mouse=mouse, disk=disk))
+
+    def test_input_interrupts_only(self):
+        """Vérifie que seules les interruptions des périphériques de saisie sont comptées"""
+        self.write(10, 20)
+        self.assertEqual(self.backend.read_total(), 37)
+        self.assertTrue(self.backend.available())
+
+        # Activité disque seulement : pas de saisie
+        self.now += 60
+        self.write(10, 20, disk=900)
+        self.assertEqual(self.backend.idle_seconds(), 60)
+
+        # Saisie depuis le relevé précédent
+        self.now += 60
+        self.write(11, 20, disk=900)
+        self.assertEqual(self.backend.idle_seconds(), 0)
+        self.now += 45
+        self.assertEqual(self.backend.idle_seconds(), 45)
+
+    def test_unavailable_without_input_lines(self):
+        """Vérifie que la source est indisponible sans interruption de saisie"""
+        with open(self.path, 'w') as f:
+            f.write("           CPU0\n  8:          0   IO-APIC    8-edge      rtc0\n")
+        self.assertFalse(self.backend.available())
+        self.assertFalse(InterruptsBackend(os.path.join(self.temp_dir, "absent")).available())
+
+    def test_usb_host_controllers_ignored(self):
+        """Vérifie que les contrôleurs USB ne comptent pas comme des saisies"""
+        with open(self.path, 'w') as f:
+            f.write("           CPU0\n"
+                    " 16:        900   IO-APIC   16-fasteoi   ehci_hcd:usb1\n"
+                    "124:       5000   PCI-MSI 327680-edge      xhci_hcd\n")
+        self.assertFalse(self.backend.available())
+
+class TestLogindBackend(unittest.TestCase):
+    """Tests pour l'indication d'inactivité de logind"""
+
+    def test_idle_hint(self):
+        """Vérifie l'interprétation de IdleHint et IdleSinceHintMonotonic"""
+        active = LogindBackend.parse_properties("IdleHint=no\nIdleSinceHintMonotonic=0\n")
+        self.assertEqual(LogindBackend.idle_from_properties(active, 500.0), 0.0)
+
+        idle = LogindBackend.parse_properties("IdleHint=yes\nIdleSinceHintMonotonic=200000000\n")
+        self.assertEqual(LogindBackend.idle_from_properties(idle, 500.0), 300.0)
+
+        self.assertIsNone(LogindBackend.idle_from_properties({}, 500.0))
+
+class TestIdleGate(unittest.TestCase):
+    """Tests pour la décision de report"""
+
+    def test_postpone_while_active(self):
+        """Vérifie le report jusqu'à ce que la saisie ne soit plus récente"""
+        gate = IdleGate(FakeBackend(100), threshold=120, max_postpone=1800)
+        self.assertEqual(gate(0), MIN_POSTPONE)
+        gate.backend.idle = 10
+        self.assertEqual(gate(0), 110)
+        gate.backend.idle = 120
+        self.assertEqual(gate(0), 0)
+        gate.backend.idle = None
+        self.assertEqual(gate(0), 0)
+
+    def test_postpone_is_bounded(self):
+        """Vérifie que le report cumulé est borné"""
+        gate = IdleGate(FakeBackend(0), threshold=120, max_postpone=1800)
+        self.assertEqual(gate(1750), 50)
+        self.assertEqual(gate(1800), 0)
+
+    def test_unknown_backend(self):
+        """Vérifie qu'une source inconnue n'est pas retenue"""
+        self.assertIsNone(select_backend("inconnue"))
+
+if __name__ == '__main__':
+    unittest.main()
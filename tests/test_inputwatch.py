@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.inputwatch import (InputWatcher, parse_inotify_events, is_user_input, INOTIFY_EVENT, IN_CREATE,
+                            EV_KEY, EV_REL, EV_ABS)
+
+# Taille d'une struct input_event en 64 bits
+EVENT = b"\0" * 24
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def voluntary_switches(thread):
+    with open(f"/proc/self/task/{thread.native_id}/status") as f:
+        for line in f:
+            if line.startswith("voluntary_ctxt_switches:"):
+                return int(line.split()[1])
+    return None
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "Périphériques evdev et inotify propres à Linux")
+class TestInputWatcher(unittest.TestCase):
+    """Tests pour la surveillance des périphériques de saisie, avec des tubes nommés"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.writers = []
+        # Les tubes nommés n'ont pas de capacités evdev : filtre remplacé
+        self.watcher = InputWatcher(self.temp_dir, accept=lambda fd: True)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.watcher.stop()
+        for fd in self.writers:
+            os.close(fd)
+        shutil.rmtree(self.temp_dir)
+
+    def add_device(self, name):
+        os.mkfifo(os.path.join(self.temp_dir, name))
+
+    def open_writer(self, name):
+        # Le lecteur a déjà ouvert le tube : l'ouverture en écriture ne bloque pas
+        fd = os.open(os.path.join(self.temp_dir, name), os.O_WRONLY | os.O_NONBLOCK)
+        self.writers.append(fd)
+        return fd
+
+    def test_no_device(self):
+        """Vérifie que la surveillance est indisponible sans périphérique"""
+        self.add_device("mouse0")
+        self.assertFalse(self.watcher.start())
+        self.assertIsNone(self.watcher.idle_seconds())
+
+    def test_activity_updates_timestamp_only(self):
+        """Vérifie que seule l'heure de la dernière saisie est conservée"""
+        self.add_device("event0")
+        self.assertTrue(self.watcher.start())
+        started = self.watcher.last_activity
+
+        writer = self.open_writer("event0")
+        os.write(writer, EVENT * 3)
+        self.assertTrue(wait_until(lambda: self.watcher.last_activity > started))
+        self.assertLess(self.watcher.idle_seconds(), 1.0)
+        self.assertEqual(sorted(self.watcher.devices), ["event0"])
+
+    def test_hotplug(self):
+        """Vérifie la prise en compte des branchements et débranchements"""
+        self.add_device("event0")
+        self.assertTrue(self.watcher.start())
+        if self.watcher.inotify_fd is None:
+            self.skipTest("inotify indisponible")
+
+        self.add_device("event1")
+        self.assertTrue(wait_until(lambda: "event1" in self.watcher.devices))
+        before = self.watcher.last_activity
+        os.write(self.open_writer("event1"), EVENT)
+        self.assertTrue(wait_until(lambda: self.watcher.last_activity > before))
+
+        os.remove(os.path.join(self.temp_dir, "event1"))
+        self.assertTrue(wait_until(lambda: "event1" not in self.watcher.devices))
+
+    def test_no_wakeups_without_input(self):
+        """Vérifie que le thread ne se réveille pas en l'absence de saisie"""
+        self.add_device("event0")
+        self.assertTrue(self.watcher.start())
+        time.sleep(0.05)
+        switches = voluntary_switches(self.watcher.thread)
+        time.sleep(0.5)
+        self.assertEqual(voluntary_switches(self.watcher.thread), switches)
+
+    def test_rejected_devices_ignored(self):
+        """Vérifie qu'un périphérique écarté par le filtre n'est pas surveillé"""
+        self.add_device("event0")
+        self.add_device("event1")
+        keyboard = os.stat(os.path.join(self.temp_dir, "event0")).st_ino
+        self.watcher.accept = lambda fd: os.fstat(fd).st_ino == keyboard
+        self.assertTrue(self.watcher.start())
+        self.assertEqual(sorted(self.watcher.devices), ["event0"])
+        self.assertEqual(self.watcher.ignored, {"event1"})
+
+    def test_parse_inotify_events(self):
+        """Vérifie le décodage des événements inotify"""
+        name = b"event3\0\0"
+        data = INOTIFY_EVENT.pack(1, IN_CREATE, 0, len(name)) + name
+        self.assertEqual(parse_inotify_events(data * 2), [(IN_CREATE, "event3")] * 2)
+
+def bits(*codes):
+    return sum(1 << code for code in codes)
+
+class TestDeviceCapabilities(unittest.TestCase):
+    """Tests pour le tri des périphériques d'après leurs capacités"""
+
+    def test_keyboard_and_pointers(self):
+        """Vérifie que claviers, souris et pavés tactiles sont retenus"""
+        keyboard = {0: bits(EV_KEY), EV_KEY: bits(*range(1, 100))}
+        mouse = {0: bits(EV_KEY, EV_REL), EV_KEY: bits(0x110, 0x111), EV_REL: bits(0, 1, 8)}
+        touchpad = {0: bits(EV_KEY, EV_ABS), EV_KEY: bits(0x110, 0x145, 0x14a), EV_ABS: bits(0, 1, 0x35, 0x36)}
+        for capabilities in (keyboard, mouse, touchpad):
+            self.assertTrue(is_user_input(capabilities))
+
+    def test_switches_and_sensors(self):
+        """Vérifie que boutons d'alimentation, capot, accéléromètre et manette sont écartés"""
+        power_button = {0: bits(EV_KEY), EV_KEY: bits(116)}
+        lid_switch = {0: bits(5)}
+        accelerometer = {0: bits(EV_ABS), EV_ABS: bits(0, 1, 2)}
+        joystick = {0: bits(EV_KEY, EV_ABS), EV_KEY: bits(0x120, 0x121), EV_ABS: bits(0, 1)}
+        for capabilities in (power_button, lid_switch, accelerometer, joystick, {}):
+            self.assertFalse(is_user_input(capabilities))
+
+if __name__ == '__main__':
+    unittest.main()
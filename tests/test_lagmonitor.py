@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import tkinter
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clock import TkClock, VirtualClock
+from src.lagmonitor import LagHistogram, LagProbe
+
+class TestLagHistogram(unittest.TestCase):
+    """Tests pour l'histogramme des retards"""
+
+    def test_buckets_and_percentiles(self):
+        """Vérifie le classement des retards et les percentiles par classe"""
+        histogram = LagHistogram((1, 10, 100))
+        for lag in (0.5, 0.8, 3, 7, 50, 400):
+            histogram.add(lag)
+
+        self.assertEqual(histogram.counts, [2, 2, 1, 1])
+        self.assertEqual(histogram.labels(), ["≤ 1 ms", "≤ 10 ms", "≤ 100 ms", "> 100 ms"])
+        self.assertEqual(histogram.percentile(0.5), 10)
+        self.assertEqual(histogram.percentile(1.0), 400)
+        self.assertIsNone(LagHistogram().percentile(0.5))
+
+class TestLagProbe(unittest.TestCase):
+    """Tests pour la sonde de réactivité"""
+
+    def test_late_callbacks_are_counted_as_stalls(self):
+        """Vérifie la mesure du retard sur une horloge virtuelle"""
+        clock = VirtualClock()
+        probe = LagProbe(clock, fast_interval=1.0, slow_interval=30.0, threshold=0.25, watchdog=False)
+        probe.set_fast(True)
+        probe.start()
+
+        def block(seconds):
+            # Un rappel bloquant fait avancer le temps sans rendre la main à la boucle
+            clock.current += seconds
+
+        clock.call_at(2.5, block, 0.1)
+        clock.call_at(4.5, block, 1.0)
+        clock.run(10)
+
+        summary = probe.summary()
+        self.assertEqual(summary["samples"], 9)
+        self.assertEqual(summary["stalls"], 1)
+        self.assertAlmostEqual(summary["max_ms"], 500.0)
+        probe.stop()
+
+    def test_slow_interval_when_hidden(self):
+        """Vérifie que la sonde ralentit lorsque l'application est masquée"""
+        clock = VirtualClock()
+        probe = LagProbe(clock, fast_interval=1.0, slow_interval=30.0, watchdog=False)
+        probe.start()
+        clock.run(60)
+        self.assertEqual(probe.histogram.total, 2)
+
+        probe.set_fast(True)
+        clock.run(65)
+        self.assertEqual(probe.histogram.total, 7)
+        probe.stop()
+        clock.run()
+        self.assertEqual(clock.pending(), 0)
+
+    def test_watchdog_samples_the_blocked_main_thread(self):
+        """Vérifie que le thread de garde relève la pile pendant le blocage"""
+        interpreter = tkinter.Tcl()
+        clock = TkClock(interpreter)
+        probe = LagProbe(clock, fast_interval=0.05, threshold=0.1)
+        probe.set_fast(True)
+
+        def blocking_sound():
+            time.sleep(0.4)
+
+        probe.start()
+        try:
+            interpreter.after(20, blocking_sound)
+            interpreter.after(700, interpreter.setvar, "nightmod_test_done", 1)
+            interpreter.eval("vwait nightmod_test_done")
+        finally:
+            probe.stop()
+
+        self.assertGreaterEqual(probe.stalls, 1)
+        self.assertIn("blocking_sound", probe.last_stack)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import tempfile
+import unittest
+import sys
+import shutil
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Importer le module à tester
+import run
+
+class TestLauncherStamp(unittest.TestCase):
+    """Tests pour le fichier témoin du lanceur"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.test_dir = tempfile.mkdtemp()
+        self.stamp_path = os.path.join(self.test_dir, "launcher.stamp")
+        self.requirements = os.path.join(self.test_dir, "requirements.txt")
+        with open(self.requirements, 'w') as f:
+            f.write("pillow>=9.0.0\n")
+    
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        shutil.rmtree(self.test_dir)
+    
+    def test_missing_stamp_is_invalid(self):
+        """Vérifie qu'un témoin absent impose une vérification"""
+        key = run.compute_stamp_key(self.requirements)
+        self.assertFalse(run.stamp_is_valid(key, self.stamp_path))
+    
+    def test_written_stamp_is_valid(self):
+        """Vérifie qu'un témoin écrit est reconnu pour le même environnement"""
+        key = run.compute_stamp_key(self.requirements)
+        run.write_stamp(key, self.stamp_path)
+        self.assertTrue(run.stamp_is_valid(key, self.stamp_path))
+        
+        with open(self.stamp_path) as f:
+            self.assertEqual(json.load(f)["python"], sys.executable)
+    
+    def test_requirements_change_invalidates_stamp(self):
+        """Vérifie qu'une modification de requirements.txt invalide le témoin"""
+        run.write_stamp(run.compute_stamp_key(self.requirements), self.stamp_path)
+        
+        with open(self.requirements, 'a') as f:
+            f.write("psutil>=5.9.0\n")
+        
+        key = run.compute_stamp_key(self.requirements)
+        self.assertFalse(run.stamp_is_valid(key, self.stamp_path))
+    
+    def test_invalidate_stamp(self):
+        """Vérifie que l'invalidation supprime le témoin"""
+        key = run.compute_stamp_key(self.requirements)
+        run.write_stamp(key, self.stamp_path)
+        run.invalidate_stamp(self.stamp_path)
+        self.assertFalse(os.path.exists(self.stamp_path))
+    
+    def test_parse_args_defaults_to_non_interactive(self):
+        """Vérifie que le lanceur ne pose aucune question par défaut"""
+        args = run.parse_args([])
+        self.assertFalse(args.interactive)
+        self.assertFalse(args.check)
+
+if __name__ == '__main__':
+    unittest.main()
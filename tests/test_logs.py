@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import logging
+import tempfile
+import unittest
+import sys
+import shutil
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.logs import RateLimitFilter, CompressingRotatingFileHandler
+
+def make_record(message, lineno=42):
+    """Crée un enregistrement de log émis depuis un point d'appel donné"""
+    return logging.LogRecord("NightMod.Test", logging.ERROR, "tray.py", lineno, message, None, None)
+
+class TestRateLimitFilter(unittest.TestCase):
+    """Tests pour le limiteur de débit des logs"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.now = 0.0
+        self.filter = RateLimitFilter(burst=3, interval=10.0, clock=lambda: self.now)
+    
+    def test_burst_then_suppression(self):
+        """Vérifie que seule la rafale passe pour un même point d'appel"""
+        results = [self.filter.filter(make_record("Erreur")) for _ in range(10)]
+        self.assertEqual(results, [True] * 3 + [False] * 7)
+        
+        # Un autre point d'appel n'est pas affecté
+        self.assertTrue(self.filter.filter(make_record("Autre", lineno=7)))
+    
+    def test_suppressed_count_is_reported(self):
+        """Vérifie que le nombre de messages supprimés est signalé"""
+        for _ in range(5):
+            self.filter.filter(make_record("Erreur"))
+        
+        self.now += 10.0
+        record = make_record("Erreur")
+        self.assertTrue(self.filter.filter(record))
+        self.assertIn("2 messages similaires supprimés", record.getMessage())
+
+class TestCompressingRotatingFileHandler(unittest.TestCase):
+    """Tests pour la rotation compressée du fichier de log"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.log_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.log_dir, "nightmod.log")
+    
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        shutil.rmtree(self.log_dir)
+    
+    def test_rotation_compresses_archives(self):
+        """Vérifie que les archives sont compressées en gzip"""
+        handler = CompressingRotatingFileHandler(self.log_path, max_bytes=200, backup_count=2)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        for i in range(20):
+            handler.emit(make_record(f"ligne {i:02d} " + "x" * 40))
+        handler.close()
+        
+        self.assertEqual(sorted(os.listdir(self.log_dir)),
+                         ["nightmod.log", "nightmod.log.1.gz", "nightmod.log.2.gz"])
+        with gzip.open(self.log_path + ".1.gz", 'rt') as f:
+            self.assertIn("ligne", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import tempfile
+import unittest
+import sys
+import shutil
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.logstats import expand_paths, scan_file, scan_files, merge_summaries
+
+SAMPLE_LOG = """\
+2025-04-21 23:00:00,001 - NightMod.App - INFO - Surveillance démarrée
+2025-04-21 23:30:00,001 - NightMod.App - INFO - L'utilisateur a répondu au popup
+2025-04-22 00:00:00,001 - NightMod.App - INFO - Aucune réponse de l'utilisateur, exécution de l'action configurée
+2025-04-22 00:00:00,002 - NightMod.SystemActions - INFO - Verrouillage de l'écran...
+2025-04-22 00:00:00,003 - NightMod.SystemActions - ERROR - Erreur lors du verrouillage: échec (2 messages similaires supprimés)
+Traceback (most recent call last):
+  File "app.py", line 1, in <module>
+2025-04-22 00:00:01,000 - NightMod.App - INFO - Surveillance arrêtée
+"""
+
+class TestLogStats(unittest.TestCase):
+    """Tests pour l'analyseur de logs"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.log_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.log_dir, "nightmod.log")
+        with open(self.log_path, 'w', encoding='utf-8') as f:
+            f.write(SAMPLE_LOG)
+        with gzip.open(self.log_path + ".1.gz", 'wt', encoding='utf-8') as f:
+            f.write(SAMPLE_LOG)
+    
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        shutil.rmtree(self.log_dir)
+    
+    def test_scan_file(self):
+        """Vérifie l'extraction des événements d'un fichier"""
+        summary = scan_file(self.log_path)
+        self.assertEqual(summary["events"], {
+            "monitoring_started": 1,
+            "popup_answered": 1,
+            "no_response": 1,
+            "action:lock": 1,
+            "action_error:lock": 3,
+            "monitoring_stopped": 1,
+        })
+        self.assertEqual(summary["first"], "2025-04-21 23:00:00,001")
+        self.assertEqual(summary["last"], "2025-04-22 00:00:01,000")
+    
+    def test_rotated_archives_are_merged(self):
+        """Vérifie que les archives gzip sont lues et fusionnées"""
+        paths = expand_paths([self.log_dir])
+        self.assertEqual(len(paths), 2)
+        
+        totals = merge_summaries(scan_files(paths, jobs=1))
+        self.assertEqual(totals["no_response"], 2)
+        self.assertEqual(totals["action_error:lock"], 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import history
+from src.clock import VirtualClock
+from src.metrics import MetricsRegistry, NightModMetrics, MetricsExporter, MetricsHandler, CONTENT_TYPE
+from src.monitoring import MonitoringManager
+from src.scheduling import FixedIntervalPolicy
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Tests pour le registre de métriques"""
+
+    def test_text_format(self):
+        """Vérifie le format texte Prometheus des compteurs, jauges et histogrammes"""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "Compteur", ("kind",))
+        gauge = registry.gauge("test_state", "Jauge")
+        histogram = registry.histogram("test_seconds", "Histogramme", (1, 5))
+
+        counter.inc(kind='a"b')
+        counter.inc(2, kind="c")
+        gauge.set(1)
+        for value in (0.5, 3, 10):
+            histogram.observe(value)
+
+        lines = registry.collect().splitlines()
+        self.assertIn("# TYPE test_total counter", lines)
+        self.assertIn('test_total{kind="a\\"b"} 1', lines)
+        self.assertIn('test_total{kind="c"} 2', lines)
+        self.assertIn("test_state 1", lines)
+        self.assertIn('test_seconds_bucket{le="1"} 1', lines)
+        self.assertIn('test_seconds_bucket{le="5"} 2', lines)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 3', lines)
+        self.assertIn("test_seconds_sum 13.5", lines)
+        self.assertIn("test_seconds_count 3", lines)
+
+    def test_concurrent_recording(self):
+        """Vérifie qu'aucun incrément n'est perdu entre plusieurs threads"""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "Compteur")
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        # Collecte pendant l'enregistrement
+        registry.collect()
+        for thread in threads:
+            thread.join()
+
+        self.assertIn("test_total 40000", registry.collect().splitlines())
+
+class TestNightModMetrics(unittest.TestCase):
+    """Tests pour les métriques de l'application"""
+
+    def test_history_events(self):
+        """Vérifie l'alimentation des métriques par les événements de l'historique"""
+        metrics = NightModMetrics()
+        clock = VirtualClock()
+        monitor = MonitoringManager(clock, FixedIntervalPolicy(1200), lambda: None)
+        metrics.bind_monitor(monitor)
+
+        lines = metrics.registry.collect().splitlines()
+        self.assertIn("nightmod_monitoring 0", lines)
+        self.assertFalse(any(line.startswith("nightmod_next_check_seconds ") for line in lines))
+
+        monitor.start()
+        clock.advance(200)
+        metrics.record(history.POPUP_SHOWN, response_time=30)
+        metrics.record(history.RESPONSE, duration=4.2)
+        metrics.record(history.TIMEOUT, duration=30.0)
+        metrics.record(history.ACTION_EXECUTED, action="lock", result="success", duration=0.3)
+        metrics.record(history.ACTION_EXECUTED, action="shutdown", result="error: boom", duration=0.01)
+
+        lines = metrics.registry.collect().splitlines()
+        self.assertIn("nightmod_monitoring 1", lines)
+        self.assertIn("nightmod_next_check_seconds 1000", lines)
+        self.assertIn("nightmod_checks_total 1", lines)
+        self.assertIn("nightmod_responses_total 1", lines)
+        self.assertIn("nightmod_timeouts_total 1", lines)
+        self.assertIn('nightmod_actions_total{action="lock",result="success"} 1', lines)
+        self.assertIn('nightmod_actions_total{action="shutdown",result="error"} 1', lines)
+        self.assertIn('nightmod_response_latency_seconds_bucket{le="5"} 1', lines)
+        self.assertIn('nightmod_action_duration_seconds_count{action="lock"} 1', lines)
+
+class TestMetricsExporter(unittest.TestCase):
+    """Tests pour l'export des métriques"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.metrics = NightModMetrics()
+        self.metrics.record(history.POPUP_SHOWN)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_file_export(self):
+        """Vérifie l'écriture du fichier à l'arrêt, sans fichier temporaire résiduel"""
+        path = os.path.join(self.temp_dir, "textfile", "nightmod.prom")
+        exporter = MetricsExporter(self.metrics.registry, path, interval=3600)
+        exporter.start()
+        self.metrics.record(history.POPUP_SHOWN)
+        exporter.stop()
+
+        with open(path, encoding="utf-8") as f:
+            self.assertIn("nightmod_checks_total 2", f.read().splitlines())
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["nightmod.prom"])
+
+    def test_http_export(self):
+        """Vérifie le serveur HTTP local"""
+        exporter = MetricsExporter(self.metrics.registry, port=0)
+        exporter.start()
+        try:
+            host, port = exporter.server.server_address
+            self.assertEqual(host, "127.0.0.1")
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                self.assertEqual(response.headers["Content-Type"], CONTENT_TYPE)
+                body = response.read().decode("utf-8")
+        finally:
+            exporter.stop()
+
+        self.assertIn("nightmod_checks_total 1", body.splitlines())
+
+    def test_idle_client_released(self):
+        """Vérifie qu'un client qui n'envoie rien ne bloque ni le serveur ni l'arrêt"""
+        exporter = MetricsExporter(self.metrics.registry, port=0)
+        request_timeout = MetricsHandler.timeout
+        MetricsHandler.timeout = 0.2
+        exporter.start()
+        try:
+            port = exporter.server.server_address[1]
+            with socket.create_connection(("127.0.0.1", port)):
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                    self.assertEqual(response.status, 200)
+        finally:
+            start = time.monotonic()
+            exporter.stop()
+            MetricsHandler.timeout = request_timeout
+        self.assertLess(time.monotonic() - start, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clock import VirtualClock, Countdown
+from src.monitoring import MonitoringManager
+from src.scheduling import FixedIntervalPolicy, AdaptiveIntervalPolicy
+
+class TestCountdown(unittest.TestCase):
+    """Tests pour le compte à rebours du popup"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.clock = VirtualClock()
+        self.ticks = []
+        self.expired = []
+        self.countdown = Countdown(self.clock, 30, self.ticks.append, lambda: self.expired.append(self.clock.now()))
+    
+    def test_full_countdown(self):
+        """Vérifie un compte à rebours complet de 30 secondes"""
+        self.countdown.start()
+        self.clock.run()
+        
+        self.assertEqual(self.ticks, list(range(30, 0, -1)))
+        self.assertEqual(self.expired, [30])
+    
+    def test_answer_cancels_countdown(self):
+        """Vérifie qu'une réponse arrête le compte à rebours"""
+        self.countdown.start()
+        self.clock.advance(4.5)
+        self.assertAlmostEqual(self.countdown.elapsed(), 4.5)
+        
+        self.countdown.cancel()
+        self.clock.run()
+        self.assertEqual(self.ticks, [30, 29, 28, 27, 26])
+        self.assertEqual(self.expired, [])
+
+class TestMonitoringManager(unittest.TestCase):
+    """Tests pour le planificateur de la surveillance"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.clock = VirtualClock()
+        self.checks = []
+        self.scheduled = []
+        self.monitor = MonitoringManager(
+            self.clock,
+            FixedIntervalPolicy(20 * 60),
+            lambda: self.checks.append(self.clock.now()),
+            lambda interval, deadline: self.scheduled.append((interval, deadline))
+        )
+    
+    def test_next_check_is_armed_after_answer(self):
+        """Vérifie que la vérification suivante part de la réponse au popup"""
+        started = time.perf_counter()
+        self.monitor.start()
+        
+        for _ in range(3):
+            self.clock.run()
+            self.assertFalse(self.monitor.job)
+            self.assertIsNone(self.monitor.remaining())
+            
+            # L'utilisateur répond au bout de 5 secondes
+            self.clock.advance(5)
+            self.monitor.record_response(5, 30)
+        
+        self.assertEqual(self.checks, [1200, 2405, 3610])
+        self.assertEqual(self.scheduled[-1], (1200, 4815))
+        self.assertEqual(self.monitor.remaining(), 1200)
+        
+        # Une heure de surveillance simulée en quelques millisecondes
+        self.assertLess(time.perf_counter() - started, 0.5)
+    
+    def test_stop_cancels_pending_check(self):
+        """Vérifie que l'arrêt annule la vérification programmée"""
+        self.monitor.start()
+        self.clock.advance(600)
+        self.assertEqual(self.monitor.remaining(), 600)
+        
+        self.monitor.stop()
+        self.clock.run()
+        self.assertEqual(self.checks, [])
+        self.assertIsNone(self.monitor.remaining())
+    
+    def test_timeout_does_not_rearm(self):
+        """Vérifie qu'une absence de réponse ne programme pas de nouvelle vérification"""
+        self.monitor.start()
+        self.clock.run()
+        self.clock.advance(30)
+        self.monitor.record_timeout()
+        
+        self.assertEqual(self.clock.pending(), 0)
+        self.assertEqual(len(self.scheduled), 1)
+    
+    def test_failed_check_rearms(self):
+        """Vérifie qu'une erreur à l'affichage de la vérification n'arrête pas la surveillance"""
+        def broken_check():
+            self.checks.append(self.clock.now())
+            raise RuntimeError("popup")
+
+        self.monitor.on_check = broken_check
+        self.monitor.start()
+        self.clock.run(until=2400)
+        
+        self.assertEqual(self.checks, [1200, 2400])
+        self.assertFalse(self.monitor.check_pending)
+        self.assertEqual(self.monitor.remaining(), 1200)
+    
+    def test_adaptive_policy_drives_intervals(self):
+        """Vérifie que la politique adaptative allonge l'intervalle d'un utilisateur vigilant"""
+        self.monitor.policy = AdaptiveIntervalPolicy(1200, 300, 2700)
+        self.monitor.start()
+        
+        for _ in range(4):
+            self.clock.run()
+            self.clock.advance(2)
+            self.monitor.record_response(2, 30)
+        
+        self.assertEqual([interval for interval, _ in self.scheduled], [1200, 1200, 2700, 2700, 2700])
+
+    def test_postpone_while_user_is_active(self):
+        """Vérifie le report de la vérification tant que la fonction de report le demande"""
+        postponements = []
+
+        def postpone(postponed_for):
+            postponements.append(postponed_for)
+            return 60 if postponed_for < 120 else 0
+
+        postponed = []
+        self.monitor.postpone = postpone
+        self.monitor.on_postponed = lambda delay, deadline: postponed.append((delay, deadline))
+        self.monitor.start()
+        self.clock.run()
+
+        self.assertEqual(postponements, [0, 60, 120])
+        self.assertEqual(self.checks, [1320])
+        # Un report n'est pas une nouvelle vérification programmée
+        self.assertEqual(self.scheduled, [(1200, 1200)])
+        self.assertEqual(postponed, [(60, 1260), (60, 1320)])
+
+        # Le report suivant repart de zéro
+        self.clock.advance(5)
+        self.monitor.record_response(5, 30)
+        self.clock.run()
+        self.assertEqual(postponements[3], 0)
+
+if __name__ == '__main__':
+    unittest.main()
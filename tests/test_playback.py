@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import shutil
+import socket
+import struct
+import threading
+import subprocess
+import unittest
+import sys
+from types import SimpleNamespace
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.playback import PlaybackMonitor, PlaybackGate, MPRIS_PATH, MPRIS_PLAYER
+
+# Sortie de dbus-monitor relevée sur un bus de session
+CAPTURE = """signal time=1792389807.477109 sender=org.freedesktop.DBus -> destination=:1.0 serial=2 path=/org/freedesktop/DBus; interface=org.freedesktop.DBus; member=NameAcquired
+   string ":1.0"
+signal time=1792389807.995512 sender=:1.7 -> destination=(null destination) serial=2 path=/org/mpris/MediaPlayer2; interface=org.freedesktop.DBus.Properties; member=PropertiesChanged
+   string "org.mpris.MediaPlayer2.Player"
+   array [
+      dict entry(
+         string "PlaybackStatus"
+         variant             string "{status}"
+      )
+   ]
+   array [
+   ]
+"""
+INHIBIT = """method call time=1792389807.996185 sender=:1.9 -> destination=org.freedesktop.ScreenSaver serial=2 path=/org/freedesktop/ScreenSaver; interface=org.freedesktop.ScreenSaver; member={member}
+   string "firefox"
+   string "video"
+"""
+GNOME_INHIBIT = """method call time=1792389808.1 sender=:1.12 -> destination=org.gnome.SessionManager serial=9 path=/org/gnome/SessionManager; interface=org.gnome.SessionManager; member=Inhibit
+   string "org.gnome.TextEditor"
+   uint32 0
+   string "Documents non enregistrés"
+   uint32 {flags}
+"""
+VANISHED = """signal time=1792389809.2 sender=org.freedesktop.DBus -> destination=(null destination) serial=40 path=/org/freedesktop/DBus; interface=org.freedesktop.DBus; member=NameOwnerChanged
+   string "{name}"
+   string "{name}"
+   string ""
+"""
+
+# Alignement des types du protocole D-Bus
+ALIGN = {"y": 1, "b": 4, "u": 4, "s": 4, "o": 4, "g": 1, "v": 1, "a": 4, "(": 8, "{": 8}
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def split_types(signature):
+    types = []
+    while signature:
+        end = 1
+        while signature[end - 1] == "a":
+            end += 1
+        if signature[end - 1] in "({":
+            depth = 1
+            while depth:
+                depth += {"(": 1, "{": 1, ")": -1, "}": -1}.get(signature[end], 0)
+                end += 1
+        types.append(signature[:end])
+        signature = signature[end:]
+    return types
+
+
+def pad(buffer, alignment):
+    buffer.extend(b"\0" * (-len(buffer) % alignment))
+
+
+def marshal(buffer, signature, value):
+    code = signature[0]
+    pad(buffer, ALIGN[code])
+    if code == "y":
+        buffer.append(value)
+    elif code in "bu":
+        buffer.extend(struct.pack("<I", value))
+    elif code in "so":
+        data = value.encode()
+        buffer.extend(struct.pack("<I", len(data)) + data + b"\0")
+    elif code == "g":
+        data = value.encode()
+        buffer.extend(bytes([len(data)]) + data + b"\0")
+    elif code == "v":
+        marshal(buffer, "g", value[0])
+        marshal(buffer, value[0], value[1])
+    elif code == "a":
+        item = signature[1:]
+        buffer.extend(b"\0\0\0\0")
+        length_at = len(buffer) - 4
+        pad(buffer, ALIGN[item[0]])
+        start = len(buffer)
+        for element in (value.items() if item[0] == "{" else value):
+            marshal(buffer, item, element)
+        struct.pack_into("<I", buffer, length_at, len(buffer) - start)
+    else:
+        for member, element in zip(split_types(signature[1:-1]), value):
+            marshal(buffer, member, element)
+
+
+def unmarshal(data, offset, signature):
+    code = signature[0]
+    offset += -offset % ALIGN[code]
+    if code == "y":
+        return data[offset], offset + 1
+    if code in "bu":
+        return struct.unpack_from("<I", data, offset)[0], offset + 4
+    if code in "so":
+        length = struct.unpack_from("<I", data, offset)[0]
+        return data[offset + 4:offset + 4 + length].decode(), offset + 5 + length
+    if code == "g":
+        length = data[offset]
+        return data[offset + 1:offset + 1 + length].decode(), offset + 2 + length
+    if code == "v":
+        inner, offset = unmarshal(data, offset, "g")
+        return unmarshal(data, offset, inner)
+    if code == "a":
+        length, offset = unmarshal(data, offset, "u")
+        offset += -offset % ALIGN[signature[1]]
+        end, elements = offset + length, []
+        while offset < end:
+            element, offset = unmarshal(data, offset, signature[1:])
+            elements.append(element)
+        return elements, offset
+    elements = []
+    for member in split_types(signature[1:-1]):
+        element, offset = unmarshal(data, offset, member)
+        elements.append(element)
+    return tuple(elements), offset
+
+
+class StandInPlayer:
+    """Lecteur MPRIS de substitution, connecté au bus par le protocole D-Bus brut"""
+
+    def __init__(self, address, name="org.mpris.MediaPlayer2.standin"):
+        self.status = "Stopped"
+        self.serial = 0
+        self.replies = set()
+        self.condition = threading.Condition()
+        path = address.split(":", 1)[1].split(",")[0]
+        kind, _, location = path.partition("=")
+        self.sock = socket.socket(socket.AF_UNIX)
+        self.sock.connect(location if kind == "path" else "\0" + location)
+        uid = str(os.getuid()).encode().hex().encode()
+        self.sock.sendall(b"\0AUTH EXTERNAL " + uid + b"\r\n")
+        assert self.sock.recv(4096).startswith(b"OK")
+        self.sock.sendall(b"BEGIN\r\n")
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        self.call("org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus", "Hello")
+        self.call("org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus",
+                  "RequestName", "su", (name, 0))
+
+    def send(self, kind, fields, signature="", args=(), flags=0):
+        self.serial += 1
+        body = bytearray()
+        for member, value in zip(split_types(signature), args):
+            marshal(body, member, value)
+        if signature:
+            fields = fields + [(8, ("g", signature))]
+        header = bytearray(b"l" + bytes([kind, flags, 1]) + struct.pack("<II", len(body), self.serial))
+        marshal(header, "a(yv)", fields)
+        pad(header, 8)
+        self.sock.sendall(bytes(header + body))
+        return self.serial
+
+    def call(self, destination, path, interface, member, signature="", args=(), wait=True):
+        serial = self.send(1, [(1, ("o", path)), (2, ("s", interface)), (3, ("s", member)),
+                               (6, ("s", destination))], signature, args, flags=0 if wait else 1)
+        if wait:
+            with self.condition:
+                assert self.condition.wait_for(lambda: serial in self.replies, timeout=5)
+
+    def set_status(self, status):
+        self.status = status
+        self.send(4, [(1, ("o", MPRIS_PATH)), (2, ("s", "org.freedesktop.DBus.Properties")),
+                      (3, ("s", "PropertiesChanged"))],
+                  "sa{sv}as", (MPRIS_PLAYER, {"PlaybackStatus": ("s", status)}, []))
+
+    def receive(self, size):
+        data = b""
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise EOFError
+            data += chunk
+        return data
+
+    def serve(self):
+        try:
+            while True:
+                fixed = self.receive(16)
+                body_length, _, fields_length = struct.unpack_from("<III", fixed, 4)
+                rest = self.receive(fields_length + (-(16 + fields_length) % 8) + body_length)
+                fields = dict(unmarshal(fixed + rest, 12, "a(yv)")[0])
+                if fixed[1] in (2, 3):
+                    with self.condition:
+                        self.replies.add(fields[5])
+                        self.condition.notify_all()
+                elif fixed[1] == 1 and fields.get(3) == "Get":
+                    self.send(2, [(5, ("u", struct.unpack_from("<I", fixed, 8)[0])), (6, ("s", fields[7]))],
+                              "v", [("s", self.status)])
+        except (OSError, EOFError):
+            pass
+
+    def close(self):
+        self.sock.shutdown(socket.SHUT_RDWR)
+        self.sock.close()
+        self.thread.join(timeout=2)
+
+class TestPlaybackParsing(unittest.TestCase):
+    """Tests pour l'analyse de la sortie de dbus-monitor"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.monitor = PlaybackMonitor()
+
+    def feed(self, text):
+        for line in text.splitlines():
+            self.monitor.feed(line)
+
+    def test_playback_status(self):
+        """Vérifie le suivi de l'état d'un lecteur MPRIS, valeur par valeur"""
+        self.feed(CAPTURE.format(status="Playing"))
+        self.assertTrue(self.monitor.active)
+        self.feed(CAPTURE.format(status="Paused"))
+        self.assertFalse(self.monitor.active)
+        self.assertEqual(self.monitor.players, {":1.7": "Paused"})
+
+    def test_value_applied_without_next_message(self):
+        """Vérifie que l'état change dès la ligne de la valeur, sans attendre le message suivant"""
+        lines = CAPTURE.format(status="Playing").splitlines()
+        for line in lines[:8]:
+            self.monitor.feed(line)
+        self.assertTrue(self.monitor.active)
+
+    def test_inhibitors(self):
+        """Vérifie le suivi des inhibitions de l'économiseur d'écran"""
+        self.feed(INHIBIT.format(member="Inhibit"))
+        self.assertTrue(self.monitor.active)
+        self.feed(INHIBIT.format(member="UnInhibit"))
+        self.assertFalse(self.monitor.active)
+
+    def test_gnome_flags(self):
+        """Vérifie que seules les inhibitions de veille ou d'inactivité sont prises en compte"""
+        self.feed(GNOME_INHIBIT.format(flags=1))
+        self.assertFalse(self.monitor.active)
+        self.feed(GNOME_INHIBIT.format(flags=8))
+        self.assertTrue(self.monitor.active)
+
+    def test_client_vanished(self):
+        """Vérifie qu'un client qui quitte le bus lève ses lectures et inhibitions"""
+        self.feed(CAPTURE.format(status="Playing"))
+        self.feed(INHIBIT.format(member="Inhibit"))
+        self.feed(VANISHED.format(name=":1.7"))
+        self.assertTrue(self.monitor.active)
+        self.feed(VANISHED.format(name=":1.9"))
+        self.assertFalse(self.monitor.active)
+
+class TestPlaybackGate(unittest.TestCase):
+    """Tests pour le report des vérifications pendant une lecture"""
+
+    def test_postpone(self):
+        """Vérifie le report pendant une lecture, dans la limite fixée"""
+        monitor = SimpleNamespace(active=False, describe=lambda: "1 lecteur(s)")
+        gate = PlaybackGate(monitor, delay=300, max_postpone=1000)
+        self.assertEqual(gate(0), 0)
+        monitor.active = True
+        self.assertEqual(gate(0), 300)
+        self.assertEqual(gate(900), 100)
+        self.assertEqual(gate(1000), 0)
+
+@unittest.skipUnless(shutil.which("dbus-daemon") and shutil.which("dbus-monitor") and shutil.which("dbus-send"),
+                     "Outils D-Bus indisponibles")
+class TestPlaybackMonitor(unittest.TestCase):
+    """Tests de bout en bout sur un bus D-Bus privé"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.daemon = subprocess.Popen(["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+                                       stdout=subprocess.PIPE, text=True)
+        self.address = self.daemon.stdout.readline().strip()
+        self.players = []
+        self.monitor = PlaybackMonitor(self.address)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.monitor.stop()
+        for player in self.players:
+            player.close()
+        self.daemon.terminate()
+        self.daemon.wait()
+        self.daemon.stdout.close()
+
+    def start_player(self, name="org.mpris.MediaPlayer2.standin"):
+        player = StandInPlayer(self.address, name)
+        self.players.append(player)
+        return player
+
+    def start_monitor(self):
+        self.assertTrue(self.monitor.start())
+        self.assertTrue(self.monitor.ready.wait(5))
+
+    def test_playback_signals(self):
+        """Vérifie le suivi des signaux PropertiesChanged d'un lecteur"""
+        self.start_monitor()
+        player = self.start_player()
+        player.set_status("Playing")
+        self.assertTrue(wait_until(lambda: self.monitor.active))
+        player.set_status("Paused")
+        self.assertTrue(wait_until(lambda: not self.monitor.active))
+
+    def test_player_already_playing(self):
+        """Vérifie la prise en compte d'une lecture commencée avant le démarrage"""
+        player = self.start_player()
+        player.status = "Playing"
+        self.start_monitor()
+        self.assertTrue(self.monitor.active)
+
+    def test_player_quits(self):
+        """Vérifie la fin de la lecture lorsque le lecteur quitte le bus"""
+        self.start_monitor()
+        player = self.start_player()
+        player.set_status("Playing")
+        self.assertTrue(wait_until(lambda: self.monitor.active))
+        player.close()
+        self.players.remove(player)
+        self.assertTrue(wait_until(lambda: not self.monitor.active))
+
+    def test_screensaver_inhibit(self):
+        """Vérifie le suivi des inhibitions posées sur le bus"""
+        self.start_monitor()
+        player = self.start_player("org.example.Video")
+        args = ("org.freedesktop.ScreenSaver", "/org/freedesktop/ScreenSaver", "org.freedesktop.ScreenSaver")
+        player.call(*args, "Inhibit", "ss", ("video", "lecture"), wait=False)
+        self.assertTrue(wait_until(lambda: self.monitor.active))
+        player.call(*args, "UnInhibit", "u", (1,), wait=False)
+        self.assertTrue(wait_until(lambda: not self.monitor.active))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scheduling import (
+    LatencyRing, FixedIntervalPolicy, AdaptiveIntervalPolicy, create_interval_policy
+)
+
+class TestLatencyRing(unittest.TestCase):
+    """Tests pour le tampon circulaire des temps de réponse"""
+    
+    def test_oldest_values_are_overwritten(self):
+        """Vérifie que seules les dernières observations sont conservées"""
+        ring = LatencyRing(3)
+        for latency in (3, 6, 9, 12):
+            ring.add_response(latency, 30)
+        ring.add_timeout()
+        
+        self.assertEqual(len(ring), 3)
+        self.assertEqual([round(value, 2) for value in ring], [0.3, 0.4, 1.0])
+
+class TestIntervalPolicies(unittest.TestCase):
+    """Tests pour les politiques d'intervalle"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.policy = AdaptiveIntervalPolicy(1200, 300, 2700)
+    
+    def test_base_interval_until_warmup(self):
+        """Vérifie que l'intervalle de base est utilisé sans observations suffisantes"""
+        self.assertEqual(self.policy.next_interval(), 1200)
+        self.policy.observe_response(2, 30)
+        self.assertEqual(self.policy.next_interval(), 1200)
+    
+    def test_fast_steady_answers_stretch_interval(self):
+        """Vérifie qu'un utilisateur rapide et régulier est dérangé moins souvent"""
+        for _ in range(5):
+            self.policy.observe_response(2, 30)
+        self.assertEqual(self.policy.next_interval(), 2700)
+    
+    def test_slow_answers_shrink_interval(self):
+        """Vérifie qu'un utilisateur lent est vérifié plus tôt"""
+        for latency in (5, 12, 20, 26):
+            self.policy.observe_response(latency, 30)
+        self.assertLess(self.policy.next_interval(), 1200)
+    
+    def test_irregular_answers_shrink_interval(self):
+        """Vérifie que l'irrégularité réduit l'intervalle"""
+        steady = AdaptiveIntervalPolicy(1200, 300, 2700)
+        for latency in (8, 8, 8, 8):
+            steady.observe_response(latency, 30)
+        for latency in (1, 16, 1, 16):
+            self.policy.observe_response(latency, 30)
+        self.assertLess(self.policy.next_interval(), steady.next_interval())
+    
+    def test_create_from_config(self):
+        """Vérifie la création de la politique depuis la configuration"""
+        self.assertIsInstance(create_interval_policy({"check_interval_minutes": 20}), FixedIntervalPolicy)
+        
+        config = {"interval_mode": "adaptive", "interval_min_minutes": 10, "interval_max_minutes": 30}
+        policy = create_interval_policy(config)
+        policy.observe_response(2, 30)
+        policy.observe_response(2, 30)
+        
+        # Les observations sont conservées lorsque les bornes changent
+        config["interval_max_minutes"] = 60
+        updated = create_interval_policy(config, policy)
+        self.assertEqual(len(updated.ring), 2)
+        self.assertEqual(updated.next_interval(), 3600)
+
+if __name__ == '__main__':
+    unittest.main()
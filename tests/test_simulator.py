@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+import sys
+import shutil
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clock import VirtualClock
+from src.simulator import Night, simulate_night, recorded_nights, expand_grid, run_policies
+
+RECORDED_LOG = """\
+2025-04-21 22:00:00,000 - NightMod.App - INFO - Surveillance démarrée
+2025-04-21 22:20:00,000 - NightMod.App - INFO - Affichage de la fenêtre de vérification
+2025-04-21 22:20:04,000 - NightMod.App - INFO - L'utilisateur a répondu au popup en 4.0 s
+2025-04-21 22:40:04,000 - NightMod.App - INFO - Affichage de la fenêtre de vérification
+2025-04-21 22:40:10,500 - NightMod.App - INFO - L'utilisateur a répondu au popup en 6.5 s
+2025-04-21 23:00:10,500 - NightMod.App - INFO - Affichage de la fenêtre de vérification
+2025-04-21 23:00:40,500 - NightMod.App - INFO - Aucune réponse de l'utilisateur, exécution de l'action configurée
+"""
+
+FIXED_20 = {"interval_mode": "fixed", "check_interval_minutes": 20}
+
+class TestVirtualClock(unittest.TestCase):
+    """Tests pour l'horloge virtuelle"""
+    
+    def test_events_run_in_order_and_can_be_cancelled(self):
+        """Vérifie l'ordre des événements et l'annulation"""
+        clock = VirtualClock()
+        fired = []
+        clock.call_at(30, fired.append, "délai")
+        job = clock.call_at(10, fired.append, "annulé")
+        clock.call_at(5, fired.append, "réponse")
+        clock.cancel(job)
+        clock.run()
+        
+        self.assertEqual(fired, ["réponse", "délai"])
+        self.assertEqual(clock.now(), 30)
+
+class TestSimulator(unittest.TestCase):
+    """Tests pour le simulateur de politiques"""
+    
+    def test_sleep_is_detected_at_next_check(self):
+        """Vérifie le délai entre l'endormissement et l'action"""
+        night = Night([5.0], sleep_at=3000, duration=8 * 3600)
+        result = simulate_night(night, FIXED_20, 30)
+        
+        # Vérifications à 1200 s et 2405 s (réponses), puis 3610 s sans réponse
+        self.assertEqual(result["popups"], 3)
+        self.assertFalse(result["false_action"])
+        self.assertAlmostEqual(result["sleep_delay"], 3610 + 30 - 3000)
+    
+    def test_slow_answer_is_a_false_action(self):
+        """Vérifie qu'une réponse trop lente d'un utilisateur éveillé compte comme fausse action"""
+        night = Night([5.0, 45.0], sleep_at=None, duration=4 * 3600)
+        result = simulate_night(night, FIXED_20, 30)
+        
+        self.assertEqual(result["popups"], 2)
+        self.assertTrue(result["false_action"])
+    
+    def test_postpone_hook(self):
+        """Vérifie que la fonction de report du planificateur est appliquée"""
+        night = Night([5.0], sleep_at=None, duration=3000)
+        postponements = []
+
+        def postpone(postponed_for):
+            postponements.append(postponed_for)
+            return 600 if postponed_for < 600 else 0
+
+        result = simulate_night(night, FIXED_20, 30, postpone)
+        
+        # Vérification à 1200 s reportée une fois (1800 s), la suivante à 3005 s hors nuit
+        self.assertEqual(result["popups"], 1)
+        self.assertEqual(postponements, [0, 600, 0])
+    
+    def test_recorded_nights_from_log(self):
+        """Vérifie la reconstruction des nuits depuis nightmod.log"""
+        log_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(log_dir, "nightmod.log"), 'w', encoding='utf-8') as f:
+                f.write(RECORDED_LOG)
+            nights = recorded_nights([log_dir])
+        finally:
+            shutil.rmtree(log_dir)
+        
+        self.assertEqual(len(nights), 1)
+        self.assertEqual(nights[0].latencies, [4.0, 6.5])
+        # Endormissement entre la dernière réponse (40 min 10 s) et le popup sans réponse (1 h)
+        self.assertTrue(2410 <= nights[0].sleep_at <= 3610.5)
+    
+    def test_grid_sweep(self):
+        """Vérifie le développement d'une grille et l'évaluation des politiques"""
+        policies = expand_grid("adaptive:interval_min_minutes=5|10,interval_max_minutes=30|45")
+        self.assertEqual(len(policies), 4)
+        self.assertIn({"interval_mode": "adaptive", "interval_min_minutes": 10,
+                       "interval_max_minutes": 45}, policies)
+        
+        nights = [Night([3.0, 4.0], sleep_at=5400, duration=8 * 3600)]
+        reports = run_policies(policies + [FIXED_20], nights, 30, jobs=1)
+        self.assertEqual(len(reports), 5)
+        self.assertTrue(all(report["missed_sleep"] == 0 for report in reports))
+
+if __name__ == '__main__':
+    unittest.main()
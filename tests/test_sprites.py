@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+import sys
+import shutil
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # Dépendances optionnelles
+    np = None
+
+from src.clock import VirtualClock
+from src.sprites import CountdownAnimator
+
+@unittest.skipIf(np is None, "NumPy et Pillow sont nécessaires")
+class TestProgressFrames(unittest.TestCase):
+    """Tests pour la planche d'images de progression"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.active = Image.new('RGBA', (16, 16), (76, 175, 80, 255))
+        self.inactive = Image.new('RGBA', (16, 16), (128, 128, 128, 255))
+    
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        shutil.rmtree(self.cache_dir)
+    
+    def test_first_and_last_frames(self):
+        """Vérifie que la planche va de l'icône active à l'icône inactive"""
+        from src.sprites import build_progress_frames
+        
+        frames = build_progress_frames(np.asarray(self.active), np.asarray(self.inactive), 8)
+        self.assertEqual(frames.shape, (8, 16, 16, 4))
+        np.testing.assert_array_equal(frames[0], np.asarray(self.active))
+        np.testing.assert_array_equal(frames[-1], np.asarray(self.inactive))
+        
+        # À mi-parcours, la moitié droite est grisée et la moitié gauche reste active
+        middle = build_progress_frames(np.asarray(self.active), np.asarray(self.inactive), 3)[1]
+        self.assertEqual(tuple(middle[4, 12]), (128, 128, 128, 255))
+        self.assertEqual(tuple(middle[4, 3]), (76, 175, 80, 255))
+    
+    def test_frames_are_cached_on_disk(self):
+        """Vérifie que la planche est relue depuis le cache"""
+        from src.sprites import load_progress_frames
+        
+        frames = load_progress_frames(self.active, self.inactive, 6, self.cache_dir)
+        cached = [name for name in os.listdir(self.cache_dir) if name.startswith("sprites-")]
+        self.assertEqual(len(cached), 1)
+        
+        again = load_progress_frames(self.active, self.inactive, 6, self.cache_dir)
+        self.assertEqual(len(again), 6)
+        self.assertEqual(again[3].tobytes(), frames[3].tobytes())
+
+class TestCountdownAnimator(unittest.TestCase):
+    """Tests pour l'animation pilotée par l'échéance"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.clock = VirtualClock()
+        self.shown = []
+        self.animator = CountdownAnimator(5, self.shown.append, self.clock)
+    
+    def test_only_frame_changes_are_scheduled(self):
+        """Vérifie qu'un seul rappel est programmé par changement d'image"""
+        self.animator.start(0.0, 100.0)
+        self.assertEqual(self.shown, [0])
+        self.assertEqual(self.clock.pending(), 1)
+        
+        # Le prochain changement d'image a lieu au quart de l'intervalle
+        self.clock.advance(24.9)
+        self.assertEqual(self.shown, [0])
+        self.clock.advance(0.1)
+        self.assertEqual(self.shown, [0, 1])
+        
+        self.clock.run()
+        self.assertEqual(self.shown, [0, 1, 2, 3, 4])
+        self.assertEqual(self.clock.now(), 100.0)
+    
+    def test_frame_boundaries_with_rounding(self):
+        """Vérifie qu'un changement d'image inexact en flottant n'est pas reprogrammé"""
+        clock = VirtualClock(start=1234.5678)
+        shown = []
+        animator = CountdownAnimator(24, shown.append, clock)
+        animator.start(clock.now(), clock.now() + 1200)
+
+        # Un rappel par image : l'image courante ne redemande jamais le même instant
+        for _ in range(23):
+            clock.run(clock.queue[0][0])
+        self.assertEqual(shown, list(range(24)))
+        self.assertEqual(clock.pending(), 0)
+
+    def test_stop_cancels_the_pending_change(self):
+        """Vérifie que l'arrêt annule le rappel programmé"""
+        self.animator.start(0.0, 100.0)
+        self.animator.stop()
+        self.clock.run()
+        self.assertEqual(self.shown, [0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import statistics
+import tempfile
+import unittest
+import sys
+import shutil
+from datetime import datetime
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.stats import P2Quantile, RunningStats
+
+class TestP2Quantile(unittest.TestCase):
+    """Tests pour l'estimateur de quantile en flux"""
+    
+    def test_median_estimate(self):
+        """Vérifie que la médiane estimée est proche de la médiane exacte"""
+        rng = random.Random(42)
+        values = [rng.expovariate(0.2) for _ in range(5000)]
+        sketch = P2Quantile(0.5)
+        for value in values:
+            sketch.add(value)
+        
+        self.assertEqual(sketch.count, 5000)
+        self.assertAlmostEqual(sketch.value(), statistics.median(values), delta=0.2)
+    
+    def test_small_samples(self):
+        """Vérifie l'estimation avec moins de cinq observations"""
+        sketch = P2Quantile(0.5)
+        self.assertIsNone(sketch.value())
+        for value in (9, 1, 5):
+            sketch.add(value)
+        self.assertEqual(sketch.value(), 5)
+
+class TestRunningStats(unittest.TestCase):
+    """Tests pour les statistiques cumulées"""
+    
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "stats.json")
+    
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_summary_and_persistence(self):
+        """Vérifie le résumé et sa restauration depuis le fichier compact"""
+        stats = RunningStats(self.path)
+        for latency in (2.0, 4.0, 6.0):
+            stats.record_response(latency)
+        
+        late = datetime(2025, 4, 21, 23, 40).timestamp()
+        stats.record_timeout(late)
+        stats.record_timeout(late)
+        stats.record_timeout(datetime(2025, 4, 22, 1, 10).timestamp())
+        stats.record_action("lock")
+        stats.save()
+        
+        summary = RunningStats(self.path).summary()
+        self.assertEqual(summary["checks"], 6)
+        self.assertEqual(summary["answered"], 3)
+        self.assertEqual(summary["median_latency"], 4.0)
+        self.assertEqual(summary["actions"], {"lock": 1})
+        self.assertEqual(summary["sleep_hour"], 23)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import mmap
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.status import StatusFile, RECORD_SIZE, get_status_path, read_status
+
+class TestStatusFile(unittest.TestCase):
+    """Tests pour le fichier d'état des barres d'état"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "nightmod", "status.json")
+        self.status_file = StatusFile(self.path)
+        self.status_file.open()
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.status_file.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_initial_record(self):
+        """Vérifie l'enregistrement initial, de taille fixe"""
+        self.assertEqual(os.path.getsize(self.path), RECORD_SIZE)
+        status = read_status(self.path)
+        self.assertEqual(status["version"], 1)
+        self.assertEqual(status["pid"], os.getpid())
+        self.assertFalse(status["monitoring"])
+        self.assertIsNone(status["next_check_wall"])
+
+    def test_rewritten_only_on_change(self):
+        """Vérifie que l'enregistrement n'est réécrit que lorsque l'état change"""
+        self.assertTrue(self.status_file.update(monitoring=True, next_check_wall=1000.0))
+        seq = read_status(self.path)["seq"]
+
+        self.assertFalse(self.status_file.update(monitoring=True, next_check_wall=1000.0))
+        self.assertEqual(read_status(self.path)["seq"], seq)
+
+        self.assertTrue(self.status_file.update(next_check_wall=2200.0))
+        status = read_status(self.path)
+        self.assertEqual(status["seq"], seq + 1)
+        self.assertEqual(status["next_check_wall"], 2200.0)
+        self.assertEqual(os.path.getsize(self.path), RECORD_SIZE)
+
+    def test_reader_mapping_sees_updates(self):
+        """Vérifie qu'un lecteur qui a projeté le fichier voit les mises à jour en place"""
+        with open(self.path, 'rb') as f:
+            reader = mmap.mmap(f.fileno(), RECORD_SIZE, access=mmap.ACCESS_READ)
+            self.status_file.update(popup_open=True, last_action="lock", last_action_result="success")
+            status = json.loads(reader[:])
+            reader.close()
+        self.assertTrue(status["popup_open"])
+        self.assertEqual(status["last_action"], "lock")
+
+    def test_oversized_record_is_rejected(self):
+        """Vérifie qu'un état trop volumineux ne corrompt pas l'enregistrement"""
+        self.assertFalse(self.status_file.update(last_action="x" * RECORD_SIZE))
+        self.assertIsNone(read_status(self.path)["last_action"])
+        self.assertTrue(self.status_file.update(last_action="lock"))
+
+    def test_close_removes_file(self):
+        """Vérifie que le fichier est supprimé à la fermeture"""
+        self.status_file.close()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(read_status(self.path))
+
+    def test_runtime_dir(self):
+        """Vérifie l'emplacement sous $XDG_RUNTIME_DIR"""
+        with patch.dict(os.environ, {"XDG_RUNTIME_DIR": self.temp_dir}):
+            os.environ.pop("NIGHTMOD_CONFIG_DIR", None)
+            self.assertEqual(get_status_path(), os.path.join(self.temp_dir, "nightmod", "status.json"))
+
+    def test_config_dir_override(self):
+        """Vérifie qu'un répertoire de configuration imposé reçoit le fichier d'état"""
+        config_dir = os.path.join(self.temp_dir, "config")
+        with patch.dict(os.environ, {"XDG_RUNTIME_DIR": self.temp_dir, "NIGHTMOD_CONFIG_DIR": config_dir}):
+            self.assertEqual(get_status_path(), os.path.join(config_dir, "status.json"))
+
+    def test_second_instance_keeps_out(self):
+        """Vérifie qu'une seconde instance n'écrit pas dans le fichier détenu et ne le supprime pas"""
+        self.status_file.update(monitoring=True)
+        other = StatusFile(self.path)
+        self.assertFalse(other.open())
+        self.assertFalse(other.update(popup_open=True))
+        other.close()
+
+        status = read_status(self.path)
+        self.assertEqual(os.path.getsize(self.path), RECORD_SIZE)
+        self.assertTrue(status["monitoring"])
+        self.assertFalse(status["popup_open"])
+
+    def test_reopened_after_close(self):
+        """Vérifie qu'une nouvelle instance reprend le fichier après la fermeture de la première"""
+        self.status_file.close()
+        other = StatusFile(self.path)
+        self.assertTrue(other.open())
+        other.close()
+        self.assertFalse(os.path.exists(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
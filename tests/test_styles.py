@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import tkinter
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import DEFAULT_CONFIG
+from src.styles import ThemeEngine, THEME_PALETTES
+from src.utils import get_theme_path
+
+class TestThemeCompilation(unittest.TestCase):
+    """Tests pour la compilation des thèmes (sans affichage)"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.engine = ThemeEngine(None, self.cache_dir)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        shutil.rmtree(self.cache_dir)
+
+    def test_stale_keys_pruned(self):
+        """Vérifie que seul le dernier thème compilé reste dans le cache"""
+        first = self.engine.compile({"ui_theme": "dark"})
+        second = self.engine.compile({"ui_theme": "light"})
+        cached = {name.split(".")[0] for name in os.listdir(self.cache_dir)}
+        self.assertEqual(cached, {f"theme-{second.key}"})
+        self.assertNotEqual(first.key, second.key)
+
+    def test_switch_back_recompiles(self):
+        """Vérifie qu'un retour au thème précédent retrouve ses fichiers (sombre, clair, sombre)"""
+        self.engine.compile({"ui_theme": "dark"})
+        self.engine.compile({"ui_theme": "light"})
+        again = self.engine.compile({"ui_theme": "dark"})
+        self.assertTrue(os.path.exists(again.option_file))
+        self.assertTrue(os.path.exists(again.script_file))
+
+    def test_default_colors_keep_theme_palette(self):
+        """Vérifie que les couleurs par défaut de la configuration ne remplacent pas la palette"""
+        compiled = self.engine.compile(dict(DEFAULT_CONFIG, ui_theme="light"))
+        self.assertEqual(compiled.palette["button_bg"], THEME_PALETTES["light"]["button_bg"])
+
+        custom = self.engine.compile(dict(DEFAULT_CONFIG, ui_theme="light", accent_color="#2196F3"))
+        self.assertEqual(custom.palette["accent"], "#2196F3")
+
+    def test_theme_directory_passed_explicitly(self):
+        """Vérifie que le script du cache indique au thème .tcl son répertoire d'images"""
+        compiled = self.engine.compile({"ui_theme": "azure"})
+        with open(compiled.script_file) as f:
+            script = f.read()
+        self.assertNotIn("winfo children", script)
+
+        # Exécuter l'en-tête du script (sans ttk) depuis le répertoire du cache
+        interp = tkinter.Tcl()
+        interp.eval(script.split("\nif {[lsearch")[0])
+        self.assertEqual(interp.eval("set ::ttk::theme::azure::theme_dir"),
+                         os.path.dirname(os.path.abspath(get_theme_path("azure.tcl"))))
+
+if __name__ == '__main__':
+    unittest.main()
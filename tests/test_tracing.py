@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import subprocess
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import tracing
+from src.clock import VirtualClock
+from src.monitoring import MonitoringManager
+from src.scheduling import FixedIntervalPolicy
+from src.system_actions import SystemActions
+
+class TestTracing(unittest.TestCase):
+    """Tests pour le traçage du chemin critique"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.temp_dir = tempfile.mkdtemp()
+        tracing.enable(capacity=100, dump_on_exit=False)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        tracing.disable()
+        shutil.rmtree(self.temp_dir)
+
+    def test_disabled_tracing_records_nothing(self):
+        """Vérifie qu'aucun événement n'est conservé lorsque le traçage est désactivé"""
+        tracing.disable()
+        with tracing.span("popup.style") as span:
+            self.assertIsNone(span)
+        tracing.instant("popup.response")
+        self.assertEqual(tracing.snapshot(), [])
+        self.assertIsNone(tracing.dump(os.path.join(self.temp_dir, "trace.json")))
+
+    def test_ring_buffer_keeps_latest_events(self):
+        """Vérifie que le tampon circulaire écrase les événements les plus anciens"""
+        tracing.enable(capacity=3, dump_on_exit=False)
+        for i in range(5):
+            tracing.instant("popup.response", index=i)
+        self.assertEqual([event[5]["index"] for event in tracing.snapshot()], [2, 3, 4])
+
+    def test_scheduler_spans(self):
+        """Vérifie les intervalles du planificateur : retard de l'échéance et affichage du popup"""
+        clock = VirtualClock()
+        monitor = MonitoringManager(clock, FixedIntervalPolicy(60), lambda: tracing.instant("popup.shown"))
+        monitor.start()
+        clock.run(60.5)
+
+        # Un intervalle est enregistré à sa fin : l'affichage précède l'intervalle qui le contient
+        names = [event[1] for event in tracing.snapshot()]
+        self.assertEqual(names, ["monitoring.deadline", "popup.shown", "monitoring.check"])
+
+        # L'échéance est enregistrée sur l'horloge du planificateur
+        deadline = tracing.snapshot()[0]
+        self.assertEqual(deadline[2], 60.0)
+        self.assertEqual(deadline[3], 0.0)
+
+    def test_action_attempts_are_traced(self):
+        """Vérifie que chaque tentative d'une chaîne de repli est tracée"""
+        if not shutil.which("true") or not shutil.which("false"):
+            self.skipTest("Commandes true/false indisponibles")
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            SystemActions.run_command(["false"])
+        SystemActions.run_command(["true"])
+
+        attempts = [event for event in tracing.snapshot() if event[1] == "actions.attempt"]
+        self.assertEqual([event[5]["command"] for event in attempts], ["false", "true"])
+        self.assertEqual(attempts[0][5]["error"], "CalledProcessError")
+        self.assertNotIn("error", attempts[1][5])
+
+    def test_chrome_trace_export(self):
+        """Vérifie l'export au format Chrome Trace"""
+        with tracing.span("popup.widgets"):
+            pass
+        tracing.instant("popup.timeout")
+
+        path = tracing.dump(os.path.join(self.temp_dir, "trace.json"))
+        with open(path) as f:
+            trace = json.load(f)
+
+        events = {event["name"]: event for event in trace["traceEvents"]}
+        self.assertEqual(events["popup.widgets"]["ph"], "X")
+        self.assertEqual(events["popup.widgets"]["cat"], "popup")
+        self.assertIn("dur", events["popup.widgets"])
+        self.assertEqual(events["popup.timeout"]["ph"], "i")
+        self.assertEqual(events["thread_name"]["ph"], "M")
+
+if __name__ == '__main__':
+    unittest.main()
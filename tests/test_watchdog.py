@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import threading
+import unittest
+import sys
+
+# Ajouter le répertoire parent au chemin
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.watchdog import DeadlineWatchdog
+
+class TestDeadlineWatchdog(unittest.TestCase):
+    """Tests pour le chien de garde de l'échéance des vérifications"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.fired = threading.Event()
+        self.fired_in = None
+        self.watchdog = DeadlineWatchdog(self.on_expire, grace=0.05)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.watchdog.stop()
+
+    def on_expire(self, late):
+        self.fired_in = threading.current_thread()
+        self.fired.set()
+
+    def test_fires_off_the_calling_thread_when_unresolved(self):
+        """Vérifie que l'action est déclenchée après l'échéance et le délai de grâce"""
+        check = self.watchdog.arm(0.05)
+
+        # La boucle Tk est bloquée : personne ne résout la vérification
+        time.sleep(0.05)
+        self.assertFalse(self.fired.is_set())
+        self.assertTrue(self.fired.wait(2))
+        self.assertIsNot(self.fired_in, threading.main_thread())
+
+        # La boucle reprend : le compte à rebours ne doit pas exécuter l'action une seconde fois
+        self.assertFalse(self.watchdog.resolve(check))
+
+    def test_response_cancels_the_deadline(self):
+        """Vérifie qu'une vérification résolue ne déclenche pas le chien de garde"""
+        check = self.watchdog.arm(0.05)
+        self.assertTrue(self.watchdog.resolve(check))
+        self.assertFalse(self.watchdog.resolve(check))
+        self.assertFalse(self.fired.wait(0.3))
+
+    def test_new_check_replaces_the_previous_one(self):
+        """Vérifie qu'un identifiant périmé ne résout pas la vérification en cours"""
+        first = self.watchdog.arm(10)
+        self.assertTrue(self.watchdog.resolve(first))
+        second = self.watchdog.arm(0.01)
+        self.assertFalse(self.watchdog.resolve(first))
+        self.assertTrue(self.fired.wait(2))
+        self.assertFalse(self.watchdog.resolve(second))
+
+    def test_stop_abandons_the_pending_check(self):
+        """Vérifie que l'arrêt du chien de garde abandonne la vérification en cours"""
+        self.watchdog.arm(0.05)
+        self.watchdog.stop()
+        self.assertFalse(self.fired.wait(0.3))
+
+if __name__ == '__main__':
+    unittest.main()
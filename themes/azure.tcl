@@ -3,6 +3,12 @@
 # Inspiration de Microsoft Fluent Design
 
 namespace eval ttk::theme::azure {
+    # Répertoire des images : fourni par le script qui charge le thème (NightMod
+    # le source depuis son cache), sinon celui de ce fichier
+    variable theme_dir
+    if {![info exists theme_dir]} {
+        set theme_dir [file dirname [file normalize [info script]]]
+    }
     variable colors
     array set colors {
         -fg             "#f0f0f0"
@@ -11,13 +17,13 @@ namespace eval ttk::theme::azure {
         -disabledbg     "#3c3c40"
         -selectfg       "#ffffff"
         -selectbg       "#1976d2"
-        -accent         "#4CAF50"       # Vert plus apaisant
-        -accent2        "#2196F3"       # Bleu pour variation
-        -accentdark     "#3C9E3C"       # Vert foncé
+        -accent         "#4CAF50"
+        -accent2        "#2196F3"
+        -accentdark     "#3C9E3C"
         -border         "#404045"
-        -darkbg         "#1e1e1e"       # Plus foncé pour meilleur contraste
-        -darkerbg       "#171717"       # Encore plus foncé pour certains éléments
-        -lightbg        "#303032"       # Plus léger mais toujours sombre
+        -darkbg         "#1e1e1e"
+        -darkerbg       "#171717"
+        -lightbg        "#303032"
     }
 
     proc LoadImages {imgdir} {
@@ -46,8 +52,8 @@ namespace eval ttk::theme::azure {
         # Idéal pour une utilisation nocturne confortable
         
         # Essayer de charger les images si disponibles
-        set script_dir [file dirname [info script]]
-        LoadImagesWithFallback [file join $script_dir "azure-img"]
+        variable theme_dir
+        LoadImagesWithFallback [file join $theme_dir "azure-img"]
 
         # Configure les couleurs et polices globales
         ttk::style configure . \
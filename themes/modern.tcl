@@ -2,6 +2,12 @@
 # Clean, minimalist dark theme inspired by modern UI design trends
 
 namespace eval ttk::theme::modern {
+    # Répertoire des images : fourni par le script qui charge le thème (NightMod
+    # le source depuis son cache), sinon celui de ce fichier
+    variable theme_dir
+    if {![info exists theme_dir]} {
+        set theme_dir [file dirname [file normalize [info script]]]
+    }
     variable colors
     # Palette de couleurs modernes et sombres
     array set colors {
@@ -11,19 +17,19 @@ namespace eval ttk::theme::modern {
         -disabledbg     "#383838"
         -selectfg       "#ffffff"
         -selectbg       "#4CAF50"
-        -accent         "#4CAF50"       # Vert principal
-        -accent2        "#2196F3"       # Bleu pour les variations
-        -accentdark     "#388E3C"       # Vert foncé
-        -border         "#424242"       # Gris foncé pour bordures subtiles
-        -darkbg         "#121212"       # Très sombre pour arrière-plans
-        -darkerbg       "#0a0a0a"       # Encore plus sombre
-        -lightbg        "#2d2d2d"       # Plus léger pour contraste
-        -cardcolor      "#252525"       # Couleur pour les composants "cartes"
-        -divider        "#333333"       # Séparateurs
-        -warning        "#ff9800"       # Orange pour alertes
-        -error          "#f44336"       # Rouge pour erreurs
-        -success        "#4caf50"       # Succès
-        -info           "#2196f3"       # Info
+        -accent         "#4CAF50"
+        -accent2        "#2196F3"
+        -accentdark     "#388E3C"
+        -border         "#424242"
+        -darkbg         "#121212"
+        -darkerbg       "#0a0a0a"
+        -lightbg        "#2d2d2d"
+        -cardcolor      "#252525"
+        -divider        "#333333"
+        -warning        "#ff9800"
+        -error          "#f44336"
+        -success        "#4caf50"
+        -info           "#2196f3"
     }
     
     # Initialiser les images
@@ -158,8 +164,8 @@ namespace eval ttk::theme::modern {
         variable I
         
         # Charger des images pour les widgets
-        set script_dir [file dirname [info script]]
-        LoadImagesWithFallback [file join $script_dir "modern-img"]
+        variable theme_dir
+        LoadImagesWithFallback [file join $theme_dir "modern-img"]
         
         # Configuration générale
         ttk::style configure . \
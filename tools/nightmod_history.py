@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+nightmod-history : export de l'historique des événements de NightMod
+
+Exporte ~/.nightmod/history.db en CSV ou en JSONL, en mémoire constante
+(lecture par blocs), éventuellement filtré par période ou type d'événement.
+
+Utilisation:
+    python tools/nightmod_history.py > historique.csv
+    python tools/nightmod_history.py --format jsonl --since 2025-01-01 -o historique.jsonl
+    python tools/nightmod_history.py --event action_executed
+"""
+
+import os
+import sys
+
+# Ajouter le répertoire parent au chemin pour importer src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.history import main
+
+if __name__ == "__main__":
+    sys.exit(main())
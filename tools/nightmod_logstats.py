@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+nightmod-logstats : statistiques des événements de NightMod
+
+Analyse un ou plusieurs fichiers nightmod.log (y compris les archives .gz de
+rotation) et affiche le nombre de démarrages, de réponses, d'absences de
+réponse et d'actions système, sous forme de tableau ou de JSON.
+
+Utilisation:
+    python tools/nightmod_logstats.py ~/.nightmod/logs
+    python tools/nightmod_logstats.py --json machine1/nightmod.log machine2/nightmod.log.1.gz
+"""
+
+import os
+import sys
+
+# Ajouter le répertoire parent au chemin pour importer src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.logstats import main
+
+if __name__ == "__main__":
+    sys.exit(main())
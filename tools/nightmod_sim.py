@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+nightmod-sim : simulation des politiques d'intervalle de NightMod
+
+Rejoue des nuits enregistrées (nightmod.log) ou synthétiques sur une horloge
+virtuelle et compare les politiques : popups par nuit, délai entre
+l'endormissement et l'action, fausses actions.
+
+Utilisation:
+    python tools/nightmod_sim.py
+    python tools/nightmod_sim.py --log ~/.nightmod/logs --policy fixed:check_interval_minutes=20
+    python tools/nightmod_sim.py --synthetic 5000 --grid "adaptive:interval_min_minutes=5|10,interval_max_minutes=30|45|60"
+"""
+
+import os
+import sys
+
+# Ajouter le répertoire parent au chemin pour importer src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulator import main
+
+if __name__ == "__main__":
+    sys.exit(main())